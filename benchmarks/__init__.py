@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for the DOM pipeline and the agent step loop, see benchmarks/README.md
+"""
@@ -0,0 +1,196 @@
+"""
+Corpus of heavy pages for the benchmarks, generated deterministically and served from a local HTTP server.
+
+The pages are generated rather than checked in so their size can be tuned here, but every run produces
+byte-identical HTML. Use `python -m benchmarks.corpus DIR` to save a copy of the corpus to disk (the nested
+iframes are only resolved when the corpus is served).
+"""
+
+import argparse
+import random
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+SEED = 1337
+WORDS = (
+	'alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa quebec '
+	'romeo sierra tango uniform victor whiskey xray yankee zulu'
+).split()
+
+TABLE_ROWS = 2000
+FEED_INITIAL_ITEMS = 200
+FEED_BATCH_SIZE = 50
+FEED_MAX_ITEMS = 2000
+SHADOW_HOSTS = 300
+IFRAME_FANOUT = 4
+IFRAME_DEPTH = 3
+IFRAME_INPUTS = 20
+
+
+def _text(rng: random.Random, words: int) -> str:
+	return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _page(title: str, body: str, head: str = '') -> str:
+	return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>{head}</head><body>{body}</body></html>'
+
+
+def large_table_page() -> str:
+	rng = random.Random(SEED)
+	rows = []
+	for i in range(TABLE_ROWS):
+		rows.append(
+			f'<tr><td><input type="checkbox" name="row-{i}"></td><td>{i}</td>'
+			f'<td><a href="#row-{i}">{_text(rng, 2)}</a></td><td>{_text(rng, 6)}</td>'
+			f'<td>{rng.randint(0, 100_000) / 100:.2f}</td><td><select><option>open</option><option>closed</option></select></td>'
+			f'<td><button type="button">Edit</button> <button type="button">Delete</button></td></tr>'
+		)
+	return _page(
+		'Large table',
+		'<h1>Large table</h1><table border="1"><thead><tr><th></th><th>#</th><th>Name</th><th>Description</th>'
+		f'<th>Amount</th><th>Status</th><th>Actions</th></tr></thead><tbody>{"".join(rows)}</tbody></table>',
+	)
+
+
+def infinite_feed_page() -> str:
+	# items are appended by a seeded PRNG in the page, so scrolling produces the same feed on every run
+	script = f"""
+	<script>
+	let seed = {SEED};
+	const words = {WORDS!r};
+	const rand = () => (seed = (seed * 16807) % 2147483647) / 2147483647;
+	const text = n => Array.from({{length: n}}, () => words[Math.floor(rand() * words.length)]).join(' ');
+	const feed = document.getElementById('feed');
+	function addItems(count) {{
+		for (let i = 0; i < count && feed.children.length < {FEED_MAX_ITEMS}; i++) {{
+			const n = feed.children.length;
+			const item = document.createElement('article');
+			item.innerHTML = `<h3><a href="#post-${{n}}">${{text(4)}}</a></h3><p>${{text(30)}}</p>` +
+				`<button type="button">Like</button> <button type="button">Share</button> <input placeholder="Reply to post ${{n}}">`;
+			feed.appendChild(item);
+		}}
+	}}
+	addItems({FEED_INITIAL_ITEMS});
+	new IntersectionObserver(entries => {{
+		if (entries.some(entry => entry.isIntersecting)) addItems({FEED_BATCH_SIZE});
+	}}).observe(document.getElementById('sentinel'));
+	</script>
+	"""
+	return _page('Infinite feed', f'<h1>Infinite feed</h1><div id="feed"></div><div id="sentinel">Loading...</div>{script}')
+
+
+def shadow_dom_page() -> str:
+	rng = random.Random(SEED)
+	hosts = ''.join(
+		f'<product-card data-name="{_text(rng, 3)}" data-price="{rng.randint(1, 999)}"></product-card>'
+		for _ in range(SHADOW_HOSTS)
+	)
+	script = """
+	<script>
+	customElements.define('price-tag', class extends HTMLElement {
+		connectedCallback() {
+			this.attachShadow({mode: 'open'}).innerHTML = `<span>$${this.getAttribute('price')}</span> <button type="button">Compare</button>`;
+		}
+	});
+	customElements.define('product-card', class extends HTMLElement {
+		connectedCallback() {
+			this.attachShadow({mode: 'open'}).innerHTML = `
+				<style>:host { display: block; border: 1px solid #ccc; margin: 4px; padding: 4px; }</style>
+				<h3><a href="#${this.dataset.name}">${this.dataset.name}</a></h3>
+				<price-tag price="${this.dataset.price}"></price-tag>
+				<input type="number" value="1" min="1" aria-label="Quantity">
+				<button type="button">Add to cart</button>`;
+		}
+	});
+	</script>
+	"""
+	return _page('Shadow DOM', f'<h1>Shadow DOM</h1>{script}{hosts}')
+
+
+def nested_iframes_page(depth: int = 0) -> str:
+	rng = random.Random(SEED + depth)
+	inputs = ''.join(
+		f'<label>{_text(rng, 2)} <input name="field-{depth}-{i}" type="text"></label><br>' for i in range(IFRAME_INPUTS)
+	)
+	form = f'<form><h2>Frame depth {depth}</h2>{inputs}<button type="submit">Submit</button></form>'
+	frames = ''
+	if depth < IFRAME_DEPTH:
+		frames = ''.join(
+			f'<iframe src="/nested-iframes?depth={depth + 1}&n={n}" width="600" height="400"></iframe>'
+			for n in range(IFRAME_FANOUT)
+		)
+	return _page(f'Nested iframes (depth {depth})', f'{form}{frames}')
+
+
+CORPUS: dict[str, Callable[[], str]] = {
+	'large-table': large_table_page,
+	'infinite-feed': infinite_feed_page,
+	'shadow-dom': shadow_dom_page,
+	'nested-iframes': nested_iframes_page,
+}
+
+
+def index_page() -> str:
+	links = ''.join(f'<li><a href="/{name}">{name}</a></li>' for name in CORPUS)
+	return _page('Benchmark corpus', f'<h1>Benchmark corpus</h1><ul>{links}</ul>')
+
+
+class CorpusRequestHandler(BaseHTTPRequestHandler):
+	pages: dict[str, str] = {}
+
+	def do_GET(self) -> None:
+		url = urlparse(self.path)
+		name = url.path.strip('/')
+		if name == 'nested-iframes' and 'depth' in (query := parse_qs(url.query)):
+			html = nested_iframes_page(min(int(query['depth'][0]), IFRAME_DEPTH))
+		else:
+			html = self.pages.get(name or 'index')
+		if html is None:
+			self.send_error(404)
+			return
+		body = html.encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/html; charset=utf-8')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format: str, *args) -> None:
+		pass
+
+
+@contextmanager
+def serve_corpus() -> Iterator[str]:
+	"""Serve the corpus on a free localhost port, yields the base url"""
+	pages = {name: generate() for name, generate in CORPUS.items()}
+	pages['index'] = index_page()
+	handler = type('Handler', (CorpusRequestHandler,), {'pages': pages})
+	server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+	thread = threading.Thread(target=server.serve_forever, name='benchmark-corpus-server', daemon=True)
+	thread.start()
+	try:
+		yield f'http://127.0.0.1:{server.server_address[1]}'
+	finally:
+		server.shutdown()
+		server.server_close()
+
+
+def save_corpus(directory: Path) -> list[Path]:
+	directory.mkdir(parents=True, exist_ok=True)
+	paths = []
+	for name, generate in {'index': index_page, **CORPUS}.items():
+		path = directory / f'{name}.html'
+		path.write_text(generate())
+		paths.append(path)
+	return paths
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Save the benchmark corpus as html files')
+	parser.add_argument('directory', type=Path)
+	for path in save_corpus(parser.parse_args().directory):
+		print(path)
@@ -0,0 +1,138 @@
+"""
+Measurements for the benchmarks: latency percentiles, memory peaks and browser round trips, and comparing
+a run against a stored baseline.
+"""
+
+import statistics
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# metrics compared against the baseline, a higher value is always worse
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'round_trips', 'python_peak_mb', 'js_heap_mb', 'layouts')
+# differences below these are noise no matter the relative change (e.g. 0.2ms -> 0.4ms)
+NOISE_FLOOR = {'p50_ms': 2.0, 'p95_ms': 5.0, 'round_trips': 1.0, 'python_peak_mb': 1.0, 'js_heap_mb': 1.0, 'layouts': 1.0}
+
+
+@dataclass
+class BenchmarkResult:
+	name: str
+	samples_ms: list[float]
+	round_trips: float  # mean playwright protocol round trips per iteration
+	python_peak_mb: float
+	js_heap_mb: float | None = None
+	extra: dict[str, Any] = field(default_factory=dict)
+
+	def summary(self) -> dict[str, Any]:
+		samples = sorted(self.samples_ms)
+		return {
+			'iterations': len(samples),
+			'p50_ms': percentile(samples, 50),
+			'p95_ms': percentile(samples, 95),
+			'p99_ms': percentile(samples, 99),
+			'max_ms': samples[-1] if samples else 0.0,
+			'mean_ms': statistics.fmean(samples) if samples else 0.0,
+			'round_trips': self.round_trips,
+			'python_peak_mb': self.python_peak_mb,
+			'js_heap_mb': self.js_heap_mb,
+			**self.extra,
+		}
+
+
+@dataclass
+class Regression:
+	benchmark: str
+	metric: str
+	baseline: float
+	current: float
+
+	def __str__(self) -> str:
+		change = (self.current / self.baseline - 1) * 100 if self.baseline else float('inf')
+		return f'{self.benchmark} {self.metric}: {self.baseline:.2f} -> {self.current:.2f} (+{change:.0f}%)'
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+	"""Linearly interpolated percentile of already sorted samples"""
+	if not sorted_samples:
+		return 0.0
+	position = (len(sorted_samples) - 1) * pct / 100
+	lower = int(position)
+	upper = min(lower + 1, len(sorted_samples) - 1)
+	return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+@contextmanager
+def count_round_trips() -> Iterator[Counter[str]]:
+	"""
+	Count the playwright protocol calls that wait for a reply from the browser, by method (evaluateExpression,
+	screenshot, ...). Each one is at least one CDP round trip, so this is a stable proxy for the CDP traffic
+	that does not depend on the machine's speed.
+	"""
+	from playwright._impl._connection import Channel
+
+	calls: Counter[str] = Counter()
+	inner_send = Channel._inner_send
+
+	async def counting_inner_send(self, method: str, params: dict | None, return_as_dict: bool) -> Any:
+		calls[method] += 1
+		return await inner_send(self, method, params, return_as_dict)
+
+	Channel._inner_send = counting_inner_send
+	try:
+		yield calls
+	finally:
+		Channel._inner_send = inner_send
+
+
+@contextmanager
+def trace_python_memory() -> Iterator[dict[str, float]]:
+	"""Track the peak python heap allocated inside the block, in MB"""
+	result = {'peak_mb': 0.0}
+	already_tracing = tracemalloc.is_tracing()
+	if not already_tracing:
+		tracemalloc.start()
+	tracemalloc.reset_peak()
+	baseline, _ = tracemalloc.get_traced_memory()
+	try:
+		yield result
+	finally:
+		_, peak = tracemalloc.get_traced_memory()
+		result['peak_mb'] = (peak - baseline) / 1024 / 1024
+		if not already_tracing:
+			tracemalloc.stop()
+
+
+def compare_to_baseline(
+	results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], tolerance: float
+) -> list[Regression]:
+	"""Metrics that got worse than the baseline by more than `tolerance` (0.2 = 20%) and more than the noise floor"""
+	regressions = []
+	for name, summary in results.items():
+		if name not in baseline:
+			continue
+		for metric in COMPARED_METRICS:
+			current, previous = summary.get(metric), baseline[name].get(metric)
+			if current is None or previous is None:
+				continue
+			if current > previous * (1 + tolerance) and current - previous > NOISE_FLOOR[metric]:
+				regressions.append(Regression(benchmark=name, metric=metric, baseline=previous, current=current))
+	return regressions
+
+
+def result_summaries(results: list[BenchmarkResult]) -> dict[str, dict[str, Any]]:
+	return {result.name: result.summary() for result in results}
+
+
+def format_table(summaries: dict[str, dict[str, Any]]) -> str:
+	columns = ('p50_ms', 'p95_ms', 'p99_ms', 'round_trips', 'python_peak_mb', 'js_heap_mb')
+	width = max([len('benchmark'), *map(len, summaries)])
+	lines = [f'{"benchmark":<{width}}  ' + '  '.join(f'{column:>14}' for column in columns)]
+	for name, summary in summaries.items():
+		values = [summary.get(column) for column in columns]
+		lines.append(
+			f'{name:<{width}}  ' + '  '.join(f'{value:>14.2f}' if value is not None else f'{"-":>14}' for value in values)
+		)
+	return '\n'.join(lines)
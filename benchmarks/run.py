@@ -0,0 +1,360 @@
+"""
+Run the offline benchmarks against the local page corpus and optionally compare them to a stored baseline.
+
+	python -m benchmarks.run                              # all suites, print a table
+	python -m benchmarks.run --suite dom state -n 20      # only some suites, more iterations
+	python -m benchmarks.run --save-baseline main         # store benchmarks/baselines/main.json
+	python -m benchmarks.run --compare main               # exit 1 if anything regressed by more than --tolerance
+
+Suites:
+	dom        DomService.get_clickable_elements (buildDomTree.js + tree construction) on every corpus page, and the same
+	           with the CDP snapshot backend as dom_cdp.<page> (select the backends with --dom-backends)
+	serialize  DOMElementNode.clickable_elements_to_string on the tree built for every corpus page
+	state      BrowserSession.get_state_summary (DOM + screenshot + tabs) on every corpus page
+	agent      a full Agent.run over the corpus driven by a ScriptedChatModel, so no LLM or network is needed
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault('ANONYMIZED_TELEMETRY', 'false')
+os.environ.setdefault('BROWSER_USE_LOGGING_LEVEL', 'result')
+
+from benchmarks.corpus import CORPUS, serve_corpus
+from benchmarks.metrics import (
+	BenchmarkResult,
+	compare_to_baseline,
+	count_round_trips,
+	format_table,
+	result_summaries,
+	trace_python_memory,
+)
+from benchmarks.scripted_llm import ScriptedChatModel
+from browser_use.agent.service import Agent
+from browser_use.agent.views import AgentSettings
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.service import DomService, load_build_dom_tree_js
+from browser_use.dom.snapshot_processor.service import get_cdp_session
+from browser_use.dom.views import DOMState
+
+logger = logging.getLogger(__name__)
+
+BASELINES_DIR = Path(__file__).parent / 'baselines'
+SUITES = ('dom', 'serialize', 'state', 'agent')
+DOM_BACKENDS = ('js', 'cdp')
+
+
+async def js_heap_mb(page) -> float | None:
+	"""Used JS heap of the page in MB (Runtime.getHeapUsage is exact, unlike the quantized performance.memory)"""
+	try:
+		cdp_session = await page.context.new_cdp_session(page)
+		try:
+			heap = await cdp_session.send('Runtime.getHeapUsage')
+		finally:
+			await cdp_session.detach()
+		return heap['usedSize'] / 1024 / 1024
+	except Exception as e:
+		logger.debug(f'Could not read the JS heap size: {type(e).__name__}: {e}')
+		return None
+
+
+async def layout_count(page) -> float | None:
+	"""Layouts the page has computed so far, the CDP Performance counters only start counting once the domain is enabled"""
+	try:
+		cdp_session = await get_cdp_session(page)
+		await cdp_session.send('Performance.enable')
+		metrics = await cdp_session.send('Performance.getMetrics')
+	except Exception as e:
+		logger.debug(f'Could not read the layout count: {type(e).__name__}: {e}')
+		return None
+	return next((metric['value'] for metric in metrics['metrics'] if metric['name'] == 'LayoutCount'), None)
+
+
+async def measure(
+	name: str,
+	run_once: Callable[[], Awaitable[Any]],
+	iterations: int,
+	page=None,
+	extra: Callable[[], dict[str, Any]] | None = None,
+) -> BenchmarkResult:
+	"""Time `iterations` calls of run_once after a warm-up call, then measure memory in one more traced call"""
+	await run_once()
+
+	samples_ms = []
+	round_trips = 0
+	js_heap_peak = None
+	for _ in range(iterations):
+		with count_round_trips() as calls:
+			start = time.perf_counter()
+			await run_once()
+			samples_ms.append((time.perf_counter() - start) * 1000)
+		round_trips += calls.total()
+		if page is not None and (heap := await js_heap_mb(page)) is not None:
+			js_heap_peak = max(js_heap_peak or 0.0, heap)
+
+	# tracemalloc slows python down several times, so memory is measured in a separate call that is not timed
+	with trace_python_memory() as memory:
+		await run_once()
+
+	result = BenchmarkResult(
+		name=name,
+		samples_ms=samples_ms,
+		round_trips=round_trips / max(iterations, 1),
+		python_peak_mb=memory['peak_mb'],
+		js_heap_mb=js_heap_peak,
+		extra=extra() if extra else {},
+	)
+	print(f'  {name}: p50={result.summary()["p50_ms"]:.1f}ms round_trips={result.round_trips:.1f}', file=sys.stderr)
+	return result
+
+
+async def open_corpus_page(browser_session: BrowserSession, url: str):
+	page = await browser_session.get_current_page()
+	await page.goto(url, wait_until='load')
+	return page
+
+
+async def bench_dom_pipeline(
+	browser_session: BrowserSession,
+	base_url: str,
+	pages: list[str],
+	suites: list[str],
+	iterations: int,
+	dom_backends: list[str],
+) -> list[BenchmarkResult]:
+	"""dom, serialize and state suites, one benchmark per corpus page (and per DOM backend for the dom suite)"""
+	profile = browser_session.browser_profile
+	include_attributes = AgentSettings().include_attributes
+	results = []
+
+	for name in pages:
+		page = await open_corpus_page(browser_session, f'{base_url}/{name}')
+		dom_state: DOMState | None = None
+
+		async def build_dom(backend: str = profile.dom_backend) -> None:
+			nonlocal dom_state
+			dom_state = await DomService(page, backend=backend).get_clickable_elements(
+				highlight_elements=profile.highlight_elements,
+				viewport_expansion=profile.viewport_expansion,
+			)
+
+		if 'dom' in suites:
+			for backend in dom_backends:
+				layouts_before = await layout_count(page)
+				result = await measure(
+					f'dom.{name}' if backend == 'js' else f'dom_{backend}.{name}',
+					lambda backend=backend: build_dom(backend),
+					iterations,
+					page=page,
+					extra=lambda: {'elements': len(dom_state.selector_map) if dom_state else 0},
+				)
+				layouts_after = await layout_count(page)
+				if layouts_before is not None and layouts_after is not None:
+					# measure() also runs one warm-up and one memory traced iteration
+					result.extra['layouts'] = (layouts_after - layouts_before) / (iterations + 2)
+				results.append(result)
+
+			if 'js' in dom_backends:
+				# one tile of the page after another, served from the in-page index built by the first call
+				tile_service = DomService(page)
+				tile_state = await tile_service.get_tile_elements(0)
+				tile_count = tile_state.tile_count
+
+				async def next_tile() -> None:
+					nonlocal tile_state
+					tile_state = await tile_service.get_tile_elements((tile_state.first_tile + 1) % tile_count)
+
+				results.append(
+					await measure(
+						f'dom_tiles.{name}',
+						next_tile,
+						iterations,
+						page=page,
+						extra=lambda: {'tiles': tile_count, 'elements': len(tile_state.selector_map)},
+					)
+				)
+
+				# buildDomTree.js alone, without the python side: the production build against the instrumented debug build
+				for debug in (False, True):
+					script = load_build_dom_tree_js(debug=debug)
+					script_args = {
+						'doHighlightElements': profile.highlight_elements,
+						'focusHighlightIndex': -1,
+						'viewportExpansion': profile.viewport_expansion,
+						'debugMode': debug,
+					}
+					results.append(
+						await measure(
+							f'dom_script_debug.{name}' if debug else f'dom_script.{name}',
+							lambda script=script, script_args=script_args: page.evaluate(script, script_args),
+							iterations,
+							page=page,
+						)
+					)
+
+		if 'serialize' in suites:
+			if dom_state is None:
+				await build_dom()
+			assert dom_state is not None
+			element_tree = dom_state.element_tree
+			prompt: str = ''
+
+			async def serialize() -> None:
+				nonlocal prompt
+				prompt = element_tree.clickable_elements_to_string(include_attributes=include_attributes)
+
+			results.append(await measure(f'serialize.{name}', serialize, iterations, extra=lambda: {'chars': len(prompt)}))
+
+		if 'state' in suites:
+
+			async def state_summary() -> None:
+				# the page does not change between iterations, so without force every call after the first is a cache hit
+				await browser_session.get_state_summary(cache_clickable_elements_hashes=True, force=True)
+
+			results.append(await measure(f'state.{name}', state_summary, iterations, page=page))
+
+	return results
+
+
+def agent_script(base_url: str, pages: list[str]) -> list[list[dict[str, Any]]]:
+	steps: list[list[dict[str, Any]]] = []
+	for name in pages:
+		steps.append([{'go_to_url': {'url': f'{base_url}/{name}'}}])
+		steps.append([{'scroll_down': {}}])
+	steps.append([{'done': {'text': 'Visited every corpus page', 'success': True}}])
+	return steps
+
+
+async def bench_agent(browser_session: BrowserSession, base_url: str, pages: list[str], iterations: int) -> BenchmarkResult:
+	"""A full Agent.run over the corpus, with the LLM replaced by a script so only browser-use's own work is timed"""
+	llm = ScriptedChatModel(steps=agent_script(base_url, pages))
+	runs: list[dict[str, float]] = []
+
+	async def run_agent() -> None:
+		llm.reset()
+		await open_corpus_page(browser_session, f'{base_url}/')
+		cache_before = browser_session.state_summary_cache_stats
+		agent = Agent(
+			task='Visit every page of the benchmark corpus and scroll down once on each',
+			llm=llm,
+			browser_session=browser_session,
+			tool_calling_method='raw',
+			enable_memory=False,
+		)
+		history = await agent.run(max_steps=len(llm.steps) + 2)
+		assert history.is_done(), f'scripted agent run did not finish: {history.errors()}'
+
+		run: dict[str, float] = {
+			'steps': len(history.history),
+			'prompt_chars': sum(llm.prompt_chars) / max(len(llm.prompt_chars), 1),
+		}
+		cache_after = browser_session.state_summary_cache_stats
+		hits, misses = (cache_after[key] - cache_before[key] for key in ('hits', 'misses'))
+		run['state_cache_hit_rate'] = hits / max(hits + misses, 1)
+		for item in history.history:
+			for phase, seconds in (item.metadata.phase_durations if item.metadata else {}).items():
+				run[f'{phase}_ms'] = run.get(f'{phase}_ms', 0.0) + seconds * 1000
+		runs.append(run)
+
+	def averaged_runs() -> dict[str, Any]:
+		keys = sorted({key for run in runs for key in run})
+		return {key: sum(run.get(key, 0.0) for run in runs) / len(runs) for key in keys}
+
+	page = await browser_session.get_current_page()
+	return await measure('agent.corpus_tour', run_agent, iterations, page=page, extra=averaged_runs)
+
+
+def load_baseline(name: str) -> dict[str, dict[str, Any]]:
+	path = Path(name) if name.endswith('.json') else BASELINES_DIR / f'{name}.json'
+	return json.loads(path.read_text())['results']
+
+
+def save_results(path: Path, summaries: dict[str, dict[str, Any]], args: argparse.Namespace) -> Path:
+	payload = {
+		'meta': {
+			'created': datetime.now(timezone.utc).isoformat(),
+			'browser_use': version('browser-use'),
+			'playwright': version('playwright'),
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'iterations': args.iterations,
+			'agent_iterations': args.agent_iterations,
+		},
+		'results': summaries,
+	}
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+	return path
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+	results: list[BenchmarkResult] = []
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(
+			executable_path=os.getenv('BROWSER_PATH'),
+			user_data_dir=None,
+			headless=not args.headful,
+			keep_alive=True,
+		)
+	)
+	with serve_corpus() as base_url:
+		await browser_session.start()
+		try:
+			if any(suite in args.suite for suite in ('dom', 'serialize', 'state')):
+				results += await bench_dom_pipeline(
+					browser_session, base_url, args.pages, args.suite, args.iterations, args.dom_backends
+				)
+			if 'agent' in args.suite:
+				results.append(await bench_agent(browser_session, base_url, args.pages, args.agent_iterations))
+		finally:
+			await browser_session.kill()
+	return result_summaries(results)
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description='Offline benchmarks for the DOM pipeline and the agent step loop')
+	parser.add_argument('--suite', nargs='+', choices=SUITES, default=list(SUITES))
+	parser.add_argument('--pages', nargs='+', choices=list(CORPUS), default=list(CORPUS))
+	parser.add_argument(
+		'--dom-backends', nargs='+', choices=DOM_BACKENDS, default=list(DOM_BACKENDS), help='DOM backends timed by the dom suite'
+	)
+	parser.add_argument('-n', '--iterations', type=int, default=10, help='Timed iterations per benchmark (after one warm-up)')
+	parser.add_argument('--agent-iterations', type=int, default=3, help='Timed Agent.run iterations')
+	parser.add_argument('--output', type=Path, help='Also write the results to this json file')
+	parser.add_argument('--save-baseline', metavar='NAME', help='Store the results as benchmarks/baselines/NAME.json')
+	parser.add_argument('--compare', metavar='NAME', help='Baseline name (or path to a results json) to compare against')
+	parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression, 0.25 = 25%%')
+	parser.add_argument('--headful', action='store_true', help='Show the browser window')
+	args = parser.parse_args()
+
+	summaries = asyncio.run(run_benchmarks(args))
+	print(format_table(summaries))
+
+	if args.output:
+		save_results(args.output, summaries, args)
+	if args.save_baseline:
+		print(f'Saved baseline to {save_results(BASELINES_DIR / f"{args.save_baseline}.json", summaries, args)}')
+	if args.compare:
+		regressions = compare_to_baseline(summaries, load_baseline(args.compare), args.tolerance)
+		if regressions:
+			print(f'\n{len(regressions)} regression(s) compared to {args.compare}:')
+			for regression in regressions:
+				print(f'  {regression}')
+			return 1
+		print(f'\nNo regressions compared to {args.compare} (tolerance {args.tolerance:.0%})')
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
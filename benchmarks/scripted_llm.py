@@ -0,0 +1,59 @@
+"""
+Deterministic stand-in for the agent's LLM: replays a script of actions so Agent.run can be benchmarked offline.
+"""
+
+import json
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+
+class ScriptedChatModel(BaseChatModel):
+	"""
+	Answers each call with the next step of the script, as the raw JSON AgentOutput the agent parses when
+	running with tool_calling_method='raw'. Each step is a list of actions, e.g. [{'scroll_down': {}}].
+	Once the script is exhausted every call answers with a done action.
+	"""
+
+	model_name: str = 'scripted'
+	steps: list[list[dict[str, Any]]]
+
+	# there is no API key or tool calling support to verify, so the agent should not spend a scripted step testing them
+	_verified_api_keys: bool = PrivateAttr(default=True)
+	_calls: int = PrivateAttr(default=0)
+	_prompt_chars: list[int] = PrivateAttr(default_factory=list)
+
+	@property
+	def _llm_type(self) -> str:
+		return 'scripted'
+
+	@property
+	def prompt_chars(self) -> list[int]:
+		"""Size of the prompt sent on each call, a proxy for the tokens a real model would be billed for"""
+		return self._prompt_chars
+
+	def reset(self) -> None:
+		self._calls = 0
+		self._prompt_chars = []
+
+	def _generate(
+		self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: Any = None, **kwargs: Any
+	) -> ChatResult:
+		self._prompt_chars.append(sum(len(str(message.content)) for message in messages))
+		if self._calls < len(self.steps):
+			actions = self.steps[self._calls]
+		else:
+			actions = [{'done': {'text': 'Script finished', 'success': True}}]
+		output = {
+			'current_state': {
+				'evaluation_previous_goal': 'Success',
+				'memory': f'Replaying scripted step {self._calls + 1}',
+				'next_goal': ', '.join(name for action in actions for name in action),
+			},
+			'action': actions,
+		}
+		self._calls += 1
+		return ChatResult(generations=[ChatGeneration(message=AIMessage(content=json.dumps(output)))])
@@ -1,13 +1,49 @@
+from typing import TYPE_CHECKING
+
 from browser_use.logging_config import setup_logging
 
 logger = setup_logging()
 
-from browser_use.agent.prompts import SystemPrompt
-from browser_use.agent.service import Agent
-from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
-from browser_use.browser import Browser, BrowserConfig, BrowserContext, BrowserContextConfig, BrowserProfile, BrowserSession
-from browser_use.controller.service import Controller
-from browser_use.dom.service import DomService
+if TYPE_CHECKING:
+	from browser_use.agent.prompts import SystemPrompt
+	from browser_use.agent.service import Agent
+	from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
+	from browser_use.browser import Browser, BrowserConfig, BrowserContext, BrowserContextConfig, BrowserProfile, BrowserSession
+	from browser_use.controller.service import Controller
+	from browser_use.dom.service import DomService
+
+# Public exports are imported lazily on first attribute access (PEP 562), so `import browser_use` stays cheap
+# for short-lived processes that only need a part of the library (e.g. just the BrowserSession)
+_LAZY_IMPORTS = {
+	'Agent': 'browser_use.agent.service',
+	'SystemPrompt': 'browser_use.agent.prompts',
+	'ActionModel': 'browser_use.agent.views',
+	'ActionResult': 'browser_use.agent.views',
+	'AgentHistoryList': 'browser_use.agent.views',
+	'Browser': 'browser_use.browser',
+	'BrowserConfig': 'browser_use.browser',
+	'BrowserContext': 'browser_use.browser',
+	'BrowserContextConfig': 'browser_use.browser',
+	'BrowserProfile': 'browser_use.browser',
+	'BrowserSession': 'browser_use.browser',
+	'Controller': 'browser_use.controller.service',
+	'DomService': 'browser_use.dom.service',
+}
+
+
+def __getattr__(name: str):
+	if name in _LAZY_IMPORTS:
+		from importlib import import_module
+
+		attr = getattr(import_module(_LAZY_IMPORTS[name]), name)
+		globals()[name] = attr  # cache it so __getattr__ is only hit once per name
+		return attr
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+	return sorted([*globals(), *_LAZY_IMPORTS])
+
 
 __all__ = [
 	'Agent',
@@ -3,8 +3,16 @@ from __future__ import annotations
 import base64
 import io
 import logging
+import multiprocessing
 import os
 import platform
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from typing import TYPE_CHECKING
 
 from browser_use.agent.views import AgentHistoryList
@@ -30,6 +38,258 @@ def decode_unicode_escapes_to_utf8(text: str) -> str:
 		return text
 
 
+VIDEO_EXTENSIONS = ('.mp4', '.webm')
+
+# frames are overlaid in a few workers at most, each one holds a couple of decoded screenshots
+MAX_RENDER_WORKERS = 4
+# screenshots wider than this (e.g. taken with a device scale factor of 2) are downscaled when the Agent saves its history
+DEFAULT_MAX_FRAME_WIDTH = 1280
+
+# Font candidates in order of preference
+# ArialUni is a font that comes with Office and can render most non-alphabet characters
+FONT_OPTIONS = [
+	'Microsoft YaHei',  # 微软雅黑
+	'SimHei',  # 黑体
+	'SimSun',  # 宋体
+	'Noto Sans CJK SC',  # 思源黑体
+	'WenQuanYi Micro Hei',  # 文泉驿微米黑
+	'Helvetica',
+	'Arial',
+	'DejaVuSans',
+	'Verdana',
+]
+
+
+@lru_cache(maxsize=8)
+def _load_fonts(font_size: int, title_font_size: int, goal_font_size: int) -> tuple[ImageFont.FreeTypeFont, ...]:
+	"""Load the (regular, title, goal) fonts, cached so each process only hits the filesystem once per size."""
+	from PIL import ImageFont
+
+	for font_name in FONT_OPTIONS:
+		try:
+			if platform.system() == 'Windows':
+				# Need to specify the abs font path on Windows
+				font_name = os.path.join(os.getenv('WIN_FONT_DIR', 'C:\\Windows\\Fonts'), font_name + '.ttf')
+			regular_font = ImageFont.truetype(font_name, font_size)
+			title_font = ImageFont.truetype(font_name, title_font_size)
+			goal_font = ImageFont.truetype(font_name, goal_font_size)
+			return regular_font, title_font, goal_font
+		except OSError:
+			continue
+
+	regular_font = ImageFont.load_default()
+	title_font = ImageFont.load_default()
+	return regular_font, title_font, regular_font  # type: ignore
+
+
+@lru_cache(maxsize=4)
+def _load_logo(logo_path: str) -> Image.Image | None:
+	"""Load and shrink the logo, cached per process."""
+	from PIL import Image
+
+	try:
+		logo = Image.open(logo_path)
+		# Resize logo to be small (e.g., 40px height)
+		logo_height = 150
+		aspect_ratio = logo.width / logo.height
+		logo_width = int(logo_height * aspect_ratio)
+		return logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+	except Exception as e:
+		logger.warning(f'Could not load logo: {e}')
+		return None
+
+
+@dataclass
+class _FrameRenderSettings:
+	"""Everything a worker needs to render a frame, sent once per worker via the pool initializer."""
+
+	font_size: int
+	title_font_size: int
+	goal_font_size: int
+	margin: int
+	line_spacing: float
+	logo_path: str | None
+	max_frame_width: int | None
+	palettize: bool
+
+
+_worker_settings: _FrameRenderSettings | None = None
+
+
+def _init_frame_worker(settings: _FrameRenderSettings) -> None:
+	global _worker_settings
+	_worker_settings = settings
+
+
+def _decode_screenshot(screenshot: str, max_frame_width: int | None) -> tuple[Image.Image, float]:
+	"""Decode a base64 screenshot and downscale it to max_frame_width before any other work is done on it."""
+	from PIL import Image
+
+	image = Image.open(io.BytesIO(base64.b64decode(screenshot)))
+	scale = 1.0
+	if max_frame_width and image.width > max_frame_width:
+		scale = max_frame_width / image.width
+		image.draft('RGB', (max_frame_width, int(image.height * scale)))  # cheap JPEG downscale on decode, no-op for PNG
+		image = image.resize(
+			(max_frame_width, max(1, round(image.height * max_frame_width / image.width))), Image.Resampling.LANCZOS
+		)
+	return image, scale
+
+
+def _render_frame(job: tuple[str, int, str, str | None], settings: _FrameRenderSettings | None = None) -> Image.Image:
+	"""
+	Render a single output frame. Runs in the render pool's workers (or inline when rendering serially).
+
+	Args:
+	    job: (kind, step_number, screenshot_b64, text) where kind is 'task' or 'step'
+	    settings: render settings, defaults to the ones the worker was initialized with
+
+	Returns:
+	    The rendered frame, already palettized when the output is a GIF
+	"""
+	settings = settings or _worker_settings
+	assert settings is not None, 'frame worker was not initialized'
+	kind, step_number, screenshot, text = job
+
+	image, scale = _decode_screenshot(screenshot, settings.max_frame_width)
+
+	# scale text with the frame so downscaled frames keep the same layout, fonts stay cached per size
+	def scaled(value: int) -> int:
+		return max(8, round(value * scale))
+
+	regular_font, title_font, _goal_font = _load_fonts(
+		scaled(settings.font_size), scaled(settings.title_font_size), scaled(settings.goal_font_size)
+	)
+	logo = _load_logo(settings.logo_path) if settings.logo_path else None
+	if logo is not None and scale != 1.0:
+		logo = logo.resize((max(1, round(logo.width * scale)), max(1, round(logo.height * scale))))
+
+	if kind == 'task':
+		image = _create_task_frame(
+			text or '',
+			image,
+			title_font,  # type: ignore
+			regular_font,  # type: ignore
+			logo,
+			settings.line_spacing,
+		)
+	elif text is not None:
+		image = _add_overlay_to_image(
+			image=image,
+			step_number=step_number,
+			goal_text=text,
+			regular_font=regular_font,  # type: ignore
+			title_font=title_font,  # type: ignore
+			margin=round(settings.margin * scale),
+			logo=logo,
+		)
+
+	image = image.convert('RGB')
+	if settings.palettize:
+		# quantizing is the most expensive part of GIF encoding, do it here in parallel instead of in the writer
+		image = image.quantize(colors=256)
+	return image
+
+
+def _iter_rendered_frames(
+	jobs: list[tuple[str, int, str, str | None]],
+	settings: _FrameRenderSettings,
+	max_workers: int | None,
+	use_processes: bool = False,
+) -> Iterator[Image.Image]:
+	"""
+	Yield rendered frames in order, rendering them in a thread pool (PIL releases the GIL while decoding, resizing and
+	quantizing), or in a process pool when use_processes is set.
+
+	At most ~2 frames per worker are in flight at once, so memory stays bounded no matter how long the history is.
+	"""
+	if max_workers is None:
+		max_workers = min(len(jobs), os.cpu_count() or 1, MAX_RENDER_WORKERS)
+
+	executor: Executor | None = None
+	if max_workers > 1 and len(jobs) > 1:
+		if not use_processes:
+			executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gif_render')
+		else:
+			try:
+				# spawn instead of fork: the agent process runs an event loop and playwright's threads, which must not be forked
+				executor = ProcessPoolExecutor(
+					max_workers=max_workers,
+					mp_context=multiprocessing.get_context('spawn'),
+					initializer=_init_frame_worker,
+					initargs=(settings,),
+				)
+			except (OSError, NotImplementedError) as e:
+				# some sandboxes don't allow spawning processes, fall back to rendering inline
+				logger.debug(f'Could not start GIF render pool ({type(e).__name__}: {e}), rendering frames serially')
+
+	rendered = 0
+	if executor is not None:
+		# the process workers already got the settings from their initializer
+		job_settings = None if use_processes else settings
+		try:
+			with executor:
+				pending: deque[Future[Image.Image]] = deque()
+				job_iter = iter(jobs)
+				for job in islice(job_iter, max_workers * 2):
+					pending.append(executor.submit(_render_frame, job, job_settings))
+				while pending:
+					frame = pending.popleft().result()
+					next_job = next(job_iter, None)
+					if next_job is not None:
+						pending.append(executor.submit(_render_frame, next_job, job_settings))
+					yield frame
+					rendered += 1
+		except BrokenProcessPool as e:
+			# e.g. the spawned workers re-import a __main__ script that starts an agent without an if __name__ == '__main__' guard
+			logger.debug(f'GIF render pool broke ({type(e).__name__}: {e}), rendering the remaining frames serially')
+
+	for job in jobs[rendered:]:
+		yield _render_frame(job, settings)
+
+
+def _write_gif_stream(frames: Iterator[Image.Image], output_path: str, duration: int) -> int:
+	"""Write frames to a looping GIF one at a time, without ever holding more than one frame in memory."""
+	from PIL import GifImagePlugin
+
+	frame_count = 0
+	with open(output_path, 'wb') as fp:
+		for frame in frames:
+			if frame.mode != 'P':
+				frame = frame.convert('RGB').quantize(colors=256)
+			if frame_count == 0:
+				header, _ = GifImagePlugin.getheader(frame, info={'loop': 0})
+				fp.write(b''.join(header))
+			# each frame carries its own palette since frames are quantized independently
+			for chunk in GifImagePlugin.getdata(frame, duration=duration, include_color_table=True):
+				fp.write(chunk)
+			frame_count += 1
+		fp.write(b';')  # GIF trailer
+	return frame_count
+
+
+def _write_video_stream(frames: Iterator[Image.Image], output_path: str, duration: int) -> int:
+	"""Stream frames into an MP4/WebM encoder via imageio-ffmpeg."""
+	try:
+		import imageio.v2 as imageio
+		import numpy as np
+	except ImportError as e:
+		raise ImportError(
+			f'Saving agent history as {os.path.splitext(output_path)[1]} requires imageio-ffmpeg: pip install "browser-use[video]"'
+		) from e
+
+	codec = 'libvpx-vp9' if output_path.lower().endswith('.webm') else 'libx264'
+	frame_count = 0
+	writer = imageio.get_writer(output_path, fps=1000 / duration, codec=codec, quality=8, macro_block_size=2)
+	try:
+		for frame in frames:
+			writer.append_data(np.asarray(frame.convert('RGB')))
+			frame_count += 1
+	finally:
+		writer.close()
+	return frame_count
+
+
 def create_history_gif(
 	task: str,
 	history: AgentHistoryList,
@@ -44,125 +304,67 @@ def create_history_gif(
 	goal_font_size: int = 44,
 	margin: int = 40,
 	line_spacing: float = 1.5,
+	max_frame_width: int | None = None,
+	max_workers: int | None = None,
+	use_processes: bool = False,
 ) -> None:
-	"""Create a GIF from the agent's history with overlaid task and goal text."""
+	"""
+	Create a GIF (or an MP4/WebM video, based on the output_path extension) from the agent's history
+	with overlaid task and goal text.
+
+	Frames are decoded, downscaled to max_frame_width and overlaid in a pool of max_workers threads
+	(defaults to one per CPU up to MAX_RENDER_WORKERS, pass 1 to render inline), then streamed into the encoder one at a time.
+	use_processes renders in spawned processes instead, only use it from a script guarded by if __name__ == '__main__'.
+	"""
 	if not history.history:
 		logger.warning('No history to create GIF from')
 		return
 
-	from PIL import Image, ImageFont
-
-	images = []
-
 	# if history is empty or first screenshot is None, we can't create a gif
 	if not history.history or not history.history[0].state.screenshot:
 		logger.warning('No history or first screenshot to create GIF from')
 		return
 
-	# Try to load nicer fonts
-	try:
-		# Try different font options in order of preference
-		# ArialUni is a font that comes with Office and can render most non-alphabet characters
-		font_options = [
-			'Microsoft YaHei',  # 微软雅黑
-			'SimHei',  # 黑体
-			'SimSun',  # 宋体
-			'Noto Sans CJK SC',  # 思源黑体
-			'WenQuanYi Micro Hei',  # 文泉驿微米黑
-			'Helvetica',
-			'Arial',
-			'DejaVuSans',
-			'Verdana',
-		]
-		font_loaded = False
-
-		for font_name in font_options:
-			try:
-				if platform.system() == 'Windows':
-					# Need to specify the abs font path on Windows
-					font_name = os.path.join(os.getenv('WIN_FONT_DIR', 'C:\\Windows\\Fonts'), font_name + '.ttf')
-				regular_font = ImageFont.truetype(font_name, font_size)
-				title_font = ImageFont.truetype(font_name, title_font_size)
-				goal_font = ImageFont.truetype(font_name, goal_font_size)
-				font_loaded = True
-				break
-			except OSError:
-				continue
-
-		if not font_loaded:
-			raise OSError('No preferred fonts found')
-
-	except OSError:
-		regular_font = ImageFont.load_default()
-		title_font = ImageFont.load_default()
-
-		goal_font = regular_font
-
-	# Load logo if requested
-	logo = None
-	if show_logo:
-		try:
-			logo = Image.open('./static/browser-use.png')
-			# Resize logo to be small (e.g., 40px height)
-			logo_height = 150
-			aspect_ratio = logo.width / logo.height
-			logo_width = int(logo_height * aspect_ratio)
-			logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-		except Exception as e:
-			logger.warning(f'Could not load logo: {e}')
+	is_video = output_path.lower().endswith(VIDEO_EXTENSIONS)
+	settings = _FrameRenderSettings(
+		font_size=font_size,
+		title_font_size=title_font_size,
+		goal_font_size=goal_font_size,
+		margin=margin,
+		line_spacing=line_spacing,
+		logo_path=os.path.abspath('./static/browser-use.png') if show_logo else None,
+		max_frame_width=max_frame_width,
+		palettize=not is_video,
+	)
+
+	jobs: list[tuple[str, int, str, str | None]] = []
 
 	# Create task frame if requested
 	if show_task and task:
-		task_frame = _create_task_frame(
-			task,
-			history.history[0].state.screenshot,
-			title_font,  # type: ignore
-			regular_font,  # type: ignore
-			logo,
-			line_spacing,
-		)
-		images.append(task_frame)
+		jobs.append(('task', 0, history.history[0].state.screenshot, task))
 
 	# Process each history item
 	for i, item in enumerate(history.history, 1):
 		if not item.state.screenshot:
 			continue
+		goal_text = item.model_output.current_state.next_goal if show_goals and item.model_output else None
+		jobs.append(('step', i, item.state.screenshot, goal_text))
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(item.state.screenshot)
-		image = Image.open(io.BytesIO(img_data))
-
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
-			)
-
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
-		)
-		logger.info(f'Created GIF at {output_path}')
-	else:
+	if not jobs:
 		logger.warning('No images found in history to create GIF')
+		return
+
+	frames = _iter_rendered_frames(jobs, settings, max_workers, use_processes)
+	if is_video:
+		frame_count = _write_video_stream(frames, output_path, duration)
+	else:
+		frame_count = _write_gif_stream(frames, output_path, duration)
+	logger.info(f'Created {"video" if is_video else "GIF"} with {frame_count} frames at {output_path}')
 
 
 def _create_task_frame(
 	task: str,
-	first_screenshot: str,
+	first_screenshot: str | Image.Image,
 	title_font: ImageFont.FreeTypeFont,
 	regular_font: ImageFont.FreeTypeFont,
 	logo: Image.Image | None = None,
@@ -171,8 +373,10 @@ def _create_task_frame(
 	"""Create initial frame showing the task."""
 	from PIL import Image, ImageDraw, ImageFont
 
-	img_data = base64.b64decode(first_screenshot)
-	template = Image.open(io.BytesIO(img_data))
+	if isinstance(first_screenshot, str):
+		template = Image.open(io.BytesIO(base64.b64decode(first_screenshot)))
+	else:
+		template = first_screenshot
 	image = Image.new('RGB', template.size, (0, 0, 0))
 	draw = ImageDraw.Draw(image)
 
@@ -0,0 +1,145 @@
+"""
+Opt-in on-disk cache of the agent's decisions, for workloads that run the same tasks on the same sites again and again.
+
+A step's AgentOutput is stored under a key made of the task, a signature of the page (host and path of its url and the hashes
+of its interactive elements) and the actions taken before it in the run. Once the model made the same decision for a key
+often enough, the cached output is used instead of calling the model. An entry is dropped as soon as one of its actions fails.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from urllib.parse import urlparse
+
+from pydantic import ValidationError
+
+from browser_use.agent.views import ActionResult, AgentOutput
+from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
+from browser_use.dom.views import DOMElementNode, SelectorMap
+
+logger = logging.getLogger(__name__)
+
+# actions whose parameters depend on the page content rather than its layout, a step with one of them is never cached
+UNCACHEABLE_ACTIONS = {'done'}
+
+
+def _hash(*parts: str) -> str:
+	return hashlib.sha256('\x00'.join(parts).encode()).hexdigest()
+
+
+def _actions(model_output: AgentOutput) -> list[dict]:
+	return [action.model_dump(mode='json', exclude_none=True) for action in model_output.action]
+
+
+def _element_hashes(model_output: AgentOutput, selector_map: SelectorMap) -> list[str | None]:
+	"""Hash of the element each action acts on: the page signature is an unordered set, so an index alone is ambiguous"""
+	hashes = []
+	for action in model_output.action:
+		index = action.get_index()
+		element = selector_map.get(index) if index is not None else None
+		hashes.append(ClickableElementProcessor.hash_dom_element(element) if element is not None else None)
+	return hashes
+
+
+class PlanCache:
+	"""Stores the AgentOutput of each step in a directory, one JSON file per key"""
+
+	def __init__(self, cache_dir: str | Path, min_confirmations: int = 2):
+		"""
+		Args:
+			cache_dir: Directory of the cache files, it can be shared by agents running the same tasks.
+			min_confirmations: How many times the same decision has to be made (by the model or by a successful cached
+				step) for a key before it is reused instead of calling the model.
+		"""
+		self.cache_dir = Path(cache_dir)
+		self.min_confirmations = min_confirmations
+
+	@staticmethod
+	def page_signature(url: str, element_tree: DOMElementNode) -> str:
+		"""Signature of the layout of a page, the query and fragment of its url are left out as they often hold session ids"""
+		parsed = urlparse(url)
+		hashes = sorted(ClickableElementProcessor.get_clickable_elements_hashes(element_tree))
+		return _hash(parsed.netloc, parsed.path, *hashes)
+
+	@staticmethod
+	def key(task: str, page_signature: str, trail: str) -> str:
+		"""
+		Cache key of a step. The trail identifies the steps before it in the run, so a page that is seen again after an
+		action that did not change its layout (e.g. a form after input_text) gets a new key.
+		"""
+		return _hash(' '.join(task.split()), page_signature, trail)
+
+	@staticmethod
+	def extend_trail(key: str, model_output: AgentOutput) -> str:
+		"""Trail of the next step, after the actions of model_output were taken on the step of key"""
+		return _hash(key, json.dumps(_actions(model_output), sort_keys=True))
+
+	def _path(self, key: str) -> Path:
+		return self.cache_dir / f'{key}.json'
+
+	def _read(self, key: str) -> dict | None:
+		try:
+			return json.loads(self._path(key).read_text(encoding='utf-8'))
+		except FileNotFoundError:
+			return None
+		except (OSError, ValueError) as e:
+			logger.warning(f'Dropping unreadable plan cache entry {key}: {e}')
+			self.invalidate(key)
+			return None
+
+	def get(self, key: str, output_model: type[AgentOutput], selector_map: SelectorMap) -> AgentOutput | None:
+		"""
+		The cached output of a step, if it was confirmed often enough and the elements it acts on are still at the same
+		highlight indices
+		"""
+		entry = self._read(key)
+		if entry is None or entry.get('confirmations', 0) < self.min_confirmations:
+			return None
+		try:
+			model_output = output_model.model_validate(entry['model_output'])
+		except (KeyError, ValidationError) as e:
+			# the cached actions are no longer available, e.g. the controller changed
+			logger.debug(f'Dropping plan cache entry {key} that no longer validates: {e}')
+			self.invalidate(key)
+			return None
+		if _element_hashes(model_output, selector_map) != entry.get('elements'):
+			return None
+		return model_output
+
+	def update(self, key: str, model_output: AgentOutput, selector_map: SelectorMap, result: list[ActionResult]) -> None:
+		"""
+		Record the outcome of a step: confirm its decision if it succeeded, forget the key if one of its actions failed.
+		selector_map is the one the decision was made on.
+		"""
+		if any(r.error for r in result):
+			self.invalidate(key)
+			return
+		actions = _actions(model_output)
+		if any(name in UNCACHEABLE_ACTIONS for action in actions for name in action):
+			return
+
+		elements = _element_hashes(model_output, selector_map)
+		entry = self._read(key)
+		if entry is not None and entry.get('model_output', {}).get('action') == actions and entry.get('elements') == elements:
+			entry['confirmations'] += 1
+		else:
+			# a different decision for the same key, the previous one is not trusted anymore
+			entry = {
+				'confirmations': 1,
+				'model_output': model_output.model_dump(mode='json', exclude_none=True),
+				'elements': elements,
+			}
+
+		path = self._path(key)
+		tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+		try:
+			self.cache_dir.mkdir(parents=True, exist_ok=True)
+			tmp_path.write_text(json.dumps(entry), encoding='utf-8')
+			tmp_path.replace(path)  # atomic, agents sharing the cache never read a partial entry
+		except OSError as e:
+			logger.warning(f'Failed to write plan cache entry {key}: {e}')
+
+	def invalidate(self, key: str) -> None:
+		self._path(key).unlink(missing_ok=True)
@@ -1,94 +1,80 @@
-from playwright.async_api import Page
+import os
+import re
 
+from playwright.async_api import BrowserContext, Locator, Page
 
-# --- Helper Function for Replacing Sensitive Data ---
-def replace_sensitive_data(text: str, sensitive_map: dict) -> str:
-	"""Replaces sensitive data placeholders in text."""
-	if not isinstance(text, str):
-		return text
-	for placeholder, value in sensitive_map.items():
-		replacement_value = str(value) if value is not None else ''
-		text = text.replace(f'<secret>{placeholder}</secret>', replacement_value)
-	return text
+# Helpers of the scripts generated by PlaywrightScriptGenerator, this file is copied into every generated script as is, so it
+# must only depend on playwright and the standard library.
+
+ACTION_TIMEOUT_MS = 10_000
 
 
-# --- Helper Function for Robust Action Execution ---
 class PlaywrightActionError(Exception):
-	"""Custom exception for errors during Playwright script action execution."""
+	"""A recorded action could not be replayed"""
+
+
+def sensitive_data_env_var(name: str) -> str:
+	"""Environment variable the value of a <secret>name</secret> placeholder is read from"""
+	return re.sub(r'\W', '_', name).upper()
+
+
+def load_sensitive_data(names: list[str]) -> dict[str, str | None]:
+	return {name: os.getenv(sensitive_data_env_var(name)) for name in names}
 
-	pass
 
+def replace_sensitive_data(text: str, sensitive_data: dict[str, str | None]) -> str:
+	"""Replace the <secret>name</secret> placeholders in text with their values"""
 
-async def _try_locate_and_act(page: Page, selector: str, action_type: str, text: str | None = None, step_info: str = '') -> None:
+	def replace(match: re.Match) -> str:
+		value = sensitive_data.get(match.group(1))
+		if value is None:
+			env_var = sensitive_data_env_var(match.group(1))
+			raise PlaywrightActionError(f'No value for <secret>{match.group(1)}</secret>, set the {env_var} environment variable')
+		return value
+
+	return re.sub(r'<secret>(.*?)</secret>', replace, text)
+
+
+async def locate(page: Page, selectors: list[str], step_info: str) -> Locator:
 	"""
-	Attempts an action (click/fill) with XPath fallback by trimming prefixes.
-	Raises PlaywrightActionError if the action fails after all fallbacks.
+	Wait until one of the recorded selectors of an element matches a visible element, then return the first selector (in
+	order of preference) that matches exactly one element.
 	"""
-	print(f'Attempting {action_type} ({step_info}) using selector: {repr(selector)}')
-	original_selector = selector
-	MAX_FALLBACKS = 50  # Increased fallbacks
-	# Increased timeouts for potentially slow pages
-	INITIAL_TIMEOUT = 10000  # Milliseconds for the first attempt (10 seconds)
-	FALLBACK_TIMEOUT = 1000  # Shorter timeout for fallback attempts (1 second)
-
+	candidates = [page.locator(selector) for selector in selectors]
+	any_candidate = candidates[0]
+	for candidate in candidates[1:]:
+		any_candidate = any_candidate.or_(candidate)
 	try:
-		locator = page.locator(selector).first
-		if action_type == 'click':
-			await locator.click(timeout=INITIAL_TIMEOUT)
-		elif action_type == 'fill' and text is not None:
-			await locator.fill(text, timeout=INITIAL_TIMEOUT)
-		else:
-			# This case should ideally not happen if called correctly
-			raise PlaywrightActionError(f"Invalid action_type '{action_type}' or missing text for fill. ({step_info})")
-		print(f"  Action '{action_type}' successful with original selector.")
-		await page.wait_for_timeout(500)  # Wait after successful action
-		return  # Successful exit
+		await any_candidate.first.wait_for(state='visible', timeout=ACTION_TIMEOUT_MS)
 	except Exception as e:
-		print(f"  Warning: Action '{action_type}' failed with original selector ({repr(selector)}): {e}. Starting fallback...")
-
-		# Fallback only works for XPath selectors
-		if not selector.startswith('xpath='):
-			# Raise error immediately if not XPath, as fallback won't work
-			raise PlaywrightActionError(
-				f"Action '{action_type}' failed. Fallback not possible for non-XPath selector: {repr(selector)}. ({step_info})"
-			)
-
-		xpath_parts = selector.split('=', 1)
-		if len(xpath_parts) < 2:
-			raise PlaywrightActionError(
-				f"Action '{action_type}' failed. Could not extract XPath string from selector: {repr(selector)}. ({step_info})"
-			)
-		xpath = xpath_parts[1]  # Correctly get the XPath string
-
-		segments = [seg for seg in xpath.split('/') if seg]
-
-		for i in range(1, min(MAX_FALLBACKS + 1, len(segments))):
-			trimmed_xpath_raw = '/'.join(segments[i:])
-			fallback_xpath = f'xpath=//{trimmed_xpath_raw}'
-
-			print(f'    Fallback attempt {i}/{MAX_FALLBACKS}: Trying selector: {repr(fallback_xpath)}')
-			try:
-				locator = page.locator(fallback_xpath).first
-				if action_type == 'click':
-					await locator.click(timeout=FALLBACK_TIMEOUT)
-				elif action_type == 'fill' and text is not None:
-					try:
-						await locator.clear(timeout=FALLBACK_TIMEOUT)
-						await page.wait_for_timeout(100)
-					except Exception as clear_error:
-						print(f'    Warning: Failed to clear field during fallback ({step_info}): {clear_error}')
-					await locator.fill(text, timeout=FALLBACK_TIMEOUT)
-
-				print(f"    Action '{action_type}' successful with fallback selector: {repr(fallback_xpath)}")
-				await page.wait_for_timeout(500)
-				return  # Successful exit after fallback
-			except Exception as fallback_e:
-				print(f'    Fallback attempt {i} failed: {fallback_e}')
-				if i == MAX_FALLBACKS:
-					# Raise exception after exhausting fallbacks
-					raise PlaywrightActionError(
-						f"Action '{action_type}' failed after {MAX_FALLBACKS} fallback attempts. Original selector: {repr(original_selector)}. ({step_info})"
-					)
-
-	# This part should not be reachable if logic is correct, but added as safeguard
-	raise PlaywrightActionError(f"Action '{action_type}' failed unexpectedly for {repr(original_selector)}. ({step_info})")
+		raise PlaywrightActionError(f'No visible element matches {selectors} ({step_info}): {e}') from e
+	for candidate in candidates:
+		if await candidate.count() == 1:
+			return candidate
+	return any_candidate.first
+
+
+async def follow_new_tab(context: BrowserContext, page: Page, pages_before: int) -> Page:
+	"""Continue in the tab an action opened, like the agent does, once the page is loaded"""
+	if len(context.pages) > pages_before:
+		page = context.pages[-1]
+		await page.bring_to_front()
+	await page.wait_for_load_state('domcontentloaded')
+	return page
+
+
+async def click(context: BrowserContext, page: Page, selectors: list[str], step_info: str) -> Page:
+	pages_before = len(context.pages)
+	locator = await locate(page, selectors, step_info)
+	await locator.click(timeout=ACTION_TIMEOUT_MS)
+	return await follow_new_tab(context, page, pages_before)
+
+
+async def fill(page: Page, selectors: list[str], text: str, step_info: str) -> None:
+	locator = await locate(page, selectors, step_info)
+	await locator.fill(text, timeout=ACTION_TIMEOUT_MS)
+
+
+async def select_option(page: Page, selectors: list[str], text: str, step_info: str) -> None:
+	locator = await locate(page, selectors, step_info)
+	await locator.select_option(label=text, timeout=ACTION_TIMEOUT_MS)
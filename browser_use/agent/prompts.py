@@ -86,7 +86,9 @@ class AgentMessagePrompt:
 				)
 			else:
 				elements_text = f'[Start of page]\n{elements_text}'
-			if has_content_below:
+			if self.state.truncated:
+				elements_text = f'{elements_text}\n... [truncated] more elements than can be shown - scroll or extract content to see more ...'
+			elif has_content_below:
 				elements_text = (
 					f'{elements_text}\n... {self.state.pixels_below} pixels below - scroll or extract content to see more ...'
 				)
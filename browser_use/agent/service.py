@@ -11,7 +11,7 @@ import time
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from threading import Thread
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from dotenv import load_dotenv
 
@@ -28,8 +28,6 @@ from langchain_core.messages import (
 from playwright.async_api import Browser, BrowserContext, Page
 from pydantic import BaseModel, ValidationError
 
-from browser_use.agent.gif import create_history_gif
-from browser_use.agent.memory import Memory, MemoryConfig
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
 from browser_use.agent.message_manager.utils import (
 	convert_input_messages,
@@ -37,6 +35,7 @@ from browser_use.agent.message_manager.utils import (
 	is_model_without_tool_support,
 	save_conversation,
 )
+from browser_use.agent.plan_cache import PlanCache
 from browser_use.agent.prompts import AgentMessagePrompt, PlannerPrompt, SystemPrompt
 from browser_use.agent.views import (
 	ActionResult,
@@ -66,11 +65,19 @@ from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import (
 	AgentTelemetryEvent,
 )
+from browser_use.tracing import add_span_attributes, collect_phase_durations, trace_span
 from browser_use.utils import time_execution_async, time_execution_sync
 
+if TYPE_CHECKING:
+	# gif rendering (PIL) and procedural memory are optional subsystems, imported only when they are used
+	from browser_use.agent.memory import MemoryConfig
+
 logger = logging.getLogger(__name__)
 
 SKIP_LLM_API_KEY_VERIFICATION = os.environ.get('SKIP_LLM_API_KEY_VERIFICATION', 'false').lower()[0] in 'ty1'
+# how long a fast replay step looks for an element by its recorded selectors before searching the full DOM tree, which
+# waits for the page to load anyway
+REPLAY_SELECTOR_PROBE_TIMEOUT = 1.0
 
 
 def log_response(response: AgentOutput, registry=None) -> None:
@@ -160,8 +167,9 @@ class Agent(Generic[Context]):
 		injected_agent_state: AgentState | None = None,
 		context: Context | None = None,
 		save_playwright_script_path: str | None = None,
+		plan_cache_dir: str | None = None,
 		enable_memory: bool = True,
-		memory_config: MemoryConfig | None = None,
+		memory_config: 'MemoryConfig | None' = None,
 		source: str | None = None,
 	):
 		if page_extraction_llm is None:
@@ -195,9 +203,14 @@ class Agent(Generic[Context]):
 			planner_interval=planner_interval,
 			is_planner_reasoning=is_planner_reasoning,
 			save_playwright_script_path=save_playwright_script_path,
+			plan_cache_dir=plan_cache_dir,
 			extend_planner_system_message=extend_planner_system_message,
 		)
 
+		# Plan cache, reuses the model's decisions on pages it has already seen for this task
+		self.plan_cache = PlanCache(self.settings.plan_cache_dir) if self.settings.plan_cache_dir else None
+		self._plan_trail = ''  # identifies the steps taken so far in the plan cache keys
+
 		# Memory settings
 		self.enable_memory = enable_memory
 		self.memory_config = memory_config
@@ -273,6 +286,8 @@ class Agent(Generic[Context]):
 
 		if self.enable_memory:
 			try:
+				from browser_use.agent.memory import Memory
+
 				# Initialize memory
 				self.memory = Memory(
 					message_manager=self._message_manager,
@@ -776,8 +791,15 @@ class Agent(Generic[Context]):
 	@time_execution_async('--step (agent)')
 	async def step(self, step_info: AgentStepInfo | None = None) -> None:
 		"""Execute one step of the task"""
+		add_span_attributes(step=self.state.n_steps + 1)
+		with collect_phase_durations() as phase_durations:
+			await self._step(step_info, phase_durations)
+
+	async def _step(self, step_info: AgentStepInfo | None, phase_durations: dict[str, float]) -> None:
 		browser_state_summary = None
 		model_output = None
+		cached_output = None
+		plan_key = None
 		result: list[ActionResult] = []
 		step_start_time = time.time()
 		tokens = 0
@@ -797,6 +819,13 @@ class Agent(Generic[Context]):
 			# Update action models with page-specific actions
 			await self._update_action_models_for_page(current_page)
 
+			if self.plan_cache and not (step_info and step_info.is_last_step()):
+				page_signature = PlanCache.page_signature(browser_state_summary.url, browser_state_summary.element_tree)
+				plan_key = PlanCache.key(self.task, page_signature, self._plan_trail)
+				cached_output = self.plan_cache.get(plan_key, self.AgentOutput, browser_state_summary.selector_map)
+				if cached_output:
+					logger.info('♻️ Reusing the cached decision for this page, skipping the LLM call')
+
 			# Get page-specific filtered actions
 			page_filtered_actions = self.controller.registry.get_prompt_description(current_page)
 
@@ -830,7 +859,7 @@ class Agent(Generic[Context]):
 			)
 
 			# Run planner at specified intervals if planner is configured
-			if self.settings.planner_llm and self.state.n_steps % self.settings.planner_interval == 0:
+			if self.settings.planner_llm and not cached_output and self.state.n_steps % self.settings.planner_interval == 0:
 				plan = await self._run_planner()
 				# add plan before last state message
 				self._message_manager.add_plan(plan, position=-1)
@@ -849,7 +878,7 @@ class Agent(Generic[Context]):
 			tokens = self._message_manager.state.history.current_tokens
 
 			try:
-				model_output = await self.get_next_action(input_messages)
+				model_output = cached_output or await self.get_next_action(input_messages)
 				if (
 					not model_output.action
 					or not isinstance(model_output.action, list)
@@ -911,6 +940,10 @@ class Agent(Generic[Context]):
 
 			self.state.last_result = result
 
+			if self.plan_cache and plan_key:
+				self.plan_cache.update(plan_key, model_output, browser_state_summary.selector_map, result)
+				self._plan_trail = PlanCache.extend_trail(plan_key, model_output)
+
 			if len(result) > 0 and result[-1].is_done:
 				logger.info(f'📄 Result: {result[-1].extracted_content}')
 
@@ -930,6 +963,8 @@ class Agent(Generic[Context]):
 			self.state.last_result = [ActionResult(error='The agent was paused with Ctrl+C', include_in_memory=False)]
 			raise InterruptedError('Step cancelled by user')
 		except Exception as e:
+			if self.plan_cache and plan_key and cached_output:
+				self.plan_cache.invalidate(plan_key)
 			result = await self._handle_step_error(e)
 			self.state.last_result = result
 
@@ -944,6 +979,7 @@ class Agent(Generic[Context]):
 					step_start_time=step_start_time,
 					step_end_time=step_end_time,
 					input_tokens=tokens,
+					phase_durations=dict(phase_durations),
 				)
 				self._make_history_item(model_output, browser_state_summary, result, metadata)
 
@@ -1039,7 +1075,7 @@ class Agent(Generic[Context]):
 		else:
 			return input_messages
 
-	@time_execution_async('--get_next_action (agent)')
+	@time_execution_async('--get_next_action (agent)', phase='llm')
 	async def get_next_action(self, input_messages: list[BaseMessage]) -> AgentOutput:
 		"""Get next action from LLM based on current state"""
 		input_messages = self._convert_input_messages(input_messages)
@@ -1233,6 +1269,8 @@ class Agent(Generic[Context]):
 
 	def _log_agent_event(self, max_steps: int, agent_run_error: str | None = None) -> None:
 		"""Sent the agent event for this run to telemetry"""
+		if not self.telemetry.enabled:
+			return
 
 		# Prepare action_history data correctly
 		action_history_data = []
@@ -1429,8 +1467,10 @@ class Agent(Generic[Context]):
 					f'Agent run finished. Attempting to save Playwright script to: {self.settings.save_playwright_script_path}'
 				)
 				try:
-					# Extract sensitive data keys if sensitive_data is provided
-					keys = list(self.sensitive_data.keys()) if self.sensitive_data else None
+					from browser_use.agent.playwright_script_generator import get_sensitive_data_keys
+
+					# Extract the placeholder names, domain-scoped sensitive_data nests them under the domain patterns
+					keys = get_sensitive_data_keys(self.sensitive_data) if self.sensitive_data else None
 					# Pass browser and context config to the saving method
 					self.state.history.save_as_playwright_script(
 						self.settings.save_playwright_script_path,
@@ -1448,10 +1488,17 @@ class Agent(Generic[Context]):
 				if isinstance(self.settings.generate_gif, str):
 					output_path = self.settings.generate_gif
 
-				create_history_gif(task=self.task, history=self.state.history, output_path=output_path)
+				from browser_use.agent.gif import DEFAULT_MAX_FRAME_WIDTH, create_history_gif
+
+				create_history_gif(
+					task=self.task,
+					history=self.state.history,
+					output_path=output_path,
+					max_frame_width=DEFAULT_MAX_FRAME_WIDTH,
+				)
 
 	# @observe(name='controller.multi_act')
-	@time_execution_async('--multi_act')
+	@time_execution_async('--multi_act', phase='actions')
 	async def multi_act(
 		self,
 		actions: list[ActionModel],
@@ -1492,20 +1539,22 @@ class Agent(Generic[Context]):
 			try:
 				await self._raise_if_stopped_or_paused()
 
-				result = await self.controller.act(
-					action=action,
-					browser_session=self.browser_session,
-					page_extraction_llm=self.settings.page_extraction_llm,
-					sensitive_data=self.sensitive_data,
-					available_file_paths=self.settings.available_file_paths,
-					context=self.context,
-				)
-
-				results.append(result)
-
 				# Get action name from the action model
 				action_data = action.model_dump(exclude_unset=True)
 				action_name = next(iter(action_data.keys())) if action_data else 'unknown'
+
+				with trace_span('agent.action', action=action_name, action_index=i):
+					result = await self.controller.act(
+						action=action,
+						browser_session=self.browser_session,
+						page_extraction_llm=self.settings.page_extraction_llm,
+						sensitive_data=self.sensitive_data,
+						available_file_paths=self.settings.available_file_paths,
+						context=self.context,
+					)
+
+				results.append(result)
+
 				logger.info(f'☑️ Executed action {i + 1}/{len(actions)}: {action_name}')
 				if results[-1].is_done or results[-1].error or i == len(actions) - 1:
 					break
@@ -1591,6 +1640,8 @@ class Agent(Generic[Context]):
 		max_retries: int = 3,
 		skip_failures: bool = True,
 		delay_between_actions: float = 2.0,
+		fast: bool = False,
+		tolerant: bool = False,
 	) -> list[ActionResult]:
 		"""
 		Rerun a saved history of actions with error handling and retry logic.
@@ -1599,7 +1650,12 @@ class Agent(Generic[Context]):
 				history: The history to replay
 				max_retries: Maximum number of retries per action
 				skip_failures: Whether to skip failed actions or stop execution
-				delay_between_actions: Delay between actions in seconds
+				delay_between_actions: Delay between actions in seconds (only used between retries in fast mode)
+				fast: Locate the elements directly in the page by their recorded CSS selector or xpath and wait until
+					they are visible instead of capturing the full state (DOM tree, screenshot) and sleeping after every
+					step. Falls back to matching the element in the full DOM tree if the recorded selectors don't match.
+				tolerant: If an element is not found unchanged in the DOM tree, fall back to the most similar element
+					with the same tag, e.g. one that moved or got a new attribute since the history was recorded.
 
 		Returns:
 				List of action results
@@ -1627,7 +1683,10 @@ class Agent(Generic[Context]):
 			retry_count = 0
 			while retry_count < max_retries:
 				try:
-					result = await self._execute_history_step(history_item, delay_between_actions)
+					if fast:
+						result = await self._execute_history_step_fast(history_item, tolerant)
+					else:
+						result = await self._execute_history_step(history_item, delay_between_actions, tolerant)
 					results.extend(result)
 					break
 
@@ -1645,7 +1704,7 @@ class Agent(Generic[Context]):
 
 		return results
 
-	async def _execute_history_step(self, history_item: AgentHistory, delay: float) -> list[ActionResult]:
+	async def _execute_history_step(self, history_item: AgentHistory, delay: float, tolerant: bool = False) -> list[ActionResult]:
 		"""Execute a single step from history with element validation"""
 		state = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
 		if not state or not history_item.model_output:
@@ -1656,6 +1715,7 @@ class Agent(Generic[Context]):
 				history_item.state.interacted_element[i],
 				action,
 				state,
+				tolerant,
 			)
 			updated_actions.append(updated_action)
 
@@ -1667,21 +1727,57 @@ class Agent(Generic[Context]):
 		await asyncio.sleep(delay)
 		return result
 
+	async def _execute_history_step_fast(self, history_item: AgentHistory, tolerant: bool = False) -> list[ActionResult]:
+		"""Execute a single step from history, locating its elements directly in the page"""
+		if not history_item.model_output:
+			raise ValueError('Invalid model output')
+		results = []
+		for i, action in enumerate(history_item.model_output.action):
+			historical_element = history_item.state.interacted_element[i]
+			index = action.get_index()
+			if historical_element is not None and index is not None:
+				state = await self.browser_session.get_replay_state(
+					{index: historical_element}, timeout=REPLAY_SELECTOR_PROBE_TIMEOUT
+				)
+				if state is None:
+					logger.debug(f'Recorded selectors of element {i} did not match, searching the full DOM tree')
+					state = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+					if await self._update_action_indices(historical_element, action, state, tolerant) is None:
+						raise ValueError(f'Could not find matching element {i} in current page')
+			else:
+				# actions without an element (extract_content, scroll_down, go_back, ...) have nothing to wait for,
+				# let a navigation started by the previous action load first
+				page = await self.browser_session.get_current_page()
+				try:
+					await page.wait_for_load_state(
+						'domcontentloaded', timeout=self.browser_session.browser_profile.maximum_wait_page_load_time * 1000
+					)
+				except Exception as e:
+					logger.debug(f'Page did not finish loading before replaying {action.model_dump(exclude_unset=True)}: {e}')
+
+			results.extend(await self.multi_act([action], check_for_new_elements=False))
+			if results[-1].is_done or results[-1].error:
+				break
+		return results
+
 	async def _update_action_indices(
 		self,
 		historical_element: DOMHistoryElement | None,
 		action: ActionModel,  # Type this properly based on your action model
 		browser_state_summary: BrowserStateSummary,
+		tolerant: bool = False,
 	) -> ActionModel | None:
 		"""
 		Update action indices based on current page state.
+		With tolerant=True, an element that drifted since the history was recorded (it moved or got a new attribute)
+		is matched to the most similar element.
 		Returns updated action or None if element cannot be found.
 		"""
 		if not historical_element or not browser_state_summary.element_tree:
 			return action
 
 		current_element = HistoryTreeProcessor.find_history_element_in_tree(
-			historical_element, browser_state_summary.element_tree
+			historical_element, browser_state_summary.element_tree, tolerant=tolerant
 		)
 
 		if not current_element or current_element.highlight_index is None:
@@ -1784,6 +1880,7 @@ class Agent(Generic[Context]):
 			self.llm._verified_api_keys = True
 			return True
 
+	@time_execution_async('--run_planner (agent)', phase='llm')
 	async def _run_planner(self) -> str | None:
 		"""Run the planner to analyze state and suggest next steps"""
 		# Skip planning if no planner_llm is set
@@ -4,7 +4,7 @@ import json
 import traceback
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from openai import RateLimitError
@@ -21,6 +21,9 @@ from browser_use.dom.history_tree_processor.service import (
 )
 from browser_use.dom.views import SelectorMap
 
+if TYPE_CHECKING:
+	from browser_use.browser.profile import BrowserProfile
+
 ToolCallingMethod = Literal['function_calling', 'json_mode', 'raw', 'auto', 'tools']
 REQUIRED_LLM_API_ENV_VARS = {
 	'ChatOpenAI': ['OPENAI_API_KEY'],
@@ -72,7 +75,9 @@ class AgentSettings(BaseModel):
 	extend_planner_system_message: str | None = None
 
 	# Playwright script generation setting
-	save_playwright_script_path: str | None = None  # Path to save the generated Playwright script TODO: fix or remove
+	save_playwright_script_path: str | None = None  # Path to save a Playwright script that replays the run without an LLM
+
+	plan_cache_dir: str | None = None  # Directory of the plan cache, reuses the LLM's decisions on pages seen in previous runs
 
 
 class AgentState(BaseModel):
@@ -120,6 +125,8 @@ class StepMetadata(BaseModel):
 	step_end_time: float
 	input_tokens: int  # Approximate tokens from message manager for this step
 	step_number: int
+	# seconds spent in each phase of the step: wait_for_network, dom_build, screenshot, llm, actions (phases can overlap)
+	phase_durations: dict[str, float] = Field(default_factory=dict)
 
 	@property
 	def duration_seconds(self) -> float:
@@ -266,37 +273,28 @@ class AgentHistoryList(BaseModel):
 		except Exception as e:
 			raise e
 
-	# def save_as_playwright_script(
-	# 	self,
-	# 	output_path: str | Path,
-	# 	sensitive_data_keys: list[str] | None = None,
-	# 	browser_config: BrowserConfig | None = None,
-	# 	context_config: BrowserContextConfig | None = None,
-	# ) -> None:
-	# 	"""
-	# 	Generates a Playwright script based on the agent's history and saves it to a file.
-	# 	Args:
-	# 		output_path: The path where the generated Python script will be saved.
-	# 		sensitive_data_keys: A list of keys used as placeholders for sensitive data
-	# 							 (e.g., ['username_placeholder', 'password_placeholder']).
-	# 							 These will be loaded from environment variables in the
-	# 							 generated script.
-	# 		browser_config: Configuration of the original Browser instance.
-	# 		context_config: Configuration of the original BrowserContext instance.
-	# 	"""
-	# 	from browser_use.agent.playwright_script_generator import PlaywrightScriptGenerator
-
-	# 	try:
-	# 		serialized_history = self.model_dump()['history']
-	# 		generator = PlaywrightScriptGenerator(serialized_history, sensitive_data_keys, browser_config, context_config)
-
-	# 		script_content = generator.generate_script_content()
-	# 		path_obj = Path(output_path)
-	# 		path_obj.parent.mkdir(parents=True, exist_ok=True)
-	# 		with open(path_obj, 'w', encoding='utf-8') as f:
-	# 			f.write(script_content)
-	# 	except Exception as e:
-	# 		raise e
+	def save_as_playwright_script(
+		self,
+		output_path: str | Path,
+		sensitive_data_keys: list[str] | None = None,
+		browser_profile: BrowserProfile | None = None,
+	) -> None:
+		"""
+		Generates a standalone Playwright script that replays the actions of this history without an LLM and saves it.
+
+		Args:
+			output_path: The path where the generated Python script will be saved.
+			sensitive_data_keys: The names of the <secret> placeholders used in the actions (e.g. ['password']),
+				the generated script reads their values from environment variables (e.g. PASSWORD).
+			browser_profile: Profile of the browser the agent ran in, its launch and context settings are reused.
+		"""
+		from browser_use.agent.playwright_script_generator import PlaywrightScriptGenerator
+
+		generator = PlaywrightScriptGenerator(self.model_dump()['history'], sensitive_data_keys, browser_profile)
+		script_content = generator.generate_script_content()
+		Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+		with open(output_path, 'w', encoding='utf-8') as f:
+			f.write(script_content)
 
 	def model_dump(self, **kwargs) -> dict[str, Any]:
 		"""Custom serialization that properly uses AgentHistory's model_dump"""
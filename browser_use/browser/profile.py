@@ -582,6 +582,18 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	include_dynamic_attributes: bool = Field(default=True, description='Include dynamic attributes in selectors.')
 	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
 	viewport_expansion: int = Field(default=500, description='Viewport expansion in pixels for LLM context.')
+	dom_backend: Literal['js', 'cdp'] = Field(
+		default='js',
+		description='How the DOM tree is extracted: "js" walks the page with buildDomTree.js, "cdp" builds it from a native DOMSnapshot and accessibility tree (chromium only).',
+	)
+	max_dom_nodes: int | None = Field(
+		default=None,
+		description='Hard cap on the DOM nodes extracted for the LLM context, later nodes in document order are left out and the page is marked as truncated.',
+	)
+	state_summary_max_age: float = Field(
+		default=3.0,
+		description='Seconds an unchanged state summary may be reused for, so pages that change without a DOM mutation (animations, lazy images, canvas, video) are captured again. 0 never reuses it.',
+	)
 
 	profile_directory: str = 'Default'  # e.g. 'Profile 1', 'Profile 2', 'Custom Profile', etc.
 
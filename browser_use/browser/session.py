@@ -7,11 +7,13 @@ import logging
 import os
 import re
 import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from functools import wraps
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Literal, Self, TypeVar
 from urllib.parse import urlparse
+from weakref import WeakKeyDictionary, WeakSet
 
 os.environ['PW_TEST_SCREENSHOT_NO_FONTS_READY'] = '1'  # https://github.com/microsoft/playwright/issues/35972
 
@@ -20,7 +22,7 @@ import psutil
 from patchright.async_api import Playwright as PatchrightPlaywright
 from playwright.async_api import Browser as PlaywrightBrowser
 from playwright.async_api import BrowserContext as PlaywrightBrowserContext
-from playwright.async_api import ElementHandle, FrameLocator, Page, Playwright, async_playwright
+from playwright.async_api import ElementHandle, Frame, FrameLocator, Page, Playwright, async_playwright
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, InstanceOf, PrivateAttr, model_validator
 
 from browser_use.browser.profile import BrowserProfile
@@ -31,8 +33,10 @@ from browser_use.browser.views import (
 	URLNotAllowedError,
 )
 from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
-from browser_use.dom.service import DomService
+from browser_use.dom.history_tree_processor.view import DOMHistoryElement
+from browser_use.dom.service import CROSS_ORIGIN_FRAME_TIMEOUT, DomService, get_cross_origin_child_frames
 from browser_use.dom.views import DOMElementNode, SelectorMap
+from browser_use.tracing import add_span_attributes
 from browser_use.utils import match_url_with_domain_pattern, merge_dicts, time_execution_async, time_execution_sync
 
 # Check if running in Docker
@@ -41,6 +45,13 @@ IN_DOCKER = os.environ.get('IN_DOCKER', 'false').lower()[0] in 'ty1'
 logger = logging.getLogger('browser_use.browser.session')
 
 
+# page.title() can hang forever on tabs that are crashed/disappeared/about:blank, this bounds all of them together
+TAB_TITLE_TIMEOUT = 1.0
+# background tabs that run_in_tabs() keeps open and busy at the same time
+MAX_PARALLEL_TABS = 4
+
+T = TypeVar('T')
+
 _GLOB_WARNING_SHOWN = False  # used inside _is_url_allowed to avoid spamming the logs with the same warning multiple times
 
 
@@ -132,6 +143,269 @@ class CachedClickableElementHashes:
 	hashes: set[str]
 
 
+@dataclass
+class CachedElementLocator:
+	"""
+	Resolved locator for one highlighted element of the current DOM tree snapshot
+	"""
+
+	element: DOMElementNode
+	page: Page
+	element_handle: ElementHandle | None = None
+	# only computed when the element can't be resolved through the in-page element map
+	iframe_selectors: list[str] | None = None
+	css_selector: str | None = None
+	# frame whose document contains the element, resolved through its iframe ancestors
+	frame: Frame | None = None
+	# options of a <select>, so reading them and then selecting one does not read them twice
+	dropdown_options: dict[str, Any] | None = None
+
+
+# Version token of what the page currently shows: the id changes with every new document (navigation), the counter on DOM
+# mutations (except the highlight overlays), scrolling, resizing and form input in the page and its same-origin iframes.
+# Cross-origin iframes are not reachable from the page, it is evaluated in their frames separately.
+PAGE_VERSION_JS = """() => {
+	if (!window.__browserUsePageVersion) {
+		window.__browserUsePageVersion = { id: `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`, version: 0, observed: new WeakSet() };
+	}
+	const state = window.__browserUsePageVersion;
+	const bump = () => { state.version++; };
+	const HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container';
+	const inHighlights = (node) => {
+		const element = node instanceof Element ? node : node.parentElement;
+		return !!element && (element.id === HIGHLIGHT_CONTAINER_ID || !!element.closest(`#${HIGHLIGHT_CONTAINER_ID}`));
+	};
+	const isHighlightMutation = (record) => inHighlights(record.target) || (
+		record.type === 'childList' && [...record.addedNodes, ...record.removedNodes].every(inHighlights)
+	);
+	const observe = (doc) => {
+		if (!state.observed.has(doc)) {
+			state.observed.add(doc);
+			new MutationObserver((records) => {
+				if (!records.every(isHighlightMutation)) bump();
+			}).observe(doc, { subtree: true, childList: true, attributes: true, characterData: true });
+			// form values and scroll positions change without a DOM mutation
+			for (const type of ['scroll', 'input', 'change']) doc.addEventListener(type, bump, { capture: true, passive: true });
+			doc.defaultView?.addEventListener('resize', bump, { passive: true });
+		}
+		for (const iframe of doc.querySelectorAll('iframe')) {
+			try {
+				if (iframe.contentDocument) observe(iframe.contentDocument);
+			} catch (e) {}  // cross-origin iframe
+		}
+	};
+	observe(document);
+	return `${state.id}:${state.version}`;
+}"""
+
+# Resolve an element (a still-attached handle, then the highlight index -> element map published by buildDomTree.js, then a
+# CSS selector), check its visibility and scroll it into view if needed, all in a single round trip instead of
+# query_selector + is_hidden + bounding_box + scroll_into_view_if_needed
+LOCATE_AND_REVEAL_ELEMENT_JS = """({ selector, element, elementMapId, highlightIndex }) => {
+	let el = element && element.isConnected ? element : null;
+	if (!el && elementMapId && window.__browserUseElementMap?.id === elementMapId) {
+		const mapped = window.__browserUseElementMap.elements.get(highlightIndex);
+		// elements inside iframes are left to the frame-aware selector path
+		if (mapped && mapped.isConnected && mapped.ownerDocument === document) el = mapped;
+	}
+	if (!el && selector) el = document.querySelector(selector);
+	if (!el) return null;
+	const rect = el.getBoundingClientRect();
+	const isVisible = window.getComputedStyle(el).visibility !== 'hidden' && rect.width > 0 && rect.height > 0;
+	const inViewport = rect.top >= 0 && rect.left >= 0 && rect.bottom <= window.innerHeight && rect.right <= window.innerWidth;
+	if (isVisible && !inViewport) {
+		if (el.scrollIntoViewIfNeeded) el.scrollIntoViewIfNeeded(true);
+		else el.scrollIntoView({ block: 'center', inline: 'nearest' });
+	}
+	return el;
+}"""
+
+# Find the element a recorded action targeted by its CSS selector (if it matches exactly one element) or its xpath, and
+# only return it once it is attached and visible, so page.wait_for_function() waits for the page to be ready for the action
+LOCATE_HISTORY_ELEMENT_JS = """({ selector, xpath, tagName }) => {
+	let el = null;
+	if (selector) {
+		try {
+			const matches = document.querySelectorAll(selector);
+			if (matches.length === 1) el = matches[0];
+		} catch (e) {}  // not a valid selector for document.querySelectorAll
+	}
+	if (!el && xpath) {
+		const result = document.evaluate(`/${xpath}`, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+		if (result.snapshotLength === 1) el = result.snapshotItem(0);
+	}
+	if (!el || !el.isConnected || el.tagName.toLowerCase() !== tagName) return null;
+	const rect = el.getBoundingClientRect();
+	return window.getComputedStyle(el).visibility !== 'hidden' && rect.width > 0 && rect.height > 0 ? el : null;
+}"""
+
+# Same visibility rule as BrowserSession._is_visible, evaluated for a whole list of elements at once
+ELEMENTS_VISIBILITY_JS = """(elements) => elements.map((el) => {
+	const rect = el.getBoundingClientRect();
+	return window.getComputedStyle(el).visibility !== 'hidden' && rect.width > 0 && rect.height > 0;
+})"""
+
+# Find the element that truly owns vertical scroll: starts at the focused node, climbs to the first big, scroll-enabled ancestor,
+# otherwise picks the first scrollable element or the root. An element can *really* scroll if: overflow-y is
+# auto|scroll|overlay, it has more content than fits, its own viewport is not a postage stamp (more than 50 % of window).
+FIND_SCROLL_CONTAINER_JS = """() => {
+	const bigEnough = el => el.clientHeight >= window.innerHeight * 0.5;
+	const canScroll = el =>
+		el &&
+		/(auto|scroll|overlay)/.test(getComputedStyle(el).overflowY) &&
+		el.scrollHeight > el.clientHeight &&
+		bigEnough(el);
+
+	let el = document.activeElement;
+	while (el && !canScroll(el) && el !== document.body) el = el.parentElement;
+
+	return canScroll(el)
+		? el
+		: [...document.querySelectorAll('*')].find(canScroll)
+		|| document.scrollingElement
+		|| document.documentElement;
+}"""
+
+SMART_SCROLL_JS = """(dy) => {
+	const el = (FIND_SCROLL_CONTAINER)();
+	if (el === document.scrollingElement ||
+		el === document.documentElement ||
+		el === document.body) {
+		window.scrollBy(0, dy);
+	} else {
+		el.scrollBy({ top: dy, behavior: 'auto' });
+	}
+}""".replace('FIND_SCROLL_CONTAINER', FIND_SCROLL_CONTAINER_JS)
+
+# Scroll the scroll container a screenful at a time in a tight in-page loop, and collect the items of the list it contains
+# as they appear. Only rows added or changed since the previous round (the DOM delta, from a MutationObserver) are read,
+# and items are de-duplicated by a hash of their text and links, so rows recycled by virtualized lists are collected once
+# per distinct content. Stops at maxItems, after maxDurationMs, or when scrolling no longer reveals anything new.
+SCROLL_AND_COLLECT_JS = """async ({ maxItems, maxDurationMs, itemSelector, idleMs }) => {
+	const container = (FIND_SCROLL_CONTAINER)();
+	const isRoot = container === document.scrollingElement || container === document.documentElement || container === document.body;
+	const root = isRoot ? document.body : container;
+	const scroller = isRoot ? document.scrollingElement || document.documentElement : container;
+
+	// without a selector the list is the element with the most children of the same tag, and its children are the items
+	const findList = () => {
+		let best = root, bestCount = 0;
+		for (const el of [root, ...root.querySelectorAll('*')]) {
+			if (el.childElementCount <= bestCount) continue;
+			const counts = {};
+			for (const child of el.children) counts[child.tagName] = (counts[child.tagName] || 0) + 1;
+			const count = Math.max(...Object.values(counts));
+			if (count > bestCount) { best = el; bestCount = count; }
+		}
+		return best;
+	};
+	let list = itemSelector ? null : findList();
+	const currentItems = () => itemSelector ? root.querySelectorAll(itemSelector) : list.children;
+	const itemOf = node => {
+		let el = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+		if (itemSelector) return el && el.closest(itemSelector);
+		while (el && el.parentElement !== list) el = el.parentElement;
+		return el;
+	};
+
+	// rows whose content changed since they were read, e.g. recycled by a virtualized list
+	let changed = new Set();
+	const observer = new MutationObserver(records => {
+		for (const record of records) {
+			const item = itemOf(record.target);
+			if (item) changed.add(item);
+		}
+	});
+	observer.observe(root, { childList: true, subtree: true, characterData: true });
+
+	const hash = s => { let h = 5381; for (let i = 0; i < s.length; i++) h = ((h << 5) + h + s.charCodeAt(i)) | 0; return h; };
+	const processed = new WeakSet();
+	const seen = new Set();
+	const items = [];
+	const collectNew = () => {
+		const delta = [...currentItems()].filter(el => !processed.has(el) || changed.has(el));
+		changed = new Set();
+		for (const el of delta) {
+			if (items.length >= maxItems) return;
+			processed.add(el);
+			const text = (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim();
+			if (!text) continue;
+			const links = [...el.querySelectorAll('a[href]')].slice(0, 3).map(a => a.href);
+			if (el.matches('a[href]')) links.unshift(el.href);
+			const key = hash(text + '|' + links.join('|'));
+			if (seen.has(key)) continue;
+			seen.add(key);
+			items.push({ text: text.slice(0, 300), links });
+		}
+	};
+
+	const start = performance.now();
+	const remainingMs = () => maxDurationMs - (performance.now() - start);
+	const atEnd = () => scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight - 2;
+	let scrolls = 0, idleRounds = 0;
+	try {
+		collectNew();
+		while (items.length < maxItems && remainingMs() > 0 && idleRounds < 2) {
+			const collectedBefore = items.length;
+			if (isRoot) window.scrollBy(0, window.innerHeight * 0.9);
+			else container.scrollBy({ top: container.clientHeight * 0.9, behavior: 'auto' });
+			scrolls++;
+
+			// wait up to idleMs for the page to react, then until it has been quiet for 100ms (but never too long)
+			await new Promise(resolve => {
+				let timer, cap;
+				const settle = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(done, 100); });
+				const done = () => { settle.disconnect(); clearTimeout(timer); clearTimeout(cap); resolve(); };
+				timer = setTimeout(done, idleMs);
+				cap = setTimeout(done, Math.max(0, Math.min(idleMs * 3, remainingMs())));
+				settle.observe(root, { childList: true, subtree: true });
+			});
+
+			if (!itemSelector && list.childElementCount < 2) list = findList();  // the list was not rendered yet at the start
+			collectNew();
+			idleRounds = items.length === collectedBefore && atEnd() ? idleRounds + 1 : 0;
+		}
+	} finally {
+		observer.disconnect();
+	}
+	return { items, scrolls, reachedEnd: atEnd(), elapsedMs: Math.round(performance.now() - start) };
+}""".replace('FIND_SCROLL_CONTAINER', FIND_SCROLL_CONTAINER_JS)
+
+# Resolve a <select> (through the in-page element map for same-document elements, otherwise by its xpath in the document
+# of the frame it is evaluated in) and read its options, or select the option matching `text`, in a single round trip
+DROPDOWN_JS = """({ elementMapId, highlightIndex, xpath, text }) => {
+	let select = null;
+	if (elementMapId && window.__browserUseElementMap?.id === elementMapId) {
+		const mapped = window.__browserUseElementMap.elements.get(highlightIndex);
+		if (mapped && mapped.isConnected && mapped.ownerDocument === document) select = mapped;
+	}
+	if (!select) select = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+	if (!select) return null;
+	if (select.tagName.toLowerCase() !== 'select') return { error: `Found element but it's a ${select.tagName}, not a SELECT` };
+
+	const options = Array.from(select.options);
+	const result = {
+		id: select.id,
+		name: select.name,
+		// text is not trimmed, the agent is asked to select options by their exact text
+		options: options.map(opt => ({ text: opt.text, label: opt.label, value: opt.value, index: opt.index })),
+	};
+	if (text === null) return result;
+
+	const normalize = s => s.replace(/\\s+/g, ' ').trim();
+	const option = options.find(opt => opt.text === text) || options.find(opt => opt.label === text)
+		|| options.find(opt => normalize(opt.text) === normalize(text));
+	if (!option) return { ...result, error: `Option ${JSON.stringify(text)} not found` };
+	if (select.disabled || option.disabled) return { ...result, error: `Option ${JSON.stringify(text)} is disabled` };
+
+	// same events as a user selection (and playwright's select_option), so frameworks pick up the change
+	options.forEach(opt => { opt.selected = opt === option; });
+	select.dispatchEvent(new Event('input', { bubbles: true }));
+	select.dispatchEvent(new Event('change', { bubbles: true }));
+	return { ...result, selected: [option.value] };
+}"""
+
+
 class BrowserSession(BaseModel):
 	"""
 	Represents an active browser session with a running browser process somewhere.
@@ -212,7 +486,18 @@ class BrowserSession(BaseModel):
 
 	_cached_browser_state_summary: BrowserStateSummary | None = PrivateAttr(default=None)
 	_cached_clickable_element_hashes: CachedClickableElementHashes | None = PrivateAttr(default=None)
+	_cached_element_locators: dict[int, CachedElementLocator] = PrivateAttr(default_factory=dict)
+	_cached_state_version: tuple | None = PrivateAttr(default=None)
+	_cached_state_time: float = PrivateAttr(default=0.0)
+	_state_cache_hits: int = PrivateAttr(default=0)
+	_state_cache_misses: int = PrivateAttr(default=0)
+	# set once the CDP snapshot DOM backend failed, the following steps go straight to buildDomTree.js
+	_dom_backend_fallback: Literal['js'] | None = PrivateAttr(default=None)
+	# url and title of each tab, refreshed in the background when the tab navigates
+	_tab_titles: WeakKeyDictionary[Page, tuple[str, str]] = PrivateAttr(default_factory=WeakKeyDictionary)
+	_watched_tabs: WeakSet[Page] = PrivateAttr(default_factory=WeakSet)
 	_start_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+	_background_tabs: WeakSet[Page] = PrivateAttr(default_factory=WeakSet)
 
 	@model_validator(mode='after')
 	def apply_session_overrides_to_profile(self) -> Self:
@@ -714,6 +999,11 @@ class BrowserSession(BaseModel):
 		"""
 		await self.browser_context.add_init_script(update_tab_focus_script)
 
+		# keep the tab titles cached so get_tabs_info() does not have to ask every tab for its title on every step
+		self.browser_context.on('page', self._watch_tab_title)
+		for page in self.browser_context.pages:
+			self._watch_tab_title(page)
+
 		# Set up visibility listeners for all existing tabs
 		for page in self.browser_context.pages:
 			try:
@@ -949,14 +1239,26 @@ class BrowserSession(BaseModel):
 	@time_execution_async('--remove_highlights')
 	async def remove_highlights(self):
 		"""
-		Removes all highlight overlays and labels created by the highlightElement function.
+		Removes the highlight canvas, its scroll/resize listeners and the highlight attributes from the page and
+		the cross-origin iframes that drew their own highlights.
 		Handles cases where the page might be closed or inaccessible.
 		"""
 		page = await self.get_current_page()
-		try:
-			await page.evaluate(
-				"""
+		frames = [page.main_frame, *(child for frame in page.frames for child in get_cross_origin_child_frames(frame))]
+		results = await asyncio.gather(
+			*(
+				frame.evaluate(
+					"""
                 try {
+                    // Tear down the canvas highlighter and its scroll/resize listeners
+                    window.__browserUseHighlighter?.destroy();
+
+                    // Pages highlighted by older versions of buildDomTree.js keep per-element listeners
+                    if (Array.isArray(window._highlightCleanupFunctions)) {
+                        window._highlightCleanupFunctions.forEach(fn => fn());
+                        window._highlightCleanupFunctions = [];
+                    }
+
                     // Remove the highlight container and all its contents
                     const container = document.getElementById('playwright-highlight-container');
                     if (container) {
@@ -972,8 +1274,14 @@ class BrowserSession(BaseModel):
                     console.error('Failed to remove highlights:', e);
                 }
                 """
-			)
-		except Exception as e:
+				)
+				for frame in frames
+			),
+			return_exceptions=True,
+		)
+		# a frame may have navigated or been detached in the meantime, only the page itself is worth a log line
+		if isinstance(results[0], Exception):
+			e = results[0]
 			logger.debug(f'⚠  Failed to remove highlights (this is usually ok): {type(e).__name__}: {e}')
 			# Don't raise the error since this is not critical functionality
 
@@ -1048,20 +1356,67 @@ class BrowserSession(BaseModel):
 	@time_execution_async('--get_tabs_info')
 	async def get_tabs_info(self) -> list[TabInfo]:
 		"""Get information about all tabs"""
+		pages = list(self.browser_context.pages)
+		titles: dict[int, str] = {}
+		fetches: dict[int, asyncio.Task[str]] = {}
+		for page_id, page in enumerate(pages):
+			self._watch_tab_title(page)
+			cached = self._tab_titles.get(page)
+			# scripts can change the title of the agent's tab without navigating (unread counters, SPAs), it is read every
+			# time, the cached titles only stand in for the background tabs
+			if page is not self.agent_current_page and cached is not None and cached[0] == page.url:
+				titles[page_id] = cached[1]
+			else:
+				self._tab_titles.pop(page, None)
+				fetches[page_id] = asyncio.create_task(self._fetch_tab_title(page))
+
+		if fetches:
+			# ask the tabs whose title is not cached concurrently, with one deadline for all of them
+			done, pending = await asyncio.wait(fetches.values(), timeout=TAB_TITLE_TIMEOUT)
+			for task in pending:
+				task.cancel()
+			for page_id, task in fetches.items():
+				if task in done and task.exception() is None:
+					titles[page_id] = task.result()
 
 		tabs_info = []
-		for page_id, page in enumerate(self.browser_context.pages):
-			try:
-				tab_info = TabInfo(page_id=page_id, url=page.url, title=await asyncio.wait_for(page.title(), timeout=1))
-			except TimeoutError:
-				# page.title() can hang forever on tabs that are crashed/disappeared/about:blank
-				# we dont want to try automating those tabs because they will hang the whole script
+		for page_id, page in enumerate(pages):
+			if page_id in titles:
+				tabs_info.append(TabInfo(page_id=page_id, url=page.url, title=titles[page_id]))
+			else:
+				# we dont want to try automating tabs that are crashed/disappeared, they will hang the whole script
 				logger.debug('⚠  Failed to get tab info for tab #%s: %s (ignoring)', page_id, page.url)
-				tab_info = TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it')
-			tabs_info.append(tab_info)
+				tabs_info.append(TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it'))
 
 		return tabs_info
 
+	def _watch_tab_title(self, page: Page) -> None:
+		"""Refresh the cached title of the tab in the background whenever it navigates or finishes parsing a new document"""
+		if page in self._watched_tabs:
+			return
+		self._watched_tabs.add(page)
+
+		async def refresh_title(*args: Any) -> None:
+			try:
+				await asyncio.wait_for(self._fetch_tab_title(page), timeout=TAB_TITLE_TIMEOUT)
+			except Exception as e:
+				logger.debug(f'Could not refresh the title of tab {page.url}: {type(e).__name__}: {e}')
+
+		async def on_frame_navigated(frame: Frame) -> None:
+			if frame == page.main_frame:
+				await refresh_title()
+
+		# framenavigated also fires for same-document (history API) navigations, domcontentloaded once the <title> is parsed
+		page.on('framenavigated', on_frame_navigated)
+		page.on('domcontentloaded', refresh_title)
+
+	async def _fetch_tab_title(self, page: Page) -> str:
+		url = page.url
+		title = await page.title()
+		if page.url == url:
+			self._tab_titles[page] = (url, title)
+		return title
+
 	@require_initialization
 	async def close_tab(self, tab_index: int | None = None) -> None:
 		pages = self.browser_context.pages
@@ -1436,6 +1791,7 @@ class BrowserSession(BaseModel):
 		if elapsed > 1:
 			logger.debug(f'💤 Page network traffic calmed down after {now - start_time:.2f} seconds')
 
+	@time_execution_async('--wait_for_page_and_frames_load', phase='wait_for_network')
 	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None):
 		"""
 		Ensures page is fully loaded before continuing.
@@ -1683,12 +2039,15 @@ class BrowserSession(BaseModel):
 		structure = await page.evaluate(debug_script)
 		return structure
 
-	@time_execution_sync('--get_state_summary')  # This decorator might need to be updated to handle async
-	async def get_state_summary(self, cache_clickable_elements_hashes: bool) -> BrowserStateSummary:
+	@time_execution_async('--get_state_summary')
+	async def get_state_summary(self, cache_clickable_elements_hashes: bool, force: bool = False) -> BrowserStateSummary:
 		"""Get a summary of the current browser state
 
 		This method builds a BrowserStateSummary object that captures the current state
 		of the browser, including url, title, tabs, screenshot, and DOM tree.
+		If the page has not changed since the last summary (same document, no DOM mutation, scroll,
+		resize or form input, no click or typing action) and it is at most browser_profile.state_summary_max_age
+		seconds old, the last summary is returned instead of capturing it again.
 
 		Parameters:
 		-----------
@@ -1696,9 +2055,37 @@ class BrowserSession(BaseModel):
 			If True, cache the clickable elements hashes for the current state.
 			This is used to calculate which elements are new to the LLM since the last message,
 			which helps reduce token usage.
+		force: bool
+			If True, always capture a fresh summary even if the page looks unchanged.
 		"""
 		await self._wait_for_page_and_frames_load()
-		updated_state = await self._get_updated_state()
+
+		page = await self.get_current_page()
+		cached_state = self._cached_browser_state_summary
+		versioned_frames = cached_state.cross_origin_frames if cached_state else []
+		page_version = await self._get_page_version(page, versioned_frames)
+		cache_hit = (
+			not force
+			and page_version is not None
+			and page_version == self._cached_state_version
+			and self._cached_browser_state_summary is not None
+			and time.monotonic() - self._cached_state_time < self.browser_profile.state_summary_max_age
+		)
+		add_span_attributes(state_cache_hit=cache_hit)
+		if cache_hit:
+			assert self._cached_browser_state_summary is not None
+			self._state_cache_hits += 1
+			logger.debug(f'♻️ Page has not changed since the last state summary, reusing it: {page.url}')
+			updated_state = self._cached_browser_state_summary
+		else:
+			self._state_cache_misses += 1
+			last_known_state = getattr(self, 'browser_state_summary', None)
+			updated_state = await self._get_updated_state()
+			if updated_state is last_known_state:
+				page_version = None  # capturing failed and returned the last known state, don't reuse it for this page version
+			elif page_version is not None and updated_state.cross_origin_frames != versioned_frames:
+				# the capture walked other cross-origin frames than the ones versioned above, version those instead
+				page_version = (*page_version[:-1], await self._get_frame_versions(updated_state.cross_origin_frames))
 
 		# Find out which elements are new
 		# Do this only if url has not changed
@@ -1720,7 +2107,11 @@ class BrowserSession(BaseModel):
 			)
 
 		assert updated_state
-		self._cached_browser_state_summary = updated_state
+		if not cache_hit:
+			self._cached_browser_state_summary = updated_state
+			self._cached_state_version = page_version
+			self._cached_state_time = time.monotonic()
+			self._cached_element_locators = {}  # locators are only valid for the DOM tree snapshot they were resolved from
 
 		# Save cookies if a file is specified
 		if self.browser_profile.cookies_file:
@@ -1728,6 +2119,106 @@ class BrowserSession(BaseModel):
 
 		return self._cached_browser_state_summary
 
+	async def _get_page_version(self, page: Page, cross_origin_frames: list[Frame]) -> tuple | None:
+		"""Token that changes whenever the page may look different, None if it can't be determined"""
+		try:
+			page_version = await page.evaluate(PAGE_VERSION_JS)
+		except Exception as e:
+			logger.debug(f'Could not determine the page version of {page.url}: {type(e).__name__}: {e}')
+			return None
+		# iframes navigating on their own and tabs opened in the background don't change the page itself,
+		# their urls are known without a round trip
+		tab_urls = tuple(tab.url for tab in self.browser_context.pages) if self.browser_context else ()
+		frame_versions = await self._get_frame_versions(cross_origin_frames)
+		return (page, page.url, tuple(frame.url for frame in page.frames), tab_urls, page_version, frame_versions)
+
+	async def _get_frame_versions(self, cross_origin_frames: list[Frame]) -> tuple:
+		"""
+		Versions of the cross-origin iframes a capture walked, their content is part of the DOM tree but out of reach of
+		the page. A frame that fails or hangs (detached, mid-navigation) gets a unique value, so it counts as changed.
+		"""
+		versions = await asyncio.gather(
+			*(asyncio.wait_for(frame.evaluate(PAGE_VERSION_JS), CROSS_ORIGIN_FRAME_TIMEOUT) for frame in cross_origin_frames),
+			return_exceptions=True,
+		)
+		return tuple(object() if isinstance(version, BaseException) else version for version in versions)
+
+	def invalidate_state_summary(self) -> None:
+		"""
+		Capture the state again on the next get_state_summary(), e.g. after a click or typing action: it may have changed the
+		page without a change the page version sees (hover and focus styles, CSS transitions).
+		The last summary stays available for get_selector_map() and the element locators.
+		"""
+		self._cached_state_version = None
+
+	@property
+	def state_summary_cache_stats(self) -> dict[str, float]:
+		"""How often get_state_summary() could reuse the last summary because the page had not changed"""
+		total = self._state_cache_hits + self._state_cache_misses
+		return {
+			'hits': self._state_cache_hits,
+			'misses': self._state_cache_misses,
+			'hit_rate': self._state_cache_hits / total if total else 0.0,
+		}
+
+	@require_initialization
+	@time_execution_async('--get_replay_state')
+	async def get_replay_state(self, elements: dict[int, DOMHistoryElement], timeout: float = 5.0) -> BrowserStateSummary | None:
+		"""
+		Lightweight state for replaying recorded actions: the elements they target are located directly in the page by their
+		recorded CSS selector or xpath, waiting up to timeout seconds for each to be attached and visible, without a DOM
+		walk, network idle wait or screenshot. The selector map only holds these elements, under the given indexes, until
+		the next get_state_summary(). Returns None if any of them can't be found.
+		"""
+		# the recorded xpath starts at the shadow root or iframe document the element is in, that can't be resolved directly
+		if any(
+			not element.xpath.startswith('html') or 'iframe' in element.entire_parent_branch_path for element in elements.values()
+		):
+			return None
+
+		page = await self.get_current_page()
+
+		async def locate(element: DOMHistoryElement) -> ElementHandle | None:
+			try:
+				js_handle = await page.wait_for_function(
+					LOCATE_HISTORY_ELEMENT_JS,
+					arg={'selector': element.css_selector, 'xpath': element.xpath, 'tagName': element.tag_name},
+					timeout=timeout * 1000,
+				)
+			except Exception as e:
+				logger.debug(f'Recorded element {element.tag_name} {element.xpath} not found: {type(e).__name__}: {e}')
+				return None
+			return js_handle.as_element()
+
+		handles = await asyncio.gather(*(locate(element) for element in elements.values()))
+		if not all(handles):
+			return None
+
+		root = DOMElementNode(tag_name='body', xpath='', attributes={}, children=[], is_visible=True, parent=None)
+		selector_map: SelectorMap = {}
+		locators: dict[int, CachedElementLocator] = {}
+		for (index, element), handle in zip(elements.items(), handles):
+			node = DOMElementNode(
+				tag_name=element.tag_name,
+				xpath=element.xpath,
+				attributes=element.attributes,
+				children=[],
+				is_visible=True,
+				is_interactive=True,
+				is_top_element=True,
+				highlight_index=index,
+				parent=root,
+			)
+			root.children.append(node)
+			selector_map[index] = node
+			locators[index] = CachedElementLocator(element=node, page=page, element_handle=handle)
+
+		state = BrowserStateSummary(element_tree=root, selector_map=selector_map, url=page.url, title='', tabs=[])
+		self._cached_browser_state_summary = state
+		self._cached_state_version = None  # never reused, the next get_state_summary() captures the full state again
+		self._cached_element_locators = locators
+		return state
+
 	async def _get_updated_state(self, focus_element: int = -1) -> BrowserStateSummary:
 		"""Update and return state."""
 
@@ -1743,15 +2234,20 @@ class BrowserSession(BaseModel):
 
 		try:
 			await self.remove_highlights()
-			dom_service = DomService(page)
+			dom_backend = self._dom_backend_fallback or self.browser_profile.dom_backend
+			dom_service = DomService(page, backend=dom_backend)
 			content = await dom_service.get_clickable_elements(
 				focus_element=focus_element,
 				viewport_expansion=self.browser_profile.viewport_expansion,
 				highlight_elements=self.browser_profile.highlight_elements,
+				max_nodes=self.browser_profile.max_dom_nodes,
 			)
+			if dom_service.backend != dom_backend:
+				self._dom_backend_fallback = 'js'
 
 			tabs_info = await self.get_tabs_info()
 
+			# DomService now walks visible cross-origin iframes in their own frames, the approach below is kept for reference
 			# Get all cross-origin iframes within the page and open them in new tabs
 			# mark the titles of the new tabs so the LLM knows to check them for additional content
 			# unfortunately too buggy for now, too many sites use invisible cross-origin iframes for ads, tracking, youtube videos, social media, etc.
@@ -1775,12 +2271,21 @@ class BrowserSession(BaseModel):
 
 			screenshot_b64 = await self.take_screenshot()
 			pixels_above, pixels_below = await self.get_scroll_info(page)
+			# get_tabs_info() just read the title of the agent's tab again, unless that timed out
+			cached_title = self._tab_titles.get(page)
+			if cached_title and cached_title[0] == page.url:
+				title = cached_title[1]
+			else:
+				title = await asyncio.wait_for(page.title(), timeout=TAB_TITLE_TIMEOUT)
 
 			self.browser_state_summary = BrowserStateSummary(
 				element_tree=content.element_tree,
 				selector_map=content.selector_map,
+				element_map_id=content.element_map_id,
+				truncated=content.truncated,
+				cross_origin_frames=content.cross_origin_frames,
 				url=page.url,
-				title=await page.title(),
+				title=title,
 				tabs=tabs_info,
 				screenshot=screenshot_b64,
 				pixels_above=pixels_above,
@@ -1797,7 +2302,7 @@ class BrowserSession(BaseModel):
 
 	# region - Browser Actions
 	@require_initialization
-	@time_execution_async('--take_screenshot')
+	@time_execution_async('--take_screenshot', phase='screenshot')
 	async def take_screenshot(self, full_page: bool = False) -> str:
 		"""
 		Returns a base64 encoded screenshot of the current page.
@@ -2067,53 +2572,204 @@ class BrowserSession(BaseModel):
 
 		return not is_hidden and bbox is not None and bbox['width'] > 0 and bbox['height'] > 0
 
-	@require_initialization
-	@time_execution_async('--get_locate_element')
-	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
-		page = await self.get_current_page()
-		current_frame = page
+	def _get_element_locator(self, element: DOMElementNode, page: Page) -> CachedElementLocator:
+		"""Get the cached locator for an element of the current DOM tree snapshot"""
+		cached = self._cached_element_locators.get(element.highlight_index) if element.highlight_index is not None else None
+		if cached and cached.element is element and cached.page is page:
+			return cached
 
-		# Start with the target element and collect all parents
-		parents: list[DOMElementNode] = []
+		locator = CachedElementLocator(element=element, page=page)
+		if element.highlight_index is not None:
+			self._cached_element_locators[element.highlight_index] = locator
+		return locator
+
+	@staticmethod
+	def _get_iframe_ancestors(element: DOMElementNode) -> list[DOMElementNode]:
+		"""All iframe ancestors of the element, from top to bottom"""
+		iframes: list[DOMElementNode] = []
 		current = element
 		while current.parent is not None:
-			parent = current.parent
-			parents.append(parent)
-			current = parent
-
-		# Reverse the parents list to process from top to bottom
-		parents.reverse()
-
-		# Process all iframe parents in sequence
-		iframes = [item for item in parents if item.tag_name == 'iframe']
-		for parent in iframes:
-			css_selector = self._enhanced_css_selector_for_element(
-				parent,
-				include_dynamic_attributes=self.browser_profile.include_dynamic_attributes,
-			)
-			current_frame = current_frame.frame_locator(css_selector)
+			current = current.parent
+			if current.tag_name == 'iframe':
+				iframes.append(current)
+		iframes.reverse()
+		return iframes
+
+	def _resolve_element_selectors(self, locator: CachedElementLocator) -> None:
+		"""Compute the enhanced CSS selectors for the element and its iframe ancestors, once per DOM tree snapshot"""
+		if locator.css_selector is not None:
+			return
 
-		css_selector = self._enhanced_css_selector_for_element(
-			element, include_dynamic_attributes=self.browser_profile.include_dynamic_attributes
+		include_dynamic_attributes = self.browser_profile.include_dynamic_attributes
+		locator.iframe_selectors = [
+			self._enhanced_css_selector_for_element(iframe, include_dynamic_attributes=include_dynamic_attributes)
+			for iframe in self._get_iframe_ancestors(locator.element)
+		]
+		locator.css_selector = self._enhanced_css_selector_for_element(
+			locator.element, include_dynamic_attributes=include_dynamic_attributes
 		)
 
+	def _get_element_map_id(self, element: DOMElementNode) -> str | None:
+		"""Id of the in-page element map the element can be resolved from, if it belongs to the current DOM tree snapshot"""
+		state = self._cached_browser_state_summary
+		if state is None or element.highlight_index is None:
+			return None
+		if state.selector_map.get(element.highlight_index) is not element:
+			return None
+		return state.element_map_id
+
+	async def _locate_and_reveal_element(
+		self,
+		page: Page,
+		css_selector: str | None = None,
+		element_handle: ElementHandle | None = None,
+		element_map_id: str | None = None,
+		highlight_index: int | None = None,
+	) -> ElementHandle | None:
+		"""Find an element (or re-check a handle), and scroll it into view if it's visible, in one round trip"""
+		js_handle = await page.evaluate_handle(
+			LOCATE_AND_REVEAL_ELEMENT_JS,
+			{
+				'selector': css_selector,
+				'element': element_handle,
+				'elementMapId': element_map_id,
+				'highlightIndex': highlight_index,
+			},
+		)
+		found = js_handle.as_element()
+		if found is None:
+			await js_handle.dispose()
+		return found
+
+	@require_initialization
+	@time_execution_async('--get_locate_element')
+	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
+		page = await self.get_current_page()
+		locator = self._get_element_locator(element, page)
+		element_map_id = self._get_element_map_id(element)
+
 		try:
-			if isinstance(current_frame, FrameLocator):
-				element_handle = await current_frame.locator(css_selector).element_handle()
-				return element_handle
+			if locator.element_handle is not None or element_map_id:
+				# O(1): reuse the handle resolved earlier for this snapshot or look the index up in the in-page element map
+				try:
+					element_handle = await self._locate_and_reveal_element(
+						page,
+						element_handle=locator.element_handle,
+						element_map_id=element_map_id,
+						highlight_index=element.highlight_index,
+					)
+				except Exception:
+					# the handle belongs to an execution context that no longer exists (e.g. the page navigated)
+					element_handle = None
+				locator.element_handle = element_handle
+				if element_handle is not None:
+					return element_handle
+
+			# fall back to re-matching the element by its enhanced CSS selectors
+			self._resolve_element_selectors(locator)
+			assert locator.css_selector is not None
+
+			if locator.iframe_selectors:
+				current_frame: Page | FrameLocator = page
+				for iframe_selector in locator.iframe_selectors:
+					current_frame = current_frame.frame_locator(iframe_selector)
+				element_handle = await current_frame.locator(locator.css_selector).element_handle()
 			else:
-				# Try to scroll into view if hidden
-				element_handle = await current_frame.query_selector(css_selector)
-				if element_handle:
-					is_visible = await self._is_visible(element_handle)
-					if is_visible:
+				try:
+					element_handle = await self._locate_and_reveal_element(page, css_selector=locator.css_selector)
+				except Exception:
+					# selector is not valid for document.querySelector, let playwright's selector engine handle it
+					element_handle = await page.query_selector(locator.css_selector)
+					if element_handle and await self._is_visible(element_handle):
 						await element_handle.scroll_into_view_if_needed()
-					return element_handle
-				return None
+
+			locator.element_handle = element_handle
+			return element_handle
 		except Exception as e:
 			logger.error(f'❌  Failed to locate element: {str(e)}')
 			return None
 
+	@require_initialization
+	async def get_element_frame(self, element: DOMElementNode) -> Frame | None:
+		"""
+		Get the frame whose document contains the element, by following the element's iframe ancestors from the main frame
+		(one lookup per nesting level) instead of searching every frame of the page.
+		"""
+		page = await self.get_current_page()
+		locator = self._get_element_locator(element, page)
+		if locator.frame is not None and not locator.frame.is_detached():
+			return locator.frame
+
+		frame: Frame | None = page.main_frame
+		for iframe in self._get_iframe_ancestors(element):
+			iframe_handle = await frame.query_selector(f'xpath=//{iframe.xpath}')
+			frame = await iframe_handle.content_frame() if iframe_handle else None
+			if frame is None:
+				logger.debug(f'Could not resolve the iframe {iframe.xpath} containing the element {element.xpath}')
+				return None
+
+		locator.frame = frame
+		return frame
+
+	async def _evaluate_dropdown(self, element: DOMElementNode, text: str | None) -> dict[str, Any] | None:
+		frame = await self.get_element_frame(element)
+		if frame is None:
+			return None
+		return await frame.evaluate(
+			DROPDOWN_JS,
+			{
+				# the element map lives in the top document, elements inside iframes are found by xpath in their own frame
+				'elementMapId': self._get_element_map_id(element) if frame.parent_frame is None else None,
+				'highlightIndex': element.highlight_index,
+				'xpath': element.xpath,
+				'text': text,
+			},
+		)
+
+	@require_initialization
+	@time_execution_async('--get_dropdown_options')
+	async def get_dropdown_options(self, element: DOMElementNode) -> dict[str, Any] | None:
+		"""
+		Read the options of a <select> element: {'id', 'name', 'options': [{'text', 'label', 'value', 'index'}]}, or
+		{'error'} if the element is not a <select>, or None if it is no longer on the page.
+		Cached for the current DOM tree snapshot.
+		"""
+		page = await self.get_current_page()
+		locator = self._get_element_locator(element, page)
+		if locator.dropdown_options is not None:
+			return locator.dropdown_options
+
+		dropdown = await self._evaluate_dropdown(element, text=None)
+		if dropdown and 'error' not in dropdown:
+			locator.dropdown_options = dropdown
+		return dropdown
+
+	@require_initialization
+	@time_execution_async('--select_dropdown_option')
+	async def select_dropdown_option(self, element: DOMElementNode, text: str) -> dict[str, Any] | None:
+		"""
+		Select the option of a <select> element by its text, returns the dropdown like get_dropdown_options with the
+		'selected' option values, or with an 'error' if the option could not be selected.
+		"""
+		page = await self.get_current_page()
+		locator = self._get_element_locator(element, page)
+
+		# fail without a round trip if the options we already read can't match (same matching rules as DROPDOWN_JS)
+		if (cached := locator.dropdown_options) is not None:
+			normalized_text = ' '.join(text.split())
+			if not any(
+				normalized_text in (' '.join(option['text'].split()), ' '.join(option['label'].split()))
+				for option in cached['options']
+			):
+				return {**cached, 'error': f'Option {json.dumps(text)} not found'}
+
+		dropdown = await self._evaluate_dropdown(element, text=text)
+
+		# selecting an option can change other dropdowns on the page (e.g. country -> region)
+		for cached_locator in self._cached_element_locators.values():
+			cached_locator.dropdown_options = None
+		return dropdown
+
 	@require_initialization
 	@time_execution_async('--get_locate_element_by_xpath')
 	async def get_locate_element_by_xpath(self, xpath: str) -> ElementHandle | None:
@@ -2171,8 +2827,9 @@ class BrowserSession(BaseModel):
 			# handle also specific element type or use any type.
 			selector = f'{element_type or "*"}:text("{text}")'
 			elements = await page.query_selector_all(selector)
-			# considering only visible elements
-			elements = [el for el in elements if await self._is_visible(el)]
+			# considering only visible elements, checked for all matches in a single round trip
+			visibility = await page.evaluate(ELEMENTS_VISIBILITY_JS, elements) if elements else []
+			elements = [el for el, is_visible in zip(elements, visibility) if is_visible]
 
 			if not elements:
 				logger.error(f"No visible element with text '{text}' found.")
@@ -2187,9 +2844,8 @@ class BrowserSession(BaseModel):
 			else:
 				element_handle = elements[0]
 
-			is_visible = await self._is_visible(element_handle)
-			if is_visible:
-				await element_handle.scroll_into_view_if_needed()
+			# already known to be visible, just scroll it into view if needed
+			await self._locate_and_reveal_element(page, element_handle=element_handle)
 			return element_handle
 		except Exception as e:
 			logger.error(f"❌  Failed to locate element by text '{text}': {str(e)}")
@@ -2315,8 +2971,9 @@ class BrowserSession(BaseModel):
 		# 	assert self.agent_current_page.url == 'about:blank'
 
 		# if there are any unused about:blank tabs after we open a new tab, close them to clean up unused tabs
+		# (except the tabs of run_in_tabs() that are still loading)
 		for page in self.browser_context.pages:
-			if page.url == 'about:blank' and page != self.agent_current_page:
+			if page.url == 'about:blank' and page != self.agent_current_page and page not in self._background_tabs:
 				await page.close()
 				self.human_current_page = (  # in case we just closed the human's tab, fix the refs
 					self.human_current_page if not self.human_current_page.is_closed() else self.agent_current_page
@@ -2324,6 +2981,55 @@ class BrowserSession(BaseModel):
 
 		return new_page
 
+	@require_initialization
+	@time_execution_async('--run_in_tabs')
+	async def run_in_tabs(
+		self,
+		urls: list[str],
+		task: Callable[[Page], Awaitable[T]],
+		max_parallel_tabs: int = MAX_PARALLEL_TABS,
+		close_tabs: bool = True,
+	) -> list[T | BaseException]:
+		"""
+		Open every url in its own background tab and run task(page) in all of them concurrently, with at most
+		max_parallel_tabs tabs open at a time. Every worker only drives the tab it opened, and once they are done the
+		agent's tab is brought back to the front, since new tabs take the focus in headful mode.
+		Returns the results in the order of urls, with the exception instead for the urls that could not be opened or
+		whose task failed.
+		"""
+		semaphore = asyncio.Semaphore(max_parallel_tabs)
+
+		async def run(url: str) -> T:
+			if not self._is_url_allowed(url):
+				raise BrowserError(f'Cannot open tab with non-allowed URL: {url}')
+			async with semaphore:
+				page = await self.browser_context.new_page()
+				self._background_tabs.add(page)
+				try:
+					if self.browser_profile.viewport:
+						await page.set_viewport_size(self.browser_profile.viewport)
+					await page.goto(url, wait_until='domcontentloaded', timeout=10000)
+					return await task(page)
+				finally:
+					self._background_tabs.discard(page)
+					if close_tabs and not page.is_closed():
+						await page.close()
+
+		results = await asyncio.gather(*(run(url) for url in urls), return_exceptions=True)
+
+		# the focus hook moved human_current_page to the worker tabs as they opened, give the focus back to the agent's tab
+		agent_page = self.agent_current_page
+		if agent_page and not agent_page.is_closed():
+			self.human_current_page = agent_page
+			try:
+				await agent_page.bring_to_front()
+			except Exception as e:
+				logger.debug(f'Failed to bring the agent tab back to the front: {type(e).__name__}: {e}')
+		for url, result in zip(urls, results):
+			if isinstance(result, BaseException):
+				logger.debug(f'Tab task failed for {_log_pretty_url(url)}: {type(result).__name__}: {result}')
+		return results
+
 	# region - Helper methods for easier access to the DOM
 
 	@require_initialization
@@ -2443,35 +3149,25 @@ class BrowserSession(BaseModel):
 	async def _scroll_container(self, pixels: int) -> None:
 		"""Scroll the element that truly owns vertical scroll.Starts at the focused node ➜ climbs to the first big, scroll-enabled ancestor otherwise picks the first scrollable element or the root, then calls `element.scrollBy` (or `window.scrollBy` for the root) by the supplied pixel value."""
 
-		# An element can *really* scroll if: overflow-y is auto|scroll|overlay, it has more content than fits, its own viewport is not a postage stamp (more than 50 % of window).
-		SMART_SCROLL_JS = """(dy) => {
-			const bigEnough = el => el.clientHeight >= window.innerHeight * 0.5;
-			const canScroll = el =>
-				el &&
-				/(auto|scroll|overlay)/.test(getComputedStyle(el).overflowY) &&
-				el.scrollHeight > el.clientHeight &&
-				bigEnough(el);
-
-			let el = document.activeElement;
-			while (el && !canScroll(el) && el !== document.body) el = el.parentElement;
-
-			el = canScroll(el)
-					? el
-					: [...document.querySelectorAll('*')].find(canScroll)
-					|| document.scrollingElement
-					|| document.documentElement;
-
-			if (el === document.scrollingElement ||
-				el === document.documentElement ||
-				el === document.body) {
-				window.scrollBy(0, dy);
-			} else {
-				el.scrollBy({ top: dy, behavior: 'auto' });
-			}
-		}"""
 		page = await self.get_current_page()
 		await page.evaluate(SMART_SCROLL_JS, pixels)
 
+	@require_initialization
+	@time_execution_async('--scroll_and_collect_items')
+	async def scroll_and_collect_items(
+		self, max_items: int = 100, max_seconds: float = 15, item_selector: str | None = None, idle_ms: int = 1000
+	) -> dict[str, Any]:
+		"""
+		Scroll the same container as _scroll_container through an infinite feed or (virtualized) list in a single in-page
+		loop and collect the distinct items that appear, instead of scrolling one screenful per agent step.
+		Returns {'items': [{'text', 'links'}], 'scrolls', 'reachedEnd', 'elapsedMs'}.
+		"""
+		page = await self.get_current_page()
+		return await page.evaluate(
+			SCROLL_AND_COLLECT_JS,
+			{'maxItems': max_items, 'maxDurationMs': max_seconds * 1000, 'itemSelector': item_selector, 'idleMs': idle_ms},
+		)
+
 	# --- DVD Screensaver Loading Animation Helper ---
 	async def _show_dvd_screensaver_loading_animation(self, page: Page) -> None:
 		"""
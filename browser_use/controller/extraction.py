@@ -0,0 +1,236 @@
+"""
+Page content extraction pipeline used by the extract_content action.
+
+Page markdown is built once per (url, DOM version) and cached, iframes are converted concurrently,
+and pages too large for a single prompt are split into token-bounded chunks that are pre-filtered
+for relevance to the goal, extracted in parallel and merged back into one answer (map-reduce).
+"""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+from playwright.async_api import Frame, Page
+
+from browser_use.utils import time_execution_async
+
+logger = logging.getLogger(__name__)
+
+ESTIMATED_CHARACTERS_PER_TOKEN = 3  # same rough estimate the MessageManager uses
+MAX_CHUNK_TOKENS = 24_000
+MAX_CHUNKS = 8  # most relevant chunks sent to the LLM for a single extraction
+MAX_CONCURRENT_CHUNK_CALLS = 4
+MAX_CACHED_PAGES = 16
+
+EXTRACTION_PROMPT = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
+CHUNK_EXTRACTION_PROMPT = 'Your task is to extract the content of part {part} of {total_parts} of a page. You will be given a part of a page and a goal and you should extract all relevant information around this goal from this part. If nothing in this part is relevant, respond with an empty json object. If the goal is vague, summarize this part. Respond in json format. Extraction goal: {goal}, Page part: {page}'
+MERGE_PROMPT = 'You will be given json extraction results from consecutive parts of the same page, and the extraction goal they were made for. Merge them into a single json result for the whole page, removing duplicates and keeping the order of the page. Respond in json format. Extraction goal: {goal}, Partial results: {results}'
+
+# Counter of DOM mutations since the observer was installed, prefixed with a random id so a reload/navigation never
+# reuses the version of the previous document. Mutations of the highlight overlay drawn by buildDomTree.js on every step
+# are ignored, they don't change the page content.
+DOM_VERSION_JS = """() => {
+	if (!window.__browserUseDomVersion) {
+		const state = { id: `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`, version: 0 };
+		const HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container';
+		const inHighlights = (node) => {
+			const element = node instanceof Element ? node : node.parentElement;
+			return !!element && (element.id === HIGHLIGHT_CONTAINER_ID || !!element.closest(`#${HIGHLIGHT_CONTAINER_ID}`));
+		};
+		const isHighlightMutation = (record) => inHighlights(record.target) || (
+			record.type === 'childList' && [...record.addedNodes, ...record.removedNodes].every(inHighlights)
+		);
+		new MutationObserver((records) => {
+			if (!records.every(isHighlightMutation)) state.version++;
+		}).observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+		window.__browserUseDomVersion = state;
+	}
+	return `${window.__browserUseDomVersion.id}:${window.__browserUseDomVersion.version}`;
+}"""
+
+_markdown_cache: OrderedDict[tuple, str] = OrderedDict()
+_extraction_cache: OrderedDict[tuple, str] = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key: tuple | None) -> str | None:
+	if key is None or key not in cache:
+		return None
+	cache.move_to_end(key)
+	return cache[key]
+
+
+def _cache_set(cache: OrderedDict, key: tuple | None, value: str) -> None:
+	if key is None:
+		return
+	cache[key] = value
+	cache.move_to_end(key)
+	while len(cache) > MAX_CACHED_PAGES:
+		cache.popitem(last=False)
+
+
+def _content_frames(page: Page) -> list[Frame]:
+	"""Iframes whose text gets appended to the page content (includes cross-origin iframes)"""
+	return [frame for frame in page.frames if frame.url != page.url and not frame.url.startswith('data:')]
+
+
+async def get_dom_version(page: Page) -> tuple[str, ...] | None:
+	"""Version of the page DOM and its iframes, changes whenever any of them is mutated. None if it can't be determined."""
+	try:
+		return tuple(
+			await asyncio.gather(*(frame.evaluate(DOM_VERSION_JS) for frame in [page.main_frame, *_content_frames(page)]))
+		)
+	except Exception as e:
+		logger.debug(f'Could not determine DOM version of {page.url}, not caching its content: {type(e).__name__}: {e}')
+		return None
+
+
+@time_execution_async('--page_to_markdown')
+async def page_to_markdown(page: Page, include_links: bool = False) -> tuple[str, tuple | None]:
+	"""
+	Convert the page and its iframes to markdown, reusing the cached result if the DOM hasn't changed.
+
+	Returns the markdown and the cache key it was stored under (None if the DOM version is unknown).
+	"""
+	import markdownify
+
+	dom_version = await get_dom_version(page)
+	cache_key = (page.url, include_links, dom_version) if dom_version is not None else None
+	cached = _cache_get(_markdown_cache, cache_key)
+	if cached is not None:
+		logger.debug(f'Reusing cached markdown for {page.url}')
+		return cached, cache_key
+
+	strip = []
+	if not include_links:
+		strip = ['a', 'img']
+
+	frames = _content_frames(page)
+	html_contents = await asyncio.gather(page.content(), *(frame.content() for frame in frames), return_exceptions=True)
+	page_html, frame_htmls = html_contents[0], html_contents[1:]
+	if isinstance(page_html, BaseException):
+		raise page_html
+
+	def convert() -> str:
+		content = markdownify.markdownify(page_html, strip=strip)
+		# manually append iframe text into the content so it's readable by the LLM
+		for frame, frame_html in zip(frames, frame_htmls):
+			if isinstance(frame_html, BaseException):
+				logger.debug(f'Failed to get content of iframe {frame.url}: {type(frame_html).__name__}: {frame_html}')
+				continue
+			content += f'\n\nIFRAME {frame.url}:\n'
+			content += markdownify.markdownify(frame_html)
+		return content
+
+	# markdownify is pure python and slow on big pages, keep it off the event loop
+	content = await asyncio.to_thread(convert)
+	_cache_set(_markdown_cache, cache_key, content)
+	return content, cache_key
+
+
+def split_into_chunks(content: str, max_tokens: int = MAX_CHUNK_TOKENS) -> list[str]:
+	"""Split markdown into chunks of at most max_tokens, preferring paragraph and then line boundaries"""
+	max_chars = max_tokens * ESTIMATED_CHARACTERS_PER_TOKEN
+	if len(content) <= max_chars:
+		return [content]
+
+	chunks: list[str] = []
+	current = ''
+	for paragraph in re.split(r'(?<=\n\n)', content):
+		pieces = [paragraph]
+		if len(paragraph) > max_chars:
+			# a single paragraph is too big: split it by lines, then hard-split any line that is still too long
+			pieces = []
+			for line in paragraph.splitlines(keepends=True):
+				pieces.extend(line[i : i + max_chars] for i in range(0, len(line), max_chars))
+
+		for piece in pieces:
+			if current and len(current) + len(piece) > max_chars:
+				chunks.append(current)
+				current = ''
+			current += piece
+
+	if current.strip():
+		chunks.append(current)
+	return chunks
+
+
+def _terms(text: str) -> set[str]:
+	return {term for term in re.findall(r'\w+', text.lower()) if len(term) > 2}
+
+
+def filter_relevant_chunks(chunks: list[str], goal: str, max_chunks: int = MAX_CHUNKS) -> list[tuple[int, str]]:
+	"""
+	Keep the max_chunks chunks that share the most terms with the goal, in page order, as (index, chunk) pairs.
+	If the goal has no terms in common with any chunk (e.g. "summarize the page"), the first chunks are kept.
+	"""
+	if len(chunks) <= max_chunks:
+		return list(enumerate(chunks))
+
+	goal_terms = _terms(goal)
+	scores = []
+	for index, chunk in enumerate(chunks):
+		chunk_terms = re.findall(r'\w+', chunk.lower())
+		score = sum(1 for term in chunk_terms if term in goal_terms) / max(len(chunk_terms), 1)
+		scores.append((score, index))
+
+	if not any(score for score, _ in scores):
+		return list(enumerate(chunks[:max_chunks]))
+
+	top_indices = sorted(index for _, index in sorted(scores, key=lambda item: (-item[0], item[1]))[:max_chunks])
+	return [(index, chunks[index]) for index in top_indices]
+
+
+@time_execution_async('--extract_from_content')
+async def extract_from_content(
+	goal: str,
+	content: str,
+	llm: BaseChatModel,
+	cache_key: tuple | None = None,
+	max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+	max_chunks: int = MAX_CHUNKS,
+	max_concurrency: int = MAX_CONCURRENT_CHUNK_CALLS,
+) -> str:
+	"""
+	Run the extraction prompt over the content, map-reducing over relevant chunks if it doesn't fit in one prompt.
+
+	Pass the cache_key returned by page_to_markdown to reuse the result of an identical extraction from the same page version.
+	"""
+	extraction_key = (*cache_key, goal, type(llm).__name__, getattr(llm, 'model_name', None)) if cache_key else None
+	cached = _cache_get(_extraction_cache, extraction_key)
+	if cached is not None:
+		logger.debug('Reusing cached extraction for unchanged page content')
+		return cached
+
+	chunks = split_into_chunks(content, max_chunk_tokens)
+	if len(chunks) == 1:
+		template = PromptTemplate(input_variables=['goal', 'page'], template=EXTRACTION_PROMPT)
+		output = await llm.ainvoke(template.format(goal=goal, page=content))
+		extraction = str(output.content)
+		_cache_set(_extraction_cache, extraction_key, extraction)
+		return extraction
+
+	relevant_chunks = filter_relevant_chunks(chunks, goal, max_chunks)
+	logger.debug(f'Page content split into {len(chunks)} chunks, extracting from {len(relevant_chunks)} relevant ones')
+
+	chunk_template = PromptTemplate(input_variables=['part', 'total_parts', 'goal', 'page'], template=CHUNK_EXTRACTION_PROMPT)
+	semaphore = asyncio.Semaphore(max_concurrency)
+
+	async def extract_chunk(index: int, chunk: str) -> str:
+		async with semaphore:
+			output = await llm.ainvoke(chunk_template.format(part=index + 1, total_parts=len(chunks), goal=goal, page=chunk))
+			return str(output.content)
+
+	partial_results = await asyncio.gather(*(extract_chunk(index, chunk) for index, chunk in relevant_chunks))
+	if len(partial_results) == 1:
+		extraction = partial_results[0]
+	else:
+		merge_template = PromptTemplate(input_variables=['goal', 'results'], template=MERGE_PROMPT)
+		results = '\n\n'.join(f'Part {index + 1}: {result}' for (index, _), result in zip(relevant_chunks, partial_results))
+		output = await llm.ainvoke(merge_template.format(goal=goal, results=results))
+		extraction = str(output.content)
+
+	_cache_set(_extraction_cache, extraction_key, extraction)
+	return extraction
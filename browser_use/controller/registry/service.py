@@ -471,13 +471,15 @@ class Registry(Generic[Context]):
 			for name, action in available_actions.items()
 		}
 
+		# the json schemas are only built on the telemetry thread, and only once per set of actions
 		self.telemetry.capture(
-			ControllerRegisteredFunctionsTelemetryEvent(
+			lambda: ControllerRegisteredFunctionsTelemetryEvent(
 				registered_functions=[
 					RegisteredFunction(name=name, params=action.param_model.model_json_schema())
 					for name, action in available_actions.items()
 				]
-			)
+			),
+			dedupe_key=('controller_registered_functions', tuple(sorted(available_actions))),
 		)
 
 		return create_model('ActionModel', __base__=ActionModel, **fields)  # type:ignore
@@ -6,7 +6,6 @@ import re
 from typing import Generic, TypeVar, cast
 
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.prompts import PromptTemplate
 from playwright.async_api import ElementHandle, Page
 
 # from lmnr.sdk.laminar import Laminar
@@ -14,18 +13,21 @@ from pydantic import BaseModel
 
 from browser_use.agent.views import ActionModel, ActionResult
 from browser_use.browser import BrowserSession
+from browser_use.controller.extraction import extract_from_content, page_to_markdown
 from browser_use.controller.registry.service import Registry
 from browser_use.controller.views import (
 	ClickElementAction,
 	CloseTabAction,
 	DoneAction,
 	DragDropAction,
+	ExtractContentFromTabsAction,
 	GoToUrlAction,
 	InputTextAction,
 	NoParamsAction,
 	OpenTabAction,
 	Position,
 	ScrollAction,
+	ScrollAndCollectAction,
 	SearchGoogleAction,
 	SendKeysAction,
 	SwitchTabAction,
@@ -37,6 +39,33 @@ logger = logging.getLogger(__name__)
 
 Context = TypeVar('Context')
 
+# built-in actions that only change the page in ways BrowserSession's page version sees (navigation, scrolling, tabs) or
+# not at all, the state summary may be reused after them. Clicks, typing, drag & drop and custom actions can also change
+# hover, focus and :active styles without a DOM mutation, the state is captured again after those.
+STATE_PRESERVING_ACTIONS = frozenset(
+	{
+		'done',
+		'search_google',
+		'go_to_url',
+		'go_back',
+		'wait',
+		'save_pdf',
+		'switch_tab',
+		'open_tab',
+		'close_tab',
+		'extract_content',
+		'extract_content_from_tabs',
+		'get_ax_tree',
+		'scroll_down',
+		'scroll_up',
+		'scroll_and_collect_items',
+		'scroll_to_text',
+		'get_dropdown_options',
+		'read_sheet_contents',
+		'read_cell_contents',
+	}
+)
+
 
 class Controller(Generic[Context]):
 	def __init__(
@@ -232,25 +261,12 @@ class Controller(Generic[Context]):
 			page_extraction_llm: BaseChatModel,
 			include_links: bool = False,
 		):
-			import markdownify
-
-			strip = []
-			if not include_links:
-				strip = ['a', 'img']
-
-			content = markdownify.markdownify(await page.content(), strip=strip)
+			# markdown is cached per page DOM version, large pages are chunked and extracted in parallel
+			content, content_cache_key = await page_to_markdown(page, include_links=include_links)
 
-			# manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
-			for iframe in page.frames:
-				if iframe.url != page.url and not iframe.url.startswith('data:'):
-					content += f'\n\nIFRAME {iframe.url}:\n'
-					content += markdownify.markdownify(await iframe.content())
-
-			prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
-			template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
 			try:
-				output = await page_extraction_llm.ainvoke(template.format(goal=goal, page=content))
-				msg = f'📄  Extracted from page\n: {output.content}\n'
+				extraction = await extract_from_content(goal, content, page_extraction_llm, cache_key=content_cache_key)
+				msg = f'📄  Extracted from page\n: {extraction}\n'
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 			except Exception as e:
@@ -259,6 +275,41 @@ class Controller(Generic[Context]):
 				logger.info(msg)
 				return ActionResult(extracted_content=msg)
 
+		@self.registry.action(
+			'Open several pages at once in background tabs and extract the same information from each of them, e.g. the price '
+			'on every result page. Faster than opening, switching to and extracting from the tabs one by one. The tabs are '
+			'closed again and the current tab stays focused',
+			param_model=ExtractContentFromTabsAction,
+		)
+		async def extract_content_from_tabs(
+			params: ExtractContentFromTabsAction,
+			browser_session: BrowserSession,
+			page_extraction_llm: BaseChatModel,
+		):
+			async def extract(page: Page) -> str:
+				content, content_cache_key = await page_to_markdown(page, include_links=params.include_links)
+				try:
+					return await extract_from_content(params.goal, content, page_extraction_llm, cache_key=content_cache_key)
+				except Exception as e:
+					logger.debug(f'Error extracting content from {page.url}: {e}')
+					return content
+
+			results = await browser_session.run_in_tabs(params.urls, extract)
+
+			sections = []
+			failed = []
+			for url, result in zip(params.urls, results):
+				if isinstance(result, BaseException):
+					failed.append(url)
+					sections.append(f'## {url}\nFailed to extract: {type(result).__name__}: {result}')
+				else:
+					sections.append(f'## {url}\n{result}')
+			msg = f'📄  Extracted from {len(params.urls) - len(failed)} of {len(params.urls)} pages\n' + '\n\n'.join(sections)
+			logger.info(msg)
+			if len(failed) == len(params.urls):
+				return ActionResult(error=msg, include_in_memory=True)
+			return ActionResult(extracted_content=msg, include_in_memory=True)
+
 		@self.registry.action(
 			'Get the accessibility tree of the page in the format "role name" with the number_of_elements to return',
 		)
@@ -323,6 +374,36 @@ class Controller(Generic[Context]):
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
+		@self.registry.action(
+			'Scroll through an infinite feed or a long list in one go and get the text of all its items, instead of scrolling '
+			'down step by step - optionally give the CSS selector of the items',
+			param_model=ScrollAndCollectAction,
+		)
+		async def scroll_and_collect_items(params: ScrollAndCollectAction, browser_session: BrowserSession):
+			try:
+				harvest = await browser_session.scroll_and_collect_items(
+					max_items=params.max_items, max_seconds=params.max_seconds, item_selector=params.item_selector
+				)
+			except Exception as e:
+				msg = f'Failed to scroll and collect items: {type(e).__name__}: {e}'
+				logger.error(msg)
+				return ActionResult(error=msg, include_in_memory=True)
+
+			items = harvest['items']
+			if len(items) >= params.max_items:
+				stop_reason = f'stopped at max_items={params.max_items}'
+			elif harvest['reachedEnd']:
+				stop_reason = 'reached the end of the list'
+			else:
+				stop_reason = f'stopped after {harvest["elapsedMs"] / 1000:.1f}s'
+			lines = [
+				f'{i}. {item["text"]}' + (f' ({", ".join(item["links"])})' if item['links'] else '')
+				for i, item in enumerate(items, start=1)
+			]
+			msg = f'📜 Scrolled {harvest["scrolls"]} times and collected {len(items)} items ({stop_reason}):\n' + '\n'.join(lines)
+			logger.info(f'📜 Scrolled {harvest["scrolls"]} times and collected {len(items)} items ({stop_reason})')
+			return ActionResult(extracted_content=msg, include_in_memory=True)
+
 		# send keys
 		@self.registry.action(
 			'Send strings of special keys like Escape,Backspace, Insert, PageDown, Delete, Enter, Shortcuts such as `Control+o`, `Control+Shift+T` are supported as well. This gets used in keyboard.press. ',
@@ -392,71 +473,31 @@ class Controller(Generic[Context]):
 		)
 		async def get_dropdown_options(index: int, browser_session: BrowserSession) -> ActionResult:
 			"""Get all options from a native dropdown"""
-			page = await browser_session.get_current_page()
 			selector_map = await browser_session.get_selector_map()
 			dom_element = selector_map[index]
 
 			try:
-				# Frame-aware approach since we know it works
-				all_options = []
-				frame_index = 0
-
-				for frame in page.frames:
-					try:
-						options = await frame.evaluate(
-							"""
-							(xpath) => {
-								const select = document.evaluate(xpath, document, null,
-									XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-								if (!select) return null;
-
-								return {
-									options: Array.from(select.options).map(opt => ({
-										text: opt.text, //do not trim, because we are doing exact match in select_dropdown_option
-										value: opt.value,
-										index: opt.index
-									})),
-									id: select.id,
-									name: select.name
-								};
-							}
-						""",
-							dom_element.xpath,
-						)
-
-						if options:
-							logger.debug(f'Found dropdown in frame {frame_index}')
-							logger.debug(f'Dropdown ID: {options["id"]}, Name: {options["name"]}')
-
-							formatted_options = []
-							for opt in options['options']:
-								# encoding ensures AI uses the exact string in select_dropdown_option
-								encoded_text = json.dumps(opt['text'])
-								formatted_options.append(f'{opt["index"]}: text={encoded_text}')
-
-							all_options.extend(formatted_options)
-
-					except Exception as frame_e:
-						logger.debug(f'Frame {frame_index} evaluation failed: {str(frame_e)}')
-
-					frame_index += 1
-
-				if all_options:
-					msg = '\n'.join(all_options)
-					msg += '\nUse the exact text string in select_dropdown_option'
-					logger.info(msg)
-					return ActionResult(extracted_content=msg, include_in_memory=True)
-				else:
-					msg = 'No options found in any frame for dropdown'
-					logger.info(msg)
-					return ActionResult(extracted_content=msg, include_in_memory=True)
-
+				# the <select> is resolved directly in the frame that contains it, and its options are read in the same call
+				dropdown = await browser_session.get_dropdown_options(dom_element)
 			except Exception as e:
 				logger.error(f'Failed to get dropdown options: {str(e)}')
 				msg = f'Error getting options: {str(e)}'
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 
+			if not dropdown or not dropdown.get('options'):
+				msg = dropdown['error'] if dropdown and dropdown.get('error') else 'No options found for dropdown'
+				logger.info(msg)
+				return ActionResult(extracted_content=msg, include_in_memory=True)
+
+			logger.debug(f'Dropdown ID: {dropdown["id"]}, Name: {dropdown["name"]}')
+
+			# encoding ensures AI uses the exact string in select_dropdown_option
+			msg = '\n'.join(f'{opt["index"]}: text={json.dumps(opt["text"])}' for opt in dropdown['options'])
+			msg += '\nUse the exact text string in select_dropdown_option'
+			logger.info(msg)
+			return ActionResult(extracted_content=msg, include_in_memory=True)
+
 		@self.registry.action(
 			description='Select dropdown option for interactive element index by the text of the option you want to select',
 		)
@@ -466,7 +507,6 @@ class Controller(Generic[Context]):
 			browser_session: BrowserSession,
 		) -> ActionResult:
 			"""Select dropdown option by the text of the option you want to select"""
-			page = await browser_session.get_current_page()
 			selector_map = await browser_session.get_selector_map()
 			dom_element = selector_map[index]
 
@@ -478,80 +518,28 @@ class Controller(Generic[Context]):
 
 			logger.debug(f"Attempting to select '{text}' using xpath: {dom_element.xpath}")
 			logger.debug(f'Element attributes: {dom_element.attributes}')
-			logger.debug(f'Element tag: {dom_element.tag_name}')
-
-			xpath = '//' + dom_element.xpath
 
 			try:
-				frame_index = 0
-				for frame in page.frames:
-					try:
-						logger.debug(f'Trying frame {frame_index} URL: {frame.url}')
-
-						# First verify we can find the dropdown in this frame
-						find_dropdown_js = """
-							(xpath) => {
-								try {
-									const select = document.evaluate(xpath, document, null,
-										XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-									if (!select) return null;
-									if (select.tagName.toLowerCase() !== 'select') {
-										return {
-											error: `Found element but it's a ${select.tagName}, not a SELECT`,
-											found: false
-										};
-									}
-									return {
-										id: select.id,
-										name: select.name,
-										found: true,
-										tagName: select.tagName,
-										optionCount: select.options.length,
-										currentValue: select.value,
-										availableOptions: Array.from(select.options).map(o => o.text.trim())
-									};
-								} catch (e) {
-									return {error: e.toString(), found: false};
-								}
-							}
-						"""
-
-						dropdown_info = await frame.evaluate(find_dropdown_js, dom_element.xpath)
-
-						if dropdown_info:
-							if not dropdown_info.get('found'):
-								logger.error(f'Frame {frame_index} error: {dropdown_info.get("error")}')
-								continue
-
-							logger.debug(f'Found dropdown in frame {frame_index}: {dropdown_info}')
-
-							# "label" because we are selecting by text
-							# nth(0) to disable error thrown by strict mode
-							# timeout=1000 because we are already waiting for all network events, therefore ideally we don't need to wait a lot here (default 30s)
-							selected_option_values = (
-								await frame.locator('//' + dom_element.xpath).nth(0).select_option(label=text, timeout=1000)
-							)
-
-							msg = f'selected option {text} with value {selected_option_values}'
-							logger.info(msg + f' in frame {frame_index}')
-
-							return ActionResult(extracted_content=msg, include_in_memory=True)
-
-					except Exception as frame_e:
-						logger.error(f'Frame {frame_index} attempt failed: {str(frame_e)}')
-						logger.error(f'Frame type: {type(frame)}')
-						logger.error(f'Frame URL: {frame.url}')
+				dropdown = await browser_session.select_dropdown_option(dom_element, text)
+			except Exception as e:
+				msg = f'Selection failed: {str(e)}'
+				logger.error(msg)
+				return ActionResult(error=msg, include_in_memory=True)
 
-					frame_index += 1
+			if not dropdown:
+				msg = f"Could not select option '{text}': the dropdown is no longer on the page"
+				logger.info(msg)
+				return ActionResult(extracted_content=msg, include_in_memory=True)
 
-				msg = f"Could not select option '{text}' in any frame"
+			if dropdown.get('error'):
+				available_options = [opt['text'].strip() for opt in dropdown.get('options', [])]
+				msg = f"Could not select option '{text}': {dropdown['error']}. Available options: {available_options}"
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 
-			except Exception as e:
-				msg = f'Selection failed: {str(e)}'
-				logger.error(msg)
-				return ActionResult(error=msg, include_in_memory=True)
+			msg = f'selected option {text} with value {dropdown["selected"]}'
+			logger.info(msg)
+			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		@self.registry.action(
 			'Drag and drop elements or between coordinates on the page - useful for canvas drawing, sortable lists, sliders, file uploads, and UI rearrangement',
@@ -887,6 +875,9 @@ class Controller(Generic[Context]):
 
 				# Laminar.set_span_output(result)
 
+				if action_name not in STATE_PRESERVING_ACTIONS and not (isinstance(result, ActionResult) and result.error):
+					browser_session.invalidate_state_summary()
+
 				if isinstance(result, str):
 					return ActionResult(extracted_content=result)
 				elif isinstance(result, ActionResult):
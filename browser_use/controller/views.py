@@ -42,6 +42,12 @@ class ScrollAction(BaseModel):
 	amount: int | None = None  # The number of pixels to scroll. If None, scroll down/up one page
 
 
+class ScrollAndCollectAction(BaseModel):
+	max_items: int = Field(100, ge=1, le=500, description='Stop after collecting this many items')
+	max_seconds: int = Field(15, ge=1, le=60, description='Stop scrolling after this many seconds')
+	item_selector: str | None = Field(None, description='CSS selector of the list items, detected automatically if not given')
+
+
 class SendKeysAction(BaseModel):
 	keys: str
 
@@ -50,6 +56,12 @@ class ExtractPageContentAction(BaseModel):
 	value: str
 
 
+class ExtractContentFromTabsAction(BaseModel):
+	urls: list[str] = Field(min_length=1, max_length=10, description='Pages to open in background tabs and extract from')
+	goal: str
+	include_links: bool = False
+
+
 class NoParamsAction(BaseModel):
 	"""
 	Accepts absolutely anything in the incoming data
@@ -4,30 +4,34 @@
     focusHighlightIndex: -1,
     viewportExpansion: 0,
     debugMode: false,
+    maxNodes: 0,
+    tiles: null,
+    renderHighlights: true,
   }
 ) => {
-  const { doHighlightElements, focusHighlightIndex, viewportExpansion, debugMode } = args;
+  const { doHighlightElements, focusHighlightIndex, debugMode, maxNodes = 0, tiles = null, renderHighlights = true } = args;
+  // Tiled extraction ({ first, last } viewport-sized tiles of the document) walks the whole page once and keeps an
+  // index of where every node is, later tile ranges are served from that index without walking the page again
+  const viewportExpansion = tiles ? -1 : args.viewportExpansion;
   let highlightIndex = 0; // Reset highlight index
 
-  // Add timing stack to handle recursion
-  const TIMING_STACK = {
-    nodeProcessing: [],
-    treeTraversal: [],
-    highlighting: [],
-    current: null
-  };
-
-  function pushTiming(type) {
-    TIMING_STACK[type] = TIMING_STACK[type] || [];
-    TIMING_STACK[type].push(performance.now());
-  }
+  // Hard cap on the number of serialized nodes, the nodes after it in document order are left out
+  const nodeBudget = !tiles && maxNodes > 0 ? maxNodes : Infinity;
+  let serializedNodes = 0;
+  let truncated = false;
 
-  function popTiming(type) {
-    const start = TIMING_STACK[type].pop();
-    const duration = performance.now() - start;
-    return duration;
+  function takeNodeBudget() {
+    if (serializedNodes >= nodeBudget) {
+      truncated = true;
+      return false;
+    }
+    serializedNodes++;
+    return true;
   }
 
+  // #if DEBUG
+  // Instrumentation between "#if DEBUG" and "#endif" and on lines marked "#debug" is only part of the debug build,
+  // DomService strips it from the script it runs when no perfMetrics are needed.
   // Only initialize performance tracking if in debug mode
   const PERF_METRICS = debugMode ? {
     buildDomTreeCalls: 0,
@@ -53,6 +57,8 @@
       overallHitRate: 0,
       clientRectsCacheHits: 0,
       clientRectsCacheMisses: 0,
+      hitTestCacheHits: 0,
+      hitTestCacheMisses: 0,
     },
     nodeMetrics: {
       totalNodes: 0,
@@ -66,10 +72,12 @@
       domOperations: {
         getBoundingClientRect: 0,
         getComputedStyle: 0,
+        elementFromPoint: 0,
       },
       domOperationCounts: {
         getBoundingClientRect: 0,
         getComputedStyle: 0,
+        elementFromPoint: 0,
       }
     }
   } : null;
@@ -80,36 +88,30 @@
     return function (...args) {
       const start = performance.now();
       const result = fn.apply(this, args);
-      const duration = performance.now() - start;
+      PERF_METRICS.timings[fn.name] += performance.now() - start;
       return result;
     };
   }
 
-  // Helper to measure DOM operations
-  function measureDomOperation(operation, name) {
-    if (!debugMode) return operation();
-
-    const start = performance.now();
-    const result = operation();
-    const duration = performance.now() - start;
-
-    if (PERF_METRICS && name in PERF_METRICS.buildDomTreeBreakdown.domOperations) {
-      PERF_METRICS.buildDomTreeBreakdown.domOperations[name] += duration;
-      PERF_METRICS.buildDomTreeBreakdown.domOperationCounts[name]++;
-    }
-
-    return result;
+  // Adds the duration of a DOM operation that started at `start` to the breakdown
+  function recordDomOperation(name, start) {
+    PERF_METRICS.buildDomTreeBreakdown.domOperations[name] += performance.now() - start;
+    PERF_METRICS.buildDomTreeBreakdown.domOperationCounts[name]++;
   }
+  // #endif
 
   // Add caching mechanisms at the top level
   const DOM_CACHE = {
     boundingRects: new WeakMap(),
     clientRects: new WeakMap(),
     computedStyles: new WeakMap(),
+    // document or shadow root -> Map of "x,y" -> element hit at that point
+    hitTests: new WeakMap(),
     clearCache: () => {
       DOM_CACHE.boundingRects = new WeakMap();
       DOM_CACHE.clientRects = new WeakMap();
       DOM_CACHE.computedStyles = new WeakMap();
+      DOM_CACHE.hitTests = new WeakMap();
     }
   };
 
@@ -118,28 +120,14 @@
     if (!element) return null;
 
     if (DOM_CACHE.boundingRects.has(element)) {
-      if (debugMode && PERF_METRICS) {
-        PERF_METRICS.cacheMetrics.boundingRectCacheHits++;
-      }
+      if (debugMode) PERF_METRICS.cacheMetrics.boundingRectCacheHits++; // #debug
       return DOM_CACHE.boundingRects.get(element);
     }
 
-    if (debugMode && PERF_METRICS) {
-      PERF_METRICS.cacheMetrics.boundingRectCacheMisses++;
-    }
-
-    let rect;
-    if (debugMode) {
-      const start = performance.now();
-      rect = element.getBoundingClientRect();
-      const duration = performance.now() - start;
-      if (PERF_METRICS) {
-        PERF_METRICS.buildDomTreeBreakdown.domOperations.getBoundingClientRect += duration;
-        PERF_METRICS.buildDomTreeBreakdown.domOperationCounts.getBoundingClientRect++;
-      }
-    } else {
-      rect = element.getBoundingClientRect();
-    }
+    if (debugMode) PERF_METRICS.cacheMetrics.boundingRectCacheMisses++; // #debug
+    const start = debugMode ? performance.now() : 0; // #debug
+    const rect = element.getBoundingClientRect();
+    if (debugMode) recordDomOperation('getBoundingClientRect', start); // #debug
 
     if (rect) {
       DOM_CACHE.boundingRects.set(element, rect);
@@ -151,28 +139,14 @@
     if (!element) return null;
 
     if (DOM_CACHE.computedStyles.has(element)) {
-      if (debugMode && PERF_METRICS) {
-        PERF_METRICS.cacheMetrics.computedStyleCacheHits++;
-      }
+      if (debugMode) PERF_METRICS.cacheMetrics.computedStyleCacheHits++; // #debug
       return DOM_CACHE.computedStyles.get(element);
     }
 
-    if (debugMode && PERF_METRICS) {
-      PERF_METRICS.cacheMetrics.computedStyleCacheMisses++;
-    }
-
-    let style;
-    if (debugMode) {
-      const start = performance.now();
-      style = window.getComputedStyle(element);
-      const duration = performance.now() - start;
-      if (PERF_METRICS) {
-        PERF_METRICS.buildDomTreeBreakdown.domOperations.getComputedStyle += duration;
-        PERF_METRICS.buildDomTreeBreakdown.domOperationCounts.getComputedStyle++;
-      }
-    } else {
-      style = window.getComputedStyle(element);
-    }
+    if (debugMode) PERF_METRICS.cacheMetrics.computedStyleCacheMisses++; // #debug
+    const start = debugMode ? performance.now() : 0; // #debug
+    const style = window.getComputedStyle(element);
+    if (debugMode) recordDomOperation('getComputedStyle', start); // #debug
 
     if (style) {
       DOM_CACHE.computedStyles.set(element, style);
@@ -185,15 +159,11 @@
     if (!element) return null;
     
     if (DOM_CACHE.clientRects.has(element)) {
-      if (debugMode && PERF_METRICS) {
-        PERF_METRICS.cacheMetrics.clientRectsCacheHits++;
-      }
+      if (debugMode) PERF_METRICS.cacheMetrics.clientRectsCacheHits++; // #debug
       return DOM_CACHE.clientRects.get(element);
     }
     
-    if (debugMode && PERF_METRICS) {
-      PERF_METRICS.cacheMetrics.clientRectsCacheMisses++;
-    }
+    if (debugMode) PERF_METRICS.cacheMetrics.clientRectsCacheMisses++; // #debug
     
     const rects = element.getClientRects();
     
@@ -203,6 +173,30 @@
     return rects;
   }
 
+  // Nested elements (a span in a link in a list item) often share the center point they are hit tested at,
+  // so every point is only hit tested once per document or shadow root
+  function getCachedElementFromPoint(root, x, y) {
+    let hits = DOM_CACHE.hitTests.get(root);
+    if (!hits) {
+      hits = new Map();
+      DOM_CACHE.hitTests.set(root, hits);
+    }
+
+    const key = `${x},${y}`;
+    if (hits.has(key)) {
+      if (debugMode) PERF_METRICS.cacheMetrics.hitTestCacheHits++; // #debug
+      return hits.get(key);
+    }
+
+    if (debugMode) PERF_METRICS.cacheMetrics.hitTestCacheMisses++; // #debug
+
+    const start = debugMode ? performance.now() : 0; // #debug
+    const element = root.elementFromPoint(x, y);
+    if (debugMode) recordDomOperation('elementFromPoint', start); // #debug
+    hits.set(key, element);
+    return element;
+  }
+
   /**
    * Hash map of DOM nodes indexed by their highlight index.
    *
@@ -212,6 +206,11 @@
 
   const ID = { current: 0 };
 
+  // Highlighted elements by highlight index, published on window so actions can resolve an index
+  // to its element directly instead of re-matching a CSS selector or XPath
+  const ELEMENT_MAP = new Map();
+  const ELEMENT_MAP_ID = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
 
   // Add a WeakMap cache for XPath strings
@@ -227,245 +226,34 @@
     { rootMargin: `${viewportExpansion}px` }
   );
 
+  // All overlays are drawn on one canvas by the highlighter installed by highlighter.js (see DomService),
+  // earlier highlights are dropped so their listeners don't pile up across steps
+  const highlighter = doHighlightElements ? window.__browserUseHighlighter : null;
+  if (highlighter) highlighter.reset();
+
   /**
-   * Highlights an element in the DOM and returns the index of the next element.
+   * Queues an element to be highlighted and returns the index of the next element.
    */
   function highlightElement(element, index, parentIframe = null) {
-    pushTiming('highlighting');
-    
-    if (!element) return index;
-
-    // Store overlays and the single label for updating
-    const overlays = [];
-    let label = null;
-    let labelWidth = 20;
-    let labelHeight = 16;
-    let cleanupFn = null;
-
-    try {
-      // Create or get highlight container
-      let container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
-      if (!container) {
-        container = document.createElement("div");
-        container.id = HIGHLIGHT_CONTAINER_ID;
-        container.style.position = "fixed";
-        container.style.pointerEvents = "none";
-        container.style.top = "0";
-        container.style.left = "0";
-        container.style.width = "100%";
-        container.style.height = "100%";
-        container.style.zIndex = "2147483640";
-        container.style.backgroundColor = 'transparent';
-        document.body.appendChild(container);
-      }
-
-      // Get element client rects
-      const rects = element.getClientRects(); // Use getClientRects()
-
-      if (!rects || rects.length === 0) return index; // Exit if no rects
-
-      // Generate a color based on the index
-      const colors = [
-        "#FF0000",
-        "#00FF00",
-        "#0000FF",
-        "#FFA500",
-        "#800080",
-        "#008080",
-        "#FF69B4",
-        "#4B0082",
-        "#FF4500",
-        "#2E8B57",
-        "#DC143C",
-        "#4682B4",
-      ];
-      const colorIndex = index % colors.length;
-      const baseColor = colors[colorIndex];
-      const backgroundColor = baseColor + "1A"; // 10% opacity version of the color
-
-      // Get iframe offset if necessary
-      let iframeOffset = { x: 0, y: 0 };
-      if (parentIframe) {
-        const iframeRect = parentIframe.getBoundingClientRect(); // Keep getBoundingClientRect for iframe offset
-        iframeOffset.x = iframeRect.left;
-        iframeOffset.y = iframeRect.top;
-      }
-
-      // Create fragment to hold overlay elements
-      const fragment = document.createDocumentFragment();
-
-      // Create highlight overlays for each client rect
-      for (const rect of rects) {
-        if (rect.width === 0 || rect.height === 0) continue; // Skip empty rects
-
-        const overlay = document.createElement("div");
-        overlay.style.position = "fixed";
-        overlay.style.border = `2px solid ${baseColor}`;
-        overlay.style.backgroundColor = backgroundColor;
-        overlay.style.pointerEvents = "none";
-        overlay.style.boxSizing = "border-box";
-
-        const top = rect.top + iframeOffset.y;
-        const left = rect.left + iframeOffset.x;
-
-        overlay.style.top = `${top}px`;
-        overlay.style.left = `${left}px`;
-        overlay.style.width = `${rect.width}px`;
-        overlay.style.height = `${rect.height}px`;
-
-        fragment.appendChild(overlay);
-        overlays.push({ element: overlay, initialRect: rect }); // Store overlay and its rect
-      }
-
-      // Create and position a single label relative to the first rect
-      const firstRect = rects[0];
-      label = document.createElement("div");
-      label.className = "playwright-highlight-label";
-      label.style.position = "fixed";
-      label.style.background = baseColor;
-      label.style.color = "white";
-      label.style.padding = "1px 4px";
-      label.style.borderRadius = "4px";
-      label.style.fontSize = `${Math.min(12, Math.max(8, firstRect.height / 2))}px`;
-      label.textContent = index;
-
-      labelWidth = label.offsetWidth > 0 ? label.offsetWidth : labelWidth; // Update actual width if possible
-      labelHeight = label.offsetHeight > 0 ? label.offsetHeight : labelHeight; // Update actual height if possible
-
-      const firstRectTop = firstRect.top + iframeOffset.y;
-      const firstRectLeft = firstRect.left + iframeOffset.x;
-
-      let labelTop = firstRectTop + 2;
-      let labelLeft = firstRectLeft + firstRect.width - labelWidth - 2;
-
-      // Adjust label position if first rect is too small
-      if (firstRect.width < labelWidth + 4 || firstRect.height < labelHeight + 4) {
-        labelTop = firstRectTop - labelHeight - 2;
-        labelLeft = firstRectLeft + firstRect.width - labelWidth; // Align with right edge
-        if (labelLeft < iframeOffset.x) labelLeft = firstRectLeft; // Prevent going off-left
-      }
-
-      // Ensure label stays within viewport bounds slightly better
-      labelTop = Math.max(0, Math.min(labelTop, window.innerHeight - labelHeight));
-      labelLeft = Math.max(0, Math.min(labelLeft, window.innerWidth - labelWidth));
-
-
-      label.style.top = `${labelTop}px`;
-      label.style.left = `${labelLeft}px`;
-
-      fragment.appendChild(label);
-
-      // Update positions on scroll/resize
-      const updatePositions = () => {
-        const newRects = element.getClientRects(); // Get fresh rects
-        let newIframeOffset = { x: 0, y: 0 };
-
-        if (parentIframe) {
-          const iframeRect = parentIframe.getBoundingClientRect(); // Keep getBoundingClientRect for iframe
-          newIframeOffset.x = iframeRect.left;
-          newIframeOffset.y = iframeRect.top;
-        }
-
-        // Update each overlay
-        overlays.forEach((overlayData, i) => {
-          if (i < newRects.length) { // Check if rect still exists
-            const newRect = newRects[i];
-            const newTop = newRect.top + newIframeOffset.y;
-            const newLeft = newRect.left + newIframeOffset.x;
-
-            overlayData.element.style.top = `${newTop}px`;
-            overlayData.element.style.left = `${newLeft}px`;
-            overlayData.element.style.width = `${newRect.width}px`;
-            overlayData.element.style.height = `${newRect.height}px`;
-            overlayData.element.style.display = (newRect.width === 0 || newRect.height === 0) ? 'none' : 'block';
-          } else {
-            // If fewer rects now, hide extra overlays
-            overlayData.element.style.display = 'none';
-          }
-        });
-
-        // If there are fewer new rects than overlays, hide the extras
-        if (newRects.length < overlays.length) {
-          for (let i = newRects.length; i < overlays.length; i++) {
-            overlays[i].element.style.display = 'none';
-          }
-        }
-
-        // Update label position based on the first new rect
-        if (label && newRects.length > 0) {
-          const firstNewRect = newRects[0];
-          const firstNewRectTop = firstNewRect.top + newIframeOffset.y;
-          const firstNewRectLeft = firstNewRect.left + newIframeOffset.x;
-
-          let newLabelTop = firstNewRectTop + 2;
-          let newLabelLeft = firstNewRectLeft + firstNewRect.width - labelWidth - 2;
-
-          if (firstNewRect.width < labelWidth + 4 || firstNewRect.height < labelHeight + 4) {
-            newLabelTop = firstNewRectTop - labelHeight - 2;
-            newLabelLeft = firstNewRectLeft + firstNewRect.width - labelWidth;
-            if (newLabelLeft < newIframeOffset.x) newLabelLeft = firstNewRectLeft;
-          }
-
-          // Ensure label stays within viewport bounds
-          newLabelTop = Math.max(0, Math.min(newLabelTop, window.innerHeight - labelHeight));
-          newLabelLeft = Math.max(0, Math.min(newLabelLeft, window.innerWidth - labelWidth));
-
-          label.style.top = `${newLabelTop}px`;
-          label.style.left = `${newLabelLeft}px`;
-          label.style.display = 'block';
-        } else if (label) {
-          // Hide label if element has no rects anymore
-          label.style.display = 'none';
-        }
-      };
-
-      const throttleFunction = (func, delay) => {
-        let lastCall = 0;
-        return (...args) => {
-          const now = performance.now();
-          if (now - lastCall < delay) return;
-          lastCall = now;
-          return func(...args);
-        };
-      };
-
-      const throttledUpdatePositions = throttleFunction(updatePositions, 16); // ~60fps
-      window.addEventListener('scroll', throttledUpdatePositions, true);
-      window.addEventListener('resize', throttledUpdatePositions);
-      
-      // Add cleanup function
-      cleanupFn = () => {
-        window.removeEventListener('scroll', throttledUpdatePositions, true);
-        window.removeEventListener('resize', throttledUpdatePositions);
-        // Remove overlay elements if needed
-        overlays.forEach(overlay => overlay.element.remove());
-        if (label) label.remove();
-      };
-      
-      // Then add fragment to container in one operation
-      container.appendChild(fragment);
-      
-      return index + 1;
-    } finally {
-      popTiming('highlighting');
-      // Store cleanup function for later use
-      if (cleanupFn) {
-        // Keep a reference to cleanup functions in a global array
-        (window._highlightCleanupFunctions = window._highlightCleanupFunctions || []).push(cleanupFn);
-      }
-    }
+    if (!element || !highlighter) return index;
+    highlighter.add(element, index, parentIframe);
+    return index + 1;
   }
 
-  // Add this function to perform cleanup when needed
-  function cleanupHighlights() {
-    if (window._highlightCleanupFunctions && window._highlightCleanupFunctions.length) {
-      window._highlightCleanupFunctions.forEach(fn => fn());
-      window._highlightCleanupFunctions = [];
+  // Tiled extraction: id -> [top, bottom] of the node in document coordinates, Infinity for fixed elements
+  const EXTENTS = tiles ? new Map() : null;
+  const HIGHLIGHTS = tiles ? [] : null;
+
+  function recordExtent(id, element, parentIframe) {
+    // nodes inside iframes are placed where their iframe is
+    const target = parentIframe || element;
+    const rect = getCachedBoundingRect(target);
+    if (!rect || (rect.width === 0 && rect.height === 0)) return;
+    if (getCachedComputedStyle(target)?.position === 'fixed') {
+      EXTENTS.set(id, [-Infinity, Infinity]);
+    } else {
+      EXTENTS.set(id, [rect.top + window.scrollY, rect.bottom + window.scrollY]);
     }
-    
-    // Also remove the container
-    const container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
-    if (container) container.remove();
   }
 
   function getElementPosition(currentElement) {
@@ -536,7 +324,7 @@
           });
         } catch (e) {
           // Fallback if checkVisibility is not supported
-          const style = window.getComputedStyle(parentElement);
+          const style = getCachedComputedStyle(parentElement);
           return style.display !== 'none' &&
             style.visibility !== 'hidden' &&
             style.opacity !== '0';
@@ -587,7 +375,7 @@
         });
       } catch (e) {
         // Fallback if checkVisibility is not supported
-        const style = window.getComputedStyle(parentElement);
+        const style = getCachedComputedStyle(parentElement);
         return style.display !== 'none' &&
           style.visibility !== 'hidden' &&
           style.opacity !== '0';
@@ -913,10 +701,7 @@
       const centerY = rects[Math.floor(rects.length / 2)].top + rects[Math.floor(rects.length / 2)].height / 2;
 
       try {
-        const topEl = measureDomOperation(
-          () => shadowRoot.elementFromPoint(centerX, centerY),
-          'elementFromPoint'
-        );
+        const topEl = getCachedElementFromPoint(shadowRoot, centerX, centerY);
         if (!topEl) return false;
 
         let current = topEl;
@@ -935,7 +720,7 @@
     const centerY = rects[Math.floor(rects.length / 2)].top + rects[Math.floor(rects.length / 2)].height / 2;
 
     try {
-      const topEl = document.elementFromPoint(centerX, centerY);
+      const topEl = getCachedElementFromPoint(document, centerX, centerY);
       if (!topEl) return false;
 
       let current = topEl;
@@ -957,7 +742,7 @@
       return true;
     }
 
-    const rects = element.getClientRects(); // Use getClientRects
+    const rects = getCachedClientRects(element);
 
     if (!rects || rects.length === 0) {
       // Fallback to getBoundingClientRect if getClientRects is empty,
@@ -997,20 +782,18 @@
     let scrollX = 0;
     let scrollY = 0;
 
-    return measureDomOperation(() => {
-      while (currentEl && currentEl !== document.documentElement) {
-        if (currentEl.scrollLeft || currentEl.scrollTop) {
-          scrollX += currentEl.scrollLeft;
-          scrollY += currentEl.scrollTop;
-        }
-        currentEl = currentEl.parentElement;
+    while (currentEl && currentEl !== document.documentElement) {
+      if (currentEl.scrollLeft || currentEl.scrollTop) {
+        scrollX += currentEl.scrollLeft;
+        scrollY += currentEl.scrollTop;
       }
+      currentEl = currentEl.parentElement;
+    }
 
-      scrollX += window.scrollX;
-      scrollY += window.scrollY;
+    scrollX += window.scrollX;
+    scrollY += window.scrollY;
 
-      return { scrollX, scrollY };
-    }, 'scrollOperations');
+    return { scrollX, scrollY };
   }
 
   // Add these helper functions at the top level
@@ -1190,6 +973,8 @@
       // regardless of viewport status
       if (nodeData.isInViewport || viewportExpansion === -1) {
         nodeData.highlightIndex = highlightIndex++;
+        ELEMENT_MAP.set(nodeData.highlightIndex, node);
+        if (HIGHLIGHTS) HIGHLIGHTS.push({ index: nodeData.highlightIndex, element: node, parentIframe });
 
         if (doHighlightElements) {
           if (focusHighlightIndex >= 0) {
@@ -1216,14 +1001,14 @@
     // Fast rejection checks first
     if (!node || node.id === HIGHLIGHT_CONTAINER_ID || 
         (node.nodeType !== Node.ELEMENT_NODE && node.nodeType !== Node.TEXT_NODE)) {
-      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
       return null;
     }
 
-    if (debugMode) PERF_METRICS.nodeMetrics.totalNodes++;
+    if (debugMode) PERF_METRICS.nodeMetrics.totalNodes++; // #debug
 
     if (!node || node.id === HIGHLIGHT_CONTAINER_ID) {
-      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
       return null;
     }
 
@@ -1244,13 +1029,13 @@
 
       const id = `${ID.current++}`;
       DOM_HASH_MAP[id] = nodeData;
-      if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++;
+      if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++; // #debug
       return id;
     }
 
     // Early bailout for non-element nodes except text
     if (node.nodeType !== Node.ELEMENT_NODE && node.nodeType !== Node.TEXT_NODE) {
-      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
       return null;
     }
 
@@ -1258,16 +1043,17 @@
     if (node.nodeType === Node.TEXT_NODE) {
       const textContent = node.textContent.trim();
       if (!textContent) {
-        if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+        if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
         return null;
       }
 
       // Only check visibility for text nodes that might be visible
       const parentElement = node.parentElement;
       if (!parentElement || parentElement.tagName.toLowerCase() === 'script') {
-        if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+        if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
         return null;
       }
+      if (!takeNodeBudget()) return null;
 
       const id = `${ID.current++}`;
       DOM_HASH_MAP[id] = {
@@ -1275,13 +1061,14 @@
         text: textContent,
         isVisible: isTextNodeVisible(node),
       };
-      if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++;
+      if (EXTENTS) recordExtent(id, parentElement, parentIframe);
+      if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++; // #debug
       return id;
     }
 
     // Quick checks for element nodes
     if (node.nodeType === Node.ELEMENT_NODE && !isElementAccepted(node)) {
-      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
       return null;
     }
 
@@ -1305,11 +1092,13 @@
         rect.left > window.innerWidth + viewportExpansion
       ))) {
         // console.log("Skipping node outside viewport (quick check):", node.tagName, rect);
-        if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+        if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
         return null;
       }
     }
 
+    if (!takeNodeBudget()) return null;
+
     // Process element node
     const nodeData = {
       tagName: node.tagName.toLowerCase(),
@@ -1341,21 +1130,25 @@
     }
 
     // Process children, with special handling for iframes and rich text editors
+    let isCrossOriginIframe = false;
     if (node.tagName) {
       const tagName = node.tagName.toLowerCase();
 
       // Handle iframes
       if (tagName === "iframe") {
+        let iframeDoc = null;
         try {
-          const iframeDoc = node.contentDocument || node.contentWindow?.document;
-          if (iframeDoc) {
-            for (const child of iframeDoc.childNodes) {
-              const domElement = buildDomTree(child, node, false);
-              if (domElement) nodeData.children.push(domElement);
-            }
-          }
+          iframeDoc = node.contentDocument || node.contentWindow?.document;
         } catch (e) {
-          console.warn("Unable to access iframe:", e);
+          // cross-origin, DomService walks it in its own frame
+        }
+        if (iframeDoc) {
+          for (const child of iframeDoc.childNodes) {
+            const domElement = buildDomTree(child, node, false);
+            if (domElement) nodeData.children.push(domElement);
+          }
+        } else {
+          isCrossOriginIframe = true;
         }
       }
       // Handle rich text editors and contenteditable elements
@@ -1393,16 +1186,123 @@
 
     // Skip empty anchor tags
     if (nodeData.tagName === 'a' && nodeData.children.length === 0 && !nodeData.attributes.href) {
-      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++;
+      if (debugMode) PERF_METRICS.nodeMetrics.skippedNodes++; // #debug
       return null;
     }
 
     const id = `${ID.current++}`;
     DOM_HASH_MAP[id] = nodeData;
-    if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++;
+    if (EXTENTS) recordExtent(id, node, parentIframe);
+    // lets DomService find the node of an iframe it could not enter from the iframe's frame (an expando, not an attribute)
+    if (isCrossOriginIframe) node.__browserUseFrameNode = { mapId: ELEMENT_MAP_ID, id };
+    if (debugMode) PERF_METRICS.nodeMetrics.processedNodes++; // #debug
     return id;
   }
 
+  /**
+   * Publishes the walked page as window.__browserUseDomIndex, which serves the nodes of any range of tiles until the
+   * page is mutated or resized. Scrolling the window keeps it valid, the extents are in document coordinates.
+   */
+  function buildTileIndex() {
+    window.__browserUseDomIndex?.dispose();
+
+    // extent of every node together with its descendants, ids are assigned after the children so they come first
+    const spans = new Map();
+    for (let id = 0; id < ID.current; id++) {
+      const key = `${id}`;
+      const span = EXTENTS.has(key) ? [...EXTENTS.get(key)] : [Infinity, -Infinity];
+      for (const childId of DOM_HASH_MAP[key].children || []) {
+        const childSpan = spans.get(childId);
+        if (!childSpan) continue;
+        span[0] = Math.min(span[0], childSpan[0]);
+        span[1] = Math.max(span[1], childSpan[1]);
+      }
+      spans.set(key, span);
+    }
+
+    const tileHeight = Math.max(window.innerHeight, 1);
+    const documentHeight = Math.max(document.documentElement.scrollHeight, document.body.scrollHeight, tileHeight);
+
+    const observer = new MutationObserver((records) => {
+      const inHighlights = (node) => {
+        const element = node instanceof Element ? node : node.parentElement;
+        return !!element && (element.id === HIGHLIGHT_CONTAINER_ID || !!element.closest(`#${HIGHLIGHT_CONTAINER_ID}`));
+      };
+      const isHighlightMutation = (record) => inHighlights(record.target) || (
+        record.type === 'childList' && [...record.addedNodes, ...record.removedNodes].every(inHighlights)
+      );
+      if (!records.every(isHighlightMutation)) index.dispose();
+    });
+    const onResize = () => index.dispose();
+
+    const index = {
+      id: ELEMENT_MAP_ID,
+      stale: false,
+      tileCount: Math.ceil(documentHeight / tileHeight),
+      dispose() {
+        index.stale = true;
+        observer.disconnect();
+        window.removeEventListener('resize', onResize);
+      },
+      // nodes of the tiles first..last (inclusive) with their ancestors, at most maxNodes of them in document order
+      query({ tiles, maxNodes = 0, doHighlightElements = false }) {
+        const first = Math.max(0, Math.min(tiles.first, index.tileCount - 1));
+        const last = Math.max(first, Math.min(tiles.last ?? first, index.tileCount - 1));
+        const top = first * tileHeight;
+        const bottom = (last + 1) * tileHeight;
+        const budget = maxNodes > 0 ? maxNodes : Infinity;
+
+        const map = {};
+        const highlighted = new Set();
+        let count = 0;
+        let truncated = false;
+        const visit = (id, isRoot) => {
+          const span = spans.get(id);
+          if (!isRoot && !(span && span[0] < bottom && span[1] >= top)) return false;
+          if (!isRoot && count >= budget) {
+            truncated = true;
+            return false;
+          }
+          if (!isRoot) count++;
+          const node = DOM_HASH_MAP[id];
+          if (node.highlightIndex !== undefined) highlighted.add(node.highlightIndex);
+          map[id] = node.children ? { ...node, children: node.children.filter((childId) => visit(childId, false)) } : node;
+          return true;
+        };
+        visit(rootId, true);
+
+        const highlighter = doHighlightElements ? window.__browserUseHighlighter : null;
+        if (highlighter) {
+          highlighter.reset();
+          for (const { index: highlight, element, parentIframe } of HIGHLIGHTS) {
+            if (highlighted.has(highlight)) highlighter.add(element, highlight, parentIframe);
+          }
+          highlighter.render();
+        }
+
+        return {
+          rootId,
+          map,
+          elementMapId: ELEMENT_MAP_ID,
+          truncated,
+          tiles: { first, last, count: index.tileCount },
+        };
+      },
+    };
+
+    const observed = new Set([document]);
+    for (const { parentIframe } of HIGHLIGHTS) {
+      if (parentIframe?.contentDocument) observed.add(parentIframe.contentDocument);
+    }
+    for (const doc of observed) {
+      observer.observe(doc, { subtree: true, childList: true, attributes: true, characterData: true });
+    }
+    window.addEventListener('resize', onResize, { passive: true });
+    window.__browserUseDomIndex = index;
+    return index;
+  }
+
+  // #if DEBUG
   // After all functions are defined, wrap them with performance measurement
   // Remove buildDomTree from here as we measure it separately
   highlightElement = measureTime(highlightElement);
@@ -1412,12 +1312,24 @@
   isInExpandedViewport = measureTime(isInExpandedViewport);
   isTextNodeVisible = measureTime(isTextNodeVisible);
   getEffectiveScroll = measureTime(getEffectiveScroll);
+  // #endif
 
+  // Read phase: the walk only reads geometry and styles and queues the highlights, nothing in the page changes
+  // until it is done, so the layout is computed at most once for the whole walk.
   const rootId = buildDomTree(document.body);
 
-  // Clear the cache before starting
+  // Write phase: draw all highlights at once
+  if (highlighter && !tiles && renderHighlights) highlighter.render();
+
+  window.__browserUseElementMap = { id: ELEMENT_MAP_ID, elements: ELEMENT_MAP };
+
   DOM_CACHE.clearCache();
 
+  if (tiles) {
+    return buildTileIndex().query(args);
+  }
+
+  // #if DEBUG
   // Only process metrics in debug mode
   if (debugMode && PERF_METRICS) {
     // Convert timings to seconds and add useful derived metrics
@@ -1466,9 +1378,10 @@
         (PERF_METRICS.cacheMetrics.boundingRectCacheHits + PERF_METRICS.cacheMetrics.computedStyleCacheHits) /
         (boundingRectTotal + computedStyleTotal);
     }
+
+    return { rootId, map: DOM_HASH_MAP, elementMapId: ELEMENT_MAP_ID, truncated, perfMetrics: PERF_METRICS };
   }
+  // #endif
 
-  return debugMode ?
-    { rootId, map: DOM_HASH_MAP, perfMetrics: PERF_METRICS } :
-    { rootId, map: DOM_HASH_MAP };
+  return { rootId, map: DOM_HASH_MAP, elementMapId: ELEMENT_MAP_ID, truncated };
 };
@@ -0,0 +1,180 @@
+() => {
+  // Draws the highlight overlays of all interactive elements on a single <canvas>, redrawn by one
+  // requestAnimationFrame-throttled scroll/resize listener. Installed once per document and shared by
+  // buildDomTree.js and the CDP snapshot backend, torn down again by destroy().
+  if (window.__browserUseHighlighter) return window.__browserUseHighlighter;
+
+  const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
+  const COLORS = [
+    "#FF0000",
+    "#00FF00",
+    "#0000FF",
+    "#FFA500",
+    "#800080",
+    "#008080",
+    "#FF69B4",
+    "#4B0082",
+    "#FF4500",
+    "#2E8B57",
+    "#DC143C",
+    "#4682B4",
+  ];
+
+  // { index, element, parentIframe } for elements, { index, box } for fixed boxes in document coordinates
+  let items = [];
+  let container = null;
+  let canvas = null;
+  let frame = 0;
+  // added to every label, the elements of a cross-origin iframe are numbered after those of the page around it
+  let indexOffset = 0;
+
+  function ensureCanvas() {
+    if (container && container.isConnected) return;
+    container = document.getElementById(HIGHLIGHT_CONTAINER_ID);
+    if (!container) {
+      container = document.createElement("div");
+      container.id = HIGHLIGHT_CONTAINER_ID;
+      container.style.cssText =
+        "position: fixed; pointer-events: none; top: 0; left: 0; width: 100%; height: 100%; z-index: 2147483640; background-color: transparent;";
+      document.body.appendChild(container);
+    }
+    canvas = document.createElement("canvas");
+    canvas.style.cssText = "position: absolute; top: 0; left: 0; width: 100%; height: 100%; pointer-events: none;";
+    container.appendChild(canvas);
+  }
+
+  function itemRects(item) {
+    if (item.box) {
+      const { x, y, width, height } = item.box;
+      return [{ left: x - window.scrollX, top: y - window.scrollY, width, height }];
+    }
+    if (!item.element.isConnected) return [];
+    let offsetX = 0;
+    let offsetY = 0;
+    if (item.parentIframe) {
+      const iframeRect = item.parentIframe.getBoundingClientRect();
+      offsetX = iframeRect.left;
+      offsetY = iframeRect.top;
+    }
+    return Array.from(item.element.getClientRects(), (rect) => ({
+      left: rect.left + offsetX,
+      top: rect.top + offsetY,
+      width: rect.width,
+      height: rect.height,
+    }));
+  }
+
+  function drawLabel(ctx, index, color, rect) {
+    const fontSize = Math.min(12, Math.max(8, rect.height / 2));
+    ctx.font = `${fontSize}px sans-serif`;
+    const text = String(index);
+    const labelWidth = ctx.measureText(text).width + 8;
+    const labelHeight = fontSize + 4;
+
+    let top = rect.top + 2;
+    let left = rect.left + rect.width - labelWidth - 2;
+    // labels of small elements go above them
+    if (rect.width < labelWidth + 4 || rect.height < labelHeight + 4) {
+      top = rect.top - labelHeight - 2;
+      left = rect.left + rect.width - labelWidth;
+    }
+    top = Math.max(0, Math.min(top, window.innerHeight - labelHeight));
+    left = Math.max(0, Math.min(left, window.innerWidth - labelWidth));
+
+    ctx.fillStyle = color;
+    ctx.beginPath();
+    if (ctx.roundRect) ctx.roundRect(left, top, labelWidth, labelHeight, 4);
+    else ctx.rect(left, top, labelWidth, labelHeight);
+    ctx.fill();
+    ctx.fillStyle = "white";
+    ctx.textBaseline = "middle";
+    ctx.fillText(text, left + 4, top + labelHeight / 2);
+  }
+
+  function render() {
+    frame = 0;
+    const dpr = window.devicePixelRatio || 1;
+    const width = window.innerWidth;
+    const height = window.innerHeight;
+
+    // read all the rects before the canvas is created or resized, so the layout is computed once per frame
+    const visible = [];
+    for (const item of items) {
+      const rects = itemRects(item).filter(
+        (rect) =>
+          rect.width > 0 &&
+          rect.height > 0 &&
+          rect.top < height &&
+          rect.left < width &&
+          rect.top + rect.height > 0 &&
+          rect.left + rect.width > 0
+      );
+      if (rects.length) visible.push([item.index, rects]);
+    }
+
+    ensureCanvas();
+    if (canvas.width !== Math.round(width * dpr) || canvas.height !== Math.round(height * dpr)) {
+      canvas.width = Math.round(width * dpr);
+      canvas.height = Math.round(height * dpr);
+    }
+    const ctx = canvas.getContext("2d");
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+    ctx.lineWidth = 2;
+
+    for (const [itemIndex, rects] of visible) {
+      const index = itemIndex + indexOffset;
+      const color = COLORS[index % COLORS.length];
+      for (const rect of rects) {
+        ctx.fillStyle = color + "1A"; // 10% opacity version of the color
+        ctx.fillRect(rect.left, rect.top, rect.width, rect.height);
+        ctx.strokeStyle = color;
+        ctx.strokeRect(rect.left + 1, rect.top + 1, rect.width - 2, rect.height - 2);
+      }
+      drawLabel(ctx, index, color, rects[0]);
+    }
+  }
+
+  function scheduleRender() {
+    if (!frame) frame = requestAnimationFrame(render);
+  }
+
+  const highlighter = {
+    // start over with no highlights (a new DOM tree snapshot is about to be highlighted)
+    reset() {
+      items = [];
+      indexOffset = 0;
+      if (frame) cancelAnimationFrame(frame);
+      frame = 0;
+      if (canvas && canvas.isConnected) canvas.getContext("2d").clearRect(0, 0, canvas.width, canvas.height);
+    },
+    add(element, index, parentIframe = null) {
+      items.push({ index, element, parentIframe });
+    },
+    // boxes measured outside of the page, in viewport coordinates at the current scroll position
+    addBoxes(boxes) {
+      for (const { index, x, y, width, height } of boxes) {
+        items.push({ index, box: { x: x + window.scrollX, y: y + window.scrollY, width, height } });
+      }
+    },
+    setIndexOffset(offset) {
+      indexOffset = offset;
+    },
+    render,
+    destroy() {
+      window.removeEventListener("scroll", scheduleRender, true);
+      window.removeEventListener("resize", scheduleRender);
+      if (frame) cancelAnimationFrame(frame);
+      items = [];
+      document.getElementById(HIGHLIGHT_CONTAINER_ID)?.remove();
+      container = null;
+      canvas = null;
+      delete window.__browserUseHighlighter;
+    },
+  };
+
+  window.addEventListener("scroll", scheduleRender, { capture: true, passive: true });
+  window.addEventListener("resize", scheduleRender, { passive: true });
+  window.__browserUseHighlighter = highlighter;
+  return highlighter;
+}
@@ -1,8 +1,31 @@
 import hashlib
+import logging
+import weakref
+from dataclasses import dataclass, field
 
 from browser_use.dom.history_tree_processor.view import DOMHistoryElement, HashedDomElement
 from browser_use.dom.views import DOMElementNode
 
+logger = logging.getLogger(__name__)
+
+# a tolerant match needs the xpath or the attributes to be unchanged (or both to be close) and an attribute value in
+# common, see _match_score()
+MIN_TOLERANT_MATCH_SCORE = 1.0
+
+
+@dataclass
+class HistoryTreeIndex:
+	"""
+	The highlighted elements of one DOM tree by their (branch path, attributes, xpath) key, the same parts that
+	HashedDomElement hashes, built in a single pass so any number of history elements can be looked up in the tree
+	without walking and hashing it again
+	"""
+
+	elements: dict[tuple[str, str, str], DOMElementNode] = field(default_factory=dict)
+	# keys of the elements with the same xpath / the same attributes, the candidates of a tolerant match
+	by_xpath: dict[str, list[tuple[str, str, str]]] = field(default_factory=dict)
+	by_attributes: dict[str, list[tuple[str, str, str]]] = field(default_factory=dict)
+
 
 class HistoryTreeProcessor:
 	""" "
@@ -31,22 +54,109 @@ class HistoryTreeProcessor:
 		)
 
 	@staticmethod
-	def find_history_element_in_tree(dom_history_element: DOMHistoryElement, tree: DOMElementNode) -> DOMElementNode | None:
-		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
+	def find_history_element_in_tree(
+		dom_history_element: DOMHistoryElement, tree: DOMElementNode, tolerant: bool = False
+	) -> DOMElementNode | None:
+		"""
+		Find the highlighted element of the tree with the same branch path, attributes and xpath as the history element.
+		With tolerant=True, fall back to the best scoring element with the same xpath or attributes if the page layout
+		drifted, as long as it is the only best one.
+		"""
+		index = HistoryTreeProcessor.build_index(tree)
+		key = HistoryTreeProcessor._history_element_key(dom_history_element)
+		element = index.elements.get(key)
+		if element is not None or not tolerant:
+			return element
+
+		branch_path, attributes, xpath = key
+		candidates = dict.fromkeys([*index.by_xpath.get(xpath, []), *index.by_attributes.get(attributes, [])])
+		scored = sorted(
+			(
+				(HistoryTreeProcessor._match_score(dom_history_element, key, candidate, index.elements[candidate]), candidate)
+				for candidate in candidates
+			),
+			reverse=True,
+		)
+		if not scored or scored[0][0] < MIN_TOLERANT_MATCH_SCORE:
+			return None
+		if len(scored) > 1 and scored[1][0] == scored[0][0]:
+			logger.debug(f'Ambiguous tolerant match for {dom_history_element.tag_name} {dom_history_element.xpath}')
+			return None
+		score, best = scored[0]
+		logger.debug(f'Tolerant match for {dom_history_element.tag_name} {dom_history_element.xpath}: {best[2]} (score {score})')
+		return index.elements[best]
+
+	_last_index: tuple[weakref.ref[DOMElementNode], HistoryTreeIndex] | None = None
 
-		def process_node(node: DOMElementNode):
+	@staticmethod
+	def build_index(tree: DOMElementNode) -> HistoryTreeIndex:
+		"""Index the highlighted elements of the tree, the index of the last tree is kept for the next lookups"""
+		last = HistoryTreeProcessor._last_index
+		if last is not None and last[0]() is tree:
+			return last[1]
+
+		index = HistoryTreeIndex()
+		# (node, its branch path), the path is built on the way down instead of walking up to the root from every node
+		stack = [(tree, '/'.join(HistoryTreeProcessor._get_parent_branch_path(tree)))]
+		while stack:
+			node, branch_path = stack.pop()
 			if node.highlight_index is not None:
-				hashed_node = HistoryTreeProcessor._hash_dom_element(node)
-				if hashed_node == hashed_dom_history_element:
-					return node
-			for child in node.children:
-				if isinstance(child, DOMElementNode):
-					result = process_node(child)
-					if result is not None:
-						return result
-			return None
+				key = (branch_path, HistoryTreeProcessor._attributes_string(node.attributes), node.xpath)
+				# the first element in document order wins, like the depth-first search did
+				if key not in index.elements:
+					index.elements[key] = node
+					index.by_xpath.setdefault(key[2], []).append(key)
+					index.by_attributes.setdefault(key[1], []).append(key)
+
+			stack.extend(
+				(child, f'{branch_path}/{child.tag_name}' if branch_path else child.tag_name)
+				for child in reversed(node.children)
+				if isinstance(child, DOMElementNode)
+			)
+
+		HistoryTreeProcessor._last_index = (weakref.ref(tree), index)
+		return index
+
+	@staticmethod
+	def _history_element_key(dom_history_element: DOMHistoryElement) -> tuple[str, str, str]:
+		return (
+			'/'.join(dom_history_element.entire_parent_branch_path),
+			HistoryTreeProcessor._attributes_string(dom_history_element.attributes),
+			dom_history_element.xpath,
+		)
 
-		return process_node(tree)
+	@staticmethod
+	def _match_score(
+		dom_history_element: DOMHistoryElement,
+		key: tuple[str, str, str],
+		candidate: tuple[str, str, str],
+		element: DOMElementNode,
+	) -> float:
+		"""
+		How well an element of the tree matches a history element it is not identical to: 1 for the same xpath, 1 for
+		the same attributes (or up to 0.5 for the share of attribute values that are the same), 0.5 for the same branch
+		path. Elements with another tag or no attribute value in common never match, e.g. a "Delete" button that took the
+		place of a "Cancel" button.
+		"""
+		if element.tag_name != dom_history_element.tag_name:
+			return 0.0
+
+		branch_path, attributes, xpath = candidate
+		score = 0.0
+		if xpath == key[2]:
+			score += 1.0
+		if attributes == key[1]:
+			score += 1.0
+		else:
+			history_attributes = set(dom_history_element.attributes.items())
+			element_attributes = set(element.attributes.items())
+			common = history_attributes & element_attributes
+			if not common:
+				return 0.0
+			score += 0.5 * len(common) / len(history_attributes | element_attributes)
+		if branch_path == key[0]:
+			score += 0.5
+		return score
 
 	@staticmethod
 	def compare_history_element_and_dom_element(dom_history_element: DOMHistoryElement, dom_element: DOMElementNode) -> bool:
@@ -90,9 +200,13 @@ class HistoryTreeProcessor:
 		parent_branch_path_string = '/'.join(parent_branch_path)
 		return hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
 
+	@staticmethod
+	def _attributes_string(attributes: dict[str, str]) -> str:
+		return ''.join(f'{key}={value}' for key, value in attributes.items())
+
 	@staticmethod
 	def _attributes_hash(attributes: dict[str, str]) -> str:
-		attributes_string = ''.join(f'{key}={value}' for key, value in attributes.items())
+		attributes_string = HistoryTreeProcessor._attributes_string(attributes)
 		return hashlib.sha256(attributes_string.encode()).hexdigest()
 
 	@staticmethod
@@ -1,23 +1,119 @@
+import asyncio
 import logging
 from dataclasses import dataclass
+from functools import cache
 from importlib import resources
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
-	from playwright.async_api import Page
-
+	from playwright.async_api import Frame, Page
+
+from browser_use.dom.snapshot_processor.service import (
+	COMPUTED_STYLES,
+	HIGHLIGHT_BOXES_JS,
+	VIEWPORT_JS,
+	SnapshotProcessor,
+	forget_cdp_session,
+	get_cdp_session,
+)
 from browser_use.dom.views import (
 	DOMBaseNode,
 	DOMElementNode,
 	DOMState,
 	DOMTextNode,
+	DOMTileState,
 	SelectorMap,
 )
+from browser_use.tracing import add_span_attributes, is_tracing_enabled
 from browser_use.utils import time_execution_async
 
 logger = logging.getLogger(__name__)
 
+# most common ad network and tracker frame domains, their iframes are never walked
+AD_DOMAINS = ('doubleclick.net', 'adroll.com', 'googletagmanager.com')
+
+# how long a cross-origin iframe may take to be walked before the page is returned without it
+CROSS_ORIGIN_FRAME_TIMEOUT = 3.0
+
+# labels the highlights queued in a cross-origin frame after the elements numbered before it and draws them
+RENDER_FRAME_HIGHLIGHTS_JS = """(offset) => {
+	const highlighter = window.__browserUseHighlighter;
+	if (highlighter) {
+		highlighter.setIndexOffset(offset);
+		highlighter.render();
+	}
+}"""
+
+
+def is_ad_url(url: str) -> bool:
+	return any(domain in urlparse(url).netloc for domain in AD_DOMAINS)
+
+
+def get_cross_origin_child_frames(frame: 'Frame') -> list['Frame']:
+	"""Child frames of a frame that its scripts cannot enter (another origin, usually out-of-process), except ad frames"""
+	netloc = urlparse(frame.url).netloc
+	return [
+		child
+		for child in frame.child_frames
+		if urlparse(child.url).netloc  # exclude data:urls and about:blank
+		and urlparse(child.url).netloc != netloc
+		and not is_ad_url(child.url)
+	]
+
+
+# instrumentation of buildDomTree.js that only the debug build keeps, see strip_debug_instrumentation()
+DEBUG_BLOCK_START = '// #if DEBUG'
+DEBUG_BLOCK_END = '// #endif'
+DEBUG_LINE_MARKER = '// #debug'
+
+
+def strip_debug_instrumentation(source: str) -> str:
+	"""Remove the `// #if DEBUG` ... `// #endif` blocks and the lines ending with `// #debug` from a script"""
+	lines = []
+	in_debug_block = False
+	for line in source.splitlines():
+		marker = line.strip()
+		if marker == DEBUG_BLOCK_START:
+			if in_debug_block:
+				raise ValueError(f'Nested "{DEBUG_BLOCK_START}" blocks are not supported')
+			in_debug_block = True
+		elif marker == DEBUG_BLOCK_END and in_debug_block:
+			in_debug_block = False
+		elif not in_debug_block and not line.rstrip().endswith(DEBUG_LINE_MARKER):
+			lines.append(line)
+	if in_debug_block:
+		raise ValueError(f'"{DEBUG_BLOCK_START}" block without "{DEBUG_BLOCK_END}"')
+	return '\n'.join(lines)
+
+
+@cache
+def load_build_dom_tree_js(debug: bool) -> str:
+	"""
+	buildDomTree.js wrapped to install the canvas highlighter first, in the same evaluate call. The production build
+	(debug=False) leaves out the timers and counters that would otherwise run for every node.
+	"""
+	dom_files = resources.files('browser_use.dom')
+	highlighter = dom_files.joinpath('highlighter.js').read_text()
+	build_dom_tree = dom_files.joinpath('buildDomTree.js').read_text()
+	if not debug:
+		build_dom_tree = strip_debug_instrumentation(build_dom_tree)
+	build_dom_tree = build_dom_tree.strip().removesuffix(';')
+	return f'(args) => {{ ({highlighter})(); return ({build_dom_tree})(args); }}'
+
+
+@cache
+def load_tile_query_js() -> str:
+	"""Serves a range of tiles from the index left by a tiled buildDomTree.js run, None if there is no valid index"""
+	highlighter = resources.files('browser_use.dom').joinpath('highlighter.js').read_text()
+	return f"""(args) => {{
+	const index = window.__browserUseDomIndex;
+	// the index is only valid while its highlight indexes are the ones of the published element map
+	if (!index || index.stale || window.__browserUseElementMap?.id !== index.id) return null;
+	if (args.doHighlightElements) ({highlighter})();
+	return index.query(args);
+}}"""
+
 
 @dataclass
 class ViewportInfo:
@@ -26,32 +122,103 @@ class ViewportInfo:
 
 
 class DomService:
-	def __init__(self, page: 'Page'):
+	def __init__(self, page: 'Page', backend: Literal['js', 'cdp'] = 'js'):
 		self.page = page
+		self.backend = backend
 		self.xpath_cache = {}
-
-		self.js_code = resources.files('browser_use.dom').joinpath('buildDomTree.js').read_text()
+		self.element_map_id: str | None = None
+		self.truncated = False
+		self.cross_origin_frames: list['Frame'] = []  # frames grafted into the last tree, see _graft_frames()
+		self._remaining_nodes: int | None = None  # what max_nodes leaves for the cross-origin frames still to be walked
 
 	# region - Clickable elements
-	@time_execution_async('--get_clickable_elements')
+	@time_execution_async('--get_clickable_elements', phase='dom_build')
 	async def get_clickable_elements(
 		self,
 		highlight_elements: bool = True,
 		focus_element: int = -1,
 		viewport_expansion: int = 0,
+		max_nodes: int | None = None,
 	) -> DOMState:
-		element_tree, selector_map = await self._build_dom_tree(highlight_elements, focus_element, viewport_expansion)
-		return DOMState(element_tree=element_tree, selector_map=selector_map)
+		if self.backend == 'cdp':
+			try:
+				element_tree, selector_map = await self._build_dom_tree_from_snapshot(
+					highlight_elements, focus_element, viewport_expansion, max_nodes
+				)
+				return DOMState(
+					element_tree=element_tree, selector_map=selector_map, element_map_id=None, truncated=self.truncated
+				)
+			except Exception as e:
+				# DOMSnapshot is only available on chromium based browsers, fall back to buildDomTree.js,
+				# BrowserSession sees the downgraded backend and keeps using buildDomTree.js for the next steps
+				logger.warning(
+					f'⚠️ Failed to build the DOM tree from a CDP snapshot, falling back to buildDomTree.js: {type(e).__name__}: {e}'
+				)
+				forget_cdp_session(self.page)
+				self.backend = 'js'
+
+		element_tree, selector_map = await self._build_dom_tree(highlight_elements, focus_element, viewport_expansion, max_nodes)
+		return DOMState(
+			element_tree=element_tree,
+			selector_map=selector_map,
+			element_map_id=self.element_map_id,
+			truncated=self.truncated,
+			cross_origin_frames=self.cross_origin_frames,
+		)
+
+	@time_execution_async('--get_tile_elements', phase='dom_build')
+	async def get_tile_elements(
+		self,
+		first_tile: int,
+		last_tile: int | None = None,
+		highlight_elements: bool = False,
+		max_nodes: int | None = None,
+	) -> DOMTileState:
+		"""
+		Elements of the viewport-sized tiles first_tile..last_tile (inclusive, 0 is the top of the page) of the whole page.
+
+		The first call walks the whole page once and leaves an index of every node's position in the page, later calls
+		for any range of tiles are served from that index without walking the page again, until the page is mutated or
+		resized (scrolling keeps it valid). Highlight indexes are the same across tiles. Always uses buildDomTree.js.
+		"""
+		last_tile = first_tile if last_tile is None else last_tile
+		if self.page.url == 'about:blank':
+			empty_tree = DOMElementNode(tag_name='body', xpath='', attributes={}, children=[], is_visible=False, parent=None)
+			return DOMTileState(element_tree=empty_tree, selector_map={}, first_tile=0, last_tile=0, tile_count=1)
+
+		args = {
+			'doHighlightElements': highlight_elements,
+			'focusHighlightIndex': -1,
+			'viewportExpansion': -1,
+			'debugMode': False,
+			'maxNodes': max_nodes or 0,
+			'tiles': {'first': first_tile, 'last': last_tile},
+		}
+		eval_page: dict | None = await self.page.evaluate(load_tile_query_js(), args)
+		if eval_page is None:
+			logger.debug('🧩 No valid tile index on the page, walking the whole page to build one')
+			eval_page = await self.page.evaluate(load_build_dom_tree_js(debug=False), args)
+		assert eval_page is not None
+
+		self.element_map_id = eval_page.get('elementMapId')
+		self.truncated = bool(eval_page.get('truncated'))
+		element_tree, selector_map = await self._construct_dom_tree(eval_page)
+		tiles = eval_page['tiles']
+		return DOMTileState(
+			element_tree=element_tree,
+			selector_map=selector_map,
+			element_map_id=self.element_map_id,
+			truncated=self.truncated,
+			first_tile=tiles['first'],
+			last_tile=tiles['last'],
+			tile_count=tiles['count'],
+		)
 
 	@time_execution_async('--get_cross_origin_iframes')
 	async def get_cross_origin_iframes(self) -> list[str]:
 		# invisible cross-origin iframes are used for ads and tracking, dont open those
 		hidden_frame_urls = await self.page.locator('iframe').filter(visible=False).evaluate_all('e => e.map(e => e.src)')
 
-		is_ad_url = lambda url: any(
-			domain in urlparse(url).netloc for domain in ('doubleclick.net', 'adroll.com', 'googletagmanager.com')
-		)
-
 		return [
 			frame.url
 			for frame in self.page.frames
@@ -67,7 +234,9 @@ class DomService:
 		highlight_elements: bool,
 		focus_element: int,
 		viewport_expansion: int,
+		max_nodes: int | None = None,
 	) -> tuple[DOMElementNode, SelectorMap]:
+		self.truncated = False
 		if await self.page.evaluate('1+1') != 2:
 			raise ValueError('The page cannot evaluate javascript code properly')
 
@@ -89,19 +258,39 @@ class DomService:
 		#       The returned hash map contains information about the DOM tree and the
 		#       relationship between the DOM elements.
 		debug_mode = logger.getEffectiveLevel() == logging.DEBUG
+		tracing = is_tracing_enabled()
 		args = {
 			'doHighlightElements': highlight_elements,
 			'focusHighlightIndex': focus_element,
 			'viewportExpansion': viewport_expansion,
-			'debugMode': debug_mode,
+			'debugMode': debug_mode or tracing,  # also collects the perfMetrics we attach to the trace
+			'maxNodes': max_nodes or 0,
 		}
 
+		layout_counts_before = await self._get_layout_counts() if args['debugMode'] else None
 		try:
-			eval_page: dict = await self.page.evaluate(self.js_code, args)
+			eval_page: dict = await self.page.evaluate(load_build_dom_tree_js(debug=args['debugMode']), args)
 		except Exception as e:
 			logger.error('Error evaluating JavaScript: %s', e)
 			raise
 
+		self.element_map_id = eval_page.get('elementMapId')
+		self.truncated = bool(eval_page.get('truncated'))
+		self.cross_origin_frames = []
+		if self.truncated:
+			logger.debug(f'✂️ DOM tree truncated after {max_nodes} nodes on {self.page.url}')
+
+		if layout_counts_before is not None and 'perfMetrics' in eval_page:
+			layout_counts_after = await self._get_layout_counts()
+			if layout_counts_after is not None:
+				# layouts the browser had to compute while buildDomTree.js ran, this should not grow with the page size
+				eval_page['perfMetrics']['layoutMetrics'] = {
+					key: layout_counts_after[key] - layout_counts_before[key] for key in layout_counts_after
+				}
+
+		if tracing and 'perfMetrics' in eval_page:
+			add_span_attributes(**self._flatten_perf_metrics(eval_page['perfMetrics']))
+
 		# Only log performance metrics in debug mode
 		if debug_mode and 'perfMetrics' in eval_page:
 			perf = eval_page['perfMetrics']
@@ -119,16 +308,219 @@ class DomService:
 
 			# Create concise summary
 			url_short = self.page.url[:50] + '...' if len(self.page.url) > 50 else self.page.url
+			layout_count = perf.get('layoutMetrics', {}).get('layoutCount')
 			logger.debug(
-				'🔎 Ran buildDOMTree.js interactive element detection on: %s interactive=%d/%d',
+				'🔎 Ran buildDOMTree.js interactive element detection on: %s interactive=%d/%d layouts=%s',
 				url_short,
 				interactive_count,
 				total_nodes,
 				# processed_nodes,
+				layout_count if layout_count is not None else '?',
 			)
 
+		if get_cross_origin_child_frames(self.page.main_frame):
+			# max_dom_nodes caps the nodes of the page and its frames together
+			self._remaining_nodes = max(0, max_nodes - len(eval_page['map'])) if max_nodes else None
+			await self._walk_cross_origin_frames(self.page.main_frame, eval_page, args)
+			if eval_page.get('frames'):
+				await self._graft_frames(eval_page, highlight_elements)
+
 		return await self._construct_dom_tree(eval_page)
 
+	async def _walk_cross_origin_frames(self, parent_frame: 'Frame', parent_result: dict, args: dict) -> None:
+		"""
+		Run buildDomTree.js in the cross-origin child frames of parent_frame that the walk of parent_frame could not enter,
+		all at the same time, and keep their results in parent_result['frames'] by the node id of their iframe. Only frames
+		whose iframe is visible to the LLM are walked, then the same for their own cross-origin frames.
+		"""
+		frames = get_cross_origin_child_frames(parent_frame)
+		if self._remaining_nodes is not None:
+			await self._walk_cross_origin_frames_with_budget(frames, parent_result, args)
+			return
+		results = await asyncio.gather(*(self._walk_frame(frame, parent_result, args) for frame in frames))
+		walked = {iframe_id: result for iframe_id, result in filter(None, results)}
+		if not walked:
+			return
+		parent_result['frames'] = walked
+		await asyncio.gather(
+			*(
+				self._walk_cross_origin_frames(result['frame'], result, args)
+				for result in walked.values()
+				if get_cross_origin_child_frames(result['frame'])
+			)
+		)
+
+	async def _walk_cross_origin_frames_with_budget(self, frames: list['Frame'], parent_result: dict, args: dict) -> None:
+		"""
+		Like _walk_cross_origin_frames(), one frame at a time in document order: each frame, and then its own frames, get
+		the node budget the page and the frames before them left over. The frames that don't fit are left out.
+		"""
+		assert self._remaining_nodes is not None
+		walked = {}
+		for frame in frames:
+			if self._remaining_nodes <= 0:
+				self.truncated = True
+				break
+			walked_frame = await self._walk_frame(frame, parent_result, args | {'maxNodes': self._remaining_nodes})
+			if walked_frame is None:
+				continue
+			iframe_id, result = walked_frame
+			walked[iframe_id] = result
+			self._remaining_nodes -= len(result['map'])
+			if get_cross_origin_child_frames(result['frame']):
+				await self._walk_cross_origin_frames(result['frame'], result, args)
+		if walked:
+			parent_result['frames'] = walked
+
+	async def _walk_frame(self, frame: 'Frame', parent_result: dict, args: dict) -> tuple[str, dict] | None:
+		async def walk() -> tuple[str, dict] | None:
+			iframe = await frame.frame_element()
+			marker = await iframe.evaluate('(iframe) => iframe.__browserUseFrameNode ?? null')
+			if not marker or marker['mapId'] != parent_result.get('elementMapId'):
+				return None
+			iframe_data = parent_result['map'].get(marker['id'])
+			if not iframe_data or not iframe_data.get('isVisible'):
+				return None
+			if args['viewportExpansion'] != -1 and not iframe_data.get('isTopElement'):
+				return None  # outside of the (expanded) viewport or covered
+			# the labels of the highlights are only known once all frames are numbered, see _graft_frames(), and a focused
+			# element is numbered in the page, so frames are only highlighted without one
+			frame_args = args | {
+				'renderHighlights': False,
+				'doHighlightElements': args['doHighlightElements'] and args['focusHighlightIndex'] < 0,
+				'focusHighlightIndex': -1,
+			}
+			result = await frame.evaluate(load_build_dom_tree_js(debug=args['debugMode']), frame_args)
+			result['frame'] = frame
+			return marker['id'], result
+
+		try:
+			return await asyncio.wait_for(walk(), timeout=CROSS_ORIGIN_FRAME_TIMEOUT)
+		except Exception as e:
+			logger.debug(f'Skipping cross-origin iframe {frame.url}: {type(e).__name__}: {e}')
+			return None
+
+	async def _graft_frames(self, eval_page: dict, highlight_elements: bool) -> None:
+		"""
+		Merge the trees of the cross-origin frames into eval_page['map'] under their iframe nodes. The elements of the
+		page keep their highlight indexes, the elements of the frames are numbered after them, frame by frame.
+		"""
+		next_index = 1 + max(
+			(node['highlightIndex'] for node in eval_page['map'].values() if node.get('highlightIndex') is not None),
+			default=-1,
+		)
+		offsets: list[tuple['Frame', int]] = []
+		self._graft_frame_maps(eval_page, next_index, offsets)
+		self.cross_origin_frames = [frame for frame, _ in offsets]
+
+		if highlight_elements:
+			await asyncio.gather(
+				*(frame.evaluate(RENDER_FRAME_HIGHLIGHTS_JS, offset) for frame, offset in offsets), return_exceptions=True
+			)
+
+	def _graft_frame_maps(self, result: dict, next_index: int, offsets: list[tuple['Frame', int]]) -> int:
+		frames = result.pop('frames', None)
+		if not frames:
+			return next_index
+
+		merged = {}
+		for node_id, node_data in result['map'].items():
+			frame_result = frames.get(node_id)
+			if frame_result is not None:
+				# number the frame's own elements first, then the frames inside it
+				own_elements = [node for node in frame_result['map'].values() if node.get('highlightIndex') is not None]
+				for node in own_elements:
+					node['highlightIndex'] += next_index
+				offsets.append((frame_result['frame'], next_index))
+				next_index = self._graft_frame_maps(frame_result, next_index + len(own_elements), offsets)
+				self.truncated = self.truncated or bool(frame_result.get('truncated'))
+
+				# node ids are only unique within a frame, and children have to come before their parents
+				prefix = f'{node_id}/'
+				for frame_node_id, frame_node in frame_result['map'].items():
+					if 'children' in frame_node:
+						frame_node['children'] = [prefix + child_id for child_id in frame_node['children']]
+					merged[prefix + frame_node_id] = frame_node
+				node_data['children'] = [*node_data.get('children', []), prefix + str(frame_result['rootId'])]
+			merged[node_id] = node_data
+		result['map'] = merged
+		return next_index
+
+	@time_execution_async('--build_dom_tree_from_snapshot')
+	async def _build_dom_tree_from_snapshot(
+		self,
+		highlight_elements: bool,
+		focus_element: int,
+		viewport_expansion: int,
+		max_nodes: int | None = None,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		"""
+		Build the same tree as buildDomTree.js from one DOMSnapshot.captureSnapshot and one Accessibility.getFullAXTree
+		call, so the layout, styles and paint order of every node come from the browser in a single round trip.
+		"""
+		self.element_map_id = None
+		self.truncated = False
+		if self.page.url == 'about:blank':
+			return (
+				DOMElementNode(tag_name='body', xpath='', attributes={}, children=[], is_visible=False, parent=None),
+				{},
+			)
+
+		cdp_session = await get_cdp_session(self.page)
+		snapshot, ax_tree, viewport = await asyncio.gather(
+			cdp_session.send(
+				'DOMSnapshot.captureSnapshot',
+				{'computedStyles': COMPUTED_STYLES, 'includePaintOrder': True, 'includeDOMRects': False},
+			),
+			cdp_session.send('Accessibility.getFullAXTree'),
+			cdp_session.send('Runtime.evaluate', {'expression': VIEWPORT_JS, 'returnByValue': True}),
+		)
+
+		processor = SnapshotProcessor(
+			snapshot,
+			ax_tree.get('nodes', []),
+			viewport['result']['value'],
+			viewport_expansion=viewport_expansion,
+			focus_element=focus_element,
+			max_nodes=max_nodes,
+		)
+		element_tree, selector_map = processor.construct_dom_tree()
+		self.truncated = processor.truncated
+
+		if highlight_elements and processor.highlight_boxes:
+			await self.page.evaluate(HIGHLIGHT_BOXES_JS, processor.highlight_boxes)
+
+		return element_tree, selector_map
+
+	async def _get_layout_counts(self) -> dict[str, float] | None:
+		"""
+		Layouts and style recalculations done by the page so far, from the CDP Performance domain. The counters only
+		run while the domain is enabled, so the first call starts them. Returns None on browsers without CDP.
+		"""
+		try:
+			cdp_session = await get_cdp_session(self.page)
+			await cdp_session.send('Performance.enable')
+			response = await cdp_session.send('Performance.getMetrics')
+		except Exception as e:
+			logger.debug(f'Could not read the layout counters: {type(e).__name__}: {e}')
+			return None
+		metrics = {metric['name']: metric['value'] for metric in response['metrics']}
+		return {'layoutCount': metrics.get('LayoutCount', 0), 'recalcStyleCount': metrics.get('RecalcStyleCount', 0)}
+
+	@staticmethod
+	def _flatten_perf_metrics(perf: dict) -> dict[str, float]:
+		"""Flatten the numeric perfMetrics collected by buildDomTree.js into span attributes like js.timings.buildDomTree"""
+		attributes = {}
+		for group, values in perf.items():
+			if not isinstance(values, dict):
+				continue
+			for key, value in values.items():
+				if isinstance(value, (int, float)):
+					attributes[f'js.{group}.{key}'] = value
+				elif isinstance(value, dict):
+					attributes.update({f'js.{group}.{key}.{k}': v for k, v in value.items() if isinstance(v, (int, float))})
+		return attributes
+
 	@time_execution_async('--construct_dom_tree')
 	async def _construct_dom_tree(
 		self,
@@ -0,0 +1,505 @@
+"""
+Builds the DOM tree from a native CDP snapshot instead of walking the page with buildDomTree.js.
+
+DOMSnapshot.captureSnapshot returns every node of the page and its same-origin iframes in flat arrays, together with
+the layout boxes, computed styles, paint order and click listeners that buildDomTree.js has to query element by element.
+Accessibility.getFullAXTree adds the computed ARIA roles and disabled states. SnapshotProcessor maps both onto the same
+DOMElementNode tree and selector map, following the rules of buildDomTree.js so the agent sees the same elements.
+"""
+
+import logging
+from dataclasses import dataclass
+from importlib import resources
+from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
+
+from browser_use.dom.views import DOMBaseNode, DOMElementNode, DOMTextNode, SelectorMap
+
+if TYPE_CHECKING:
+	from playwright.async_api import CDPSession, Page
+
+logger = logging.getLogger(__name__)
+
+# computed styles requested from DOMSnapshot.captureSnapshot, in the order they are returned for each layout node
+COMPUTED_STYLES = ['display', 'visibility', 'cursor', 'pointer-events', 'position']
+
+# same rules as isElementAccepted, isInteractiveElement and isElementDistinctInteraction in buildDomTree.js
+SKIPPED_TAGS = frozenset({'svg', 'script', 'style', 'link', 'meta', 'noscript', 'template', 'head'})
+INTERACTIVE_CURSORS = frozenset(
+	{
+		'pointer', 'move', 'text', 'grab', 'grabbing', 'cell', 'copy', 'alias', 'all-scroll', 'col-resize', 'context-menu',
+		'crosshair', 'e-resize', 'ew-resize', 'help', 'n-resize', 'ne-resize', 'nesw-resize', 'ns-resize', 'nw-resize',
+		'nwse-resize', 'row-resize', 's-resize', 'se-resize', 'sw-resize', 'vertical-text', 'w-resize', 'zoom-in', 'zoom-out',
+	}
+)  # fmt: skip
+NON_INTERACTIVE_CURSORS = frozenset({'not-allowed', 'no-drop', 'wait', 'progress', 'initial', 'inherit'})
+INTERACTIVE_TAGS = frozenset(
+	{'a', 'button', 'input', 'select', 'textarea', 'details', 'summary', 'label', 'option', 'optgroup', 'fieldset', 'legend'}
+)
+INTERACTIVE_ROLES = frozenset(
+	{
+		'button', 'menuitemradio', 'menuitemcheckbox', 'radio', 'checkbox', 'tab', 'switch', 'slider', 'spinbutton',
+		'combobox', 'searchbox', 'textbox', 'option', 'scrollbar',
+	}
+)  # fmt: skip
+DISTINCT_INTERACTIVE_TAGS = frozenset({'a', 'button', 'input', 'select', 'textarea', 'summary', 'details', 'label', 'option'})
+DISTINCT_INTERACTIVE_ROLES = INTERACTIVE_ROLES | {'link', 'menuitem', 'listbox'}
+EVENT_HANDLER_ATTRIBUTES = ('onclick', 'onmousedown', 'onmouseup', 'ondblclick')
+DISTINCT_EVENT_HANDLER_ATTRIBUTES = (
+	'onclick', 'onmousedown', 'onmouseup', 'onkeydown', 'onkeyup', 'onsubmit', 'onchange', 'oninput', 'onfocus', 'onblur',
+)  # fmt: skip
+TEST_ID_ATTRIBUTES = ('data-testid', 'data-cy', 'data-test')
+HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container'
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+
+# size of the cells of the grid used to find the layout boxes painted over a point
+HIT_TEST_CELL_SIZE = 128
+
+VIEWPORT_JS = '({width: window.innerWidth, height: window.innerHeight, devicePixelRatio: window.devicePixelRatio})'
+
+# Draws the highlight boxes computed from the snapshot with the same canvas highlighter as buildDomTree.js, so
+# remove_highlights() clears both.
+HIGHLIGHT_BOXES_JS = f"""(boxes) => {{
+	const highlighter = ({resources.files('browser_use.dom').joinpath('highlighter.js').read_text()})();
+	highlighter.reset();
+	highlighter.addBoxes(boxes);
+	highlighter.render();
+}}"""
+
+_cdp_sessions: 'WeakKeyDictionary[Page, CDPSession]' = WeakKeyDictionary()
+
+
+@dataclass(slots=True)
+class LayoutBox:
+	"""Border box of a node in CSS pixels relative to the top level viewport"""
+
+	x: float
+	y: float
+	width: float
+	height: float
+	styles: dict[str, str]
+	paint_order: int
+
+	def contains(self, x: float, y: float) -> bool:
+		return self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
+
+
+@dataclass(slots=True)
+class AXState:
+	role: str | None
+	disabled: bool
+
+
+class SnapshotDocument:
+	"""Index over one document of a DOMSnapshot.captureSnapshot result"""
+
+	def __init__(self, document: dict[str, Any], strings: list[str], offset_x: float, offset_y: float, scale: float):
+		nodes = document['nodes']
+		self.strings = strings
+		self.parent_index: list[int] = nodes['parentIndex']
+		self.node_type: list[int] = nodes['nodeType']
+		lowercase_names = {name: strings[name].lower() for name in set(nodes['nodeName'])}
+		self.tag_names: list[str] = [lowercase_names[name] for name in nodes['nodeName']]
+		self.node_value: list[int] = nodes['nodeValue']
+		self.backend_node_id: list[int] = nodes['backendNodeId']
+		self.raw_attributes: list[list[int]] = nodes['attributes']
+		self.clickable = set(nodes.get('isClickable', {}).get('index', []))
+		self.pseudo_elements = set(nodes.get('pseudoType', {}).get('index', []))
+		self.shadow_roots = set(nodes.get('shadowRootType', {}).get('index', []))
+		content_documents = nodes.get('contentDocumentIndex', {})
+		self.content_document = dict(zip(content_documents.get('index', []), content_documents.get('value', [])))
+
+		self._xpaths: dict[int, str] = {}
+		self._positions: dict[int, dict[int, int]] = {}
+
+		self.children: list[list[int]] = [[] for _ in self.parent_index]
+		for index, parent in enumerate(self.parent_index):
+			if parent >= 0:
+				self.children[parent].append(index)
+
+		# nodes are listed in pre-order, so a subtree is the contiguous range [index, subtree_end[index]]
+		self.subtree_end = list(range(len(self.parent_index)))
+		for index in range(len(self.parent_index) - 1, 0, -1):
+			parent = self.parent_index[index]
+			if parent >= 0 and self.subtree_end[index] > self.subtree_end[parent]:
+				self.subtree_end[parent] = self.subtree_end[index]
+
+		# bounds and scroll offsets are in device pixels of the document, convert them to CSS pixels of the top viewport
+		scroll_x = document.get('scrollOffsetX', 0) / scale
+		scroll_y = document.get('scrollOffsetY', 0) / scale
+		layout = document['layout']
+		paint_orders = layout.get('paintOrders') or [0] * len(layout['nodeIndex'])
+		self.layout: dict[int, LayoutBox] = {}
+		for node_index, bounds, styles, paint_order in zip(layout['nodeIndex'], layout['bounds'], layout['styles'], paint_orders):
+			if node_index in self.layout:
+				continue  # text nodes get one entry per line box, the first is enough to tell that they are rendered
+			x, y, width, height = bounds
+			self.layout[node_index] = LayoutBox(
+				x=offset_x + x / scale - scroll_x,
+				y=offset_y + y / scale - scroll_y,
+				width=width / scale,
+				height=height / scale,
+				styles={name: strings[value] for name, value in zip(COMPUTED_STYLES, styles) if value >= 0},
+				paint_order=paint_order,
+			)
+
+	def string(self, index: int) -> str:
+		return self.strings[index] if index >= 0 else ''
+
+	def tag_name(self, index: int) -> str:
+		return self.tag_names[index]
+
+	def attributes(self, index: int) -> dict[str, str]:
+		raw = self.raw_attributes[index]
+		return {self.strings[raw[i]]: self.strings[raw[i + 1]] for i in range(0, len(raw) - 1, 2)}
+
+	def is_descendant(self, node: int, ancestor: int) -> bool:
+		return ancestor < node <= self.subtree_end[ancestor]
+
+	def xpath(self, index: int) -> str:
+		"""Same xpath as getXPathTree in buildDomTree.js, relative to the closest shadow root or document"""
+		if (xpath := self._xpaths.get(index)) is not None:
+			return xpath
+		tag_name = self.tag_name(index)
+		parent = self.parent_index[index]
+		position = 0
+		if parent >= 0 and self.node_type[parent] == ELEMENT_NODE:
+			position = self._sibling_positions(parent).get(index, 0)
+		segment = f'{tag_name}[{position}]' if position else tag_name
+		if parent >= 0 and self.node_type[parent] == ELEMENT_NODE:
+			segment = f'{self.xpath(parent)}/{segment}'
+		self._xpaths[index] = segment
+		return segment
+
+	def _sibling_positions(self, parent: int) -> dict[int, int]:
+		"""1-based position of each element child among the children with the same tag, for tags that occur more than once"""
+		if (positions := self._positions.get(parent)) is not None:
+			return positions
+		by_tag: dict[str, list[int]] = {}
+		for child in self.children[parent]:
+			if self.node_type[child] == ELEMENT_NODE and child not in self.pseudo_elements:
+				by_tag.setdefault(self.tag_name(child), []).append(child)
+		positions = {child: i + 1 for siblings in by_tag.values() if len(siblings) > 1 for i, child in enumerate(siblings)}
+		self._positions[parent] = positions
+		return positions
+
+
+class SnapshotProcessor:
+	"""Maps a DOMSnapshot and the accessibility tree onto the DOMElementNode tree built by buildDomTree.js"""
+
+	def __init__(
+		self,
+		snapshot: dict[str, Any],
+		ax_nodes: list[dict[str, Any]],
+		viewport: dict[str, float],
+		viewport_expansion: int = 0,
+		focus_element: int = -1,
+		max_nodes: int | None = None,
+	):
+		self.snapshot = snapshot
+		self.viewport_width = viewport['width']
+		self.viewport_height = viewport['height']
+		self.scale = viewport.get('devicePixelRatio') or 1
+		self.viewport_expansion = viewport_expansion
+		self.focus_element = focus_element
+		self.max_nodes = max_nodes
+		self.node_count = 0
+		self.truncated = False
+		self.ax_states = self._index_ax_nodes(ax_nodes)
+
+		self.highlight_index = 0
+		self.selector_map: SelectorMap = {}
+		self.highlight_boxes: list[dict[str, float]] = []
+		self._hit_test_grid: dict[tuple[int, int], list[tuple[int, int, LayoutBox]]] | None = None
+
+	@staticmethod
+	def _index_ax_nodes(ax_nodes: list[dict[str, Any]]) -> dict[int, AXState]:
+		states = {}
+		for ax_node in ax_nodes:
+			if ax_node.get('ignored') or 'backendDOMNodeId' not in ax_node:
+				continue
+			properties = {prop['name']: prop.get('value', {}).get('value') for prop in ax_node.get('properties', [])}
+			states[ax_node['backendDOMNodeId']] = AXState(
+				role=ax_node.get('role', {}).get('value'), disabled=properties.get('disabled') is True
+			)
+		return states
+
+	def construct_dom_tree(self) -> tuple[DOMElementNode, SelectorMap]:
+		strings = self.snapshot['strings']
+		self.main_document = SnapshotDocument(self.snapshot['documents'][0], strings, 0, 0, self.scale)
+
+		body = next((i for i, tag_name in enumerate(self.main_document.tag_names) if tag_name == 'body'), None)
+		root = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=False, parent=None)
+		if body is not None:
+			for child in self.main_document.children[body]:
+				self._append(root, self._build_node(self.main_document, child, in_iframe=False, parent_highlighted=False))
+		return root, self.selector_map
+
+	def _take_node_budget(self) -> bool:
+		"""Count one more node against max_nodes, False once the cap is reached (like takeNodeBudget in buildDomTree.js)"""
+		if self.max_nodes and self.node_count >= self.max_nodes:
+			self.truncated = True
+			return False
+		self.node_count += 1
+		return True
+
+	@staticmethod
+	def _append(parent: DOMElementNode, child: DOMBaseNode | None) -> None:
+		if child is not None:
+			child.parent = parent
+			parent.children.append(child)
+
+	def _build_node(self, doc: SnapshotDocument, index: int, in_iframe: bool, parent_highlighted: bool) -> DOMBaseNode | None:
+		node_type = doc.node_type[index]
+		if node_type == TEXT_NODE:
+			return self._build_text_node(doc, index)
+		if node_type != ELEMENT_NODE or index in doc.pseudo_elements:
+			return None
+
+		tag_name = doc.tag_name(index)
+		if tag_name in SKIPPED_TAGS:
+			return None
+		attributes = doc.attributes(index)
+		if attributes.get('id') == HIGHLIGHT_CONTAINER_ID:
+			return None
+
+		box = doc.layout.get(index)
+		if (
+			self.viewport_expansion != -1
+			and box is not None
+			and box.styles.get('position') not in ('fixed', 'sticky')
+			and not (box.width > 0 or box.height > 0)
+			and not self._in_expanded_viewport(box)
+		):
+			return None
+		if not self._take_node_budget():
+			return None
+
+		element = DOMElementNode(
+			tag_name=tag_name,
+			xpath=doc.xpath(index),
+			attributes=attributes,
+			children=[],
+			is_visible=self._is_visible(box),
+			parent=None,
+		)
+
+		highlighted = False
+		if element.is_visible and box is not None:
+			element.is_top_element = self._is_top_element(doc, index, box, in_iframe)
+			if element.is_top_element:
+				ax_state = self.ax_states.get(doc.backend_node_id[index])
+				element.is_interactive = self._is_interactive(tag_name, attributes, box, index in doc.clickable, ax_state)
+				highlighted = self._handle_highlighting(element, box, parent_highlighted, index in doc.clickable)
+
+		if tag_name == 'iframe' and index in doc.content_document:
+			if box is not None:
+				content_document = SnapshotDocument(
+					self.snapshot['documents'][doc.content_document[index]], doc.strings, box.x, box.y, self.scale
+				)
+				for child in content_document.children[0]:
+					self._append(element, self._build_node(content_document, child, in_iframe=True, parent_highlighted=False))
+		else:
+			children_highlighted = highlighted or parent_highlighted
+			for child in doc.children[index]:
+				if child in doc.shadow_roots:
+					element.shadow_root = True
+					for shadow_child in doc.children[child]:
+						self._append(element, self._build_node(doc, shadow_child, in_iframe, children_highlighted))
+			for child in doc.children[index]:
+				if child not in doc.shadow_roots:
+					self._append(element, self._build_node(doc, child, in_iframe, children_highlighted))
+
+		if tag_name == 'a' and not element.children and not attributes.get('href'):
+			return None
+		return element
+
+	def _build_text_node(self, doc: SnapshotDocument, index: int) -> DOMTextNode | None:
+		text = doc.string(doc.node_value[index]).strip()
+		parent = doc.parent_index[index]
+		if not text or parent < 0 or doc.node_type[parent] != ELEMENT_NODE or doc.tag_name(parent) == 'script':
+			return None
+		if not self._take_node_budget():
+			return None
+		box = doc.layout.get(index)
+		parent_box = doc.layout.get(parent)
+		is_visible = (
+			box is not None
+			and box.width > 0
+			and box.height > 0
+			and parent_box is not None
+			and parent_box.styles.get('visibility') != 'hidden'
+			and (self.viewport_expansion == -1 or self._in_expanded_viewport(box))
+		)
+		return DOMTextNode(text=text, is_visible=is_visible, parent=None)
+
+	@staticmethod
+	def _is_visible(box: LayoutBox | None) -> bool:
+		return (
+			box is not None
+			and box.width > 0
+			and box.height > 0
+			and box.styles.get('visibility') != 'hidden'
+			and box.styles.get('display') != 'none'
+		)
+
+	def _in_expanded_viewport(self, box: LayoutBox) -> bool:
+		expansion = self.viewport_expansion
+		return not (
+			box.y + box.height < -expansion
+			or box.y > self.viewport_height + expansion
+			or box.x + box.width < -expansion
+			or box.x > self.viewport_width + expansion
+		)
+
+	def _is_top_element(self, doc: SnapshotDocument, index: int, box: LayoutBox, in_iframe: bool) -> bool:
+		"""
+		Like isTopElement in buildDomTree.js: the element must be painted on top at its center. Instead of one
+		elementFromPoint call per element, the hit test runs on the layout boxes and paint order from the snapshot.
+		"""
+		if self.viewport_expansion == -1:
+			return True
+		if not self._in_expanded_viewport(box):
+			return False
+		if in_iframe:
+			return True
+
+		center_x = box.x + box.width / 2
+		center_y = box.y + box.height / 2
+		# elementFromPoint only hits elements inside the viewport
+		if not (0 <= center_x < self.viewport_width and 0 <= center_y < self.viewport_height):
+			return False
+
+		cell = (int(center_x // HIT_TEST_CELL_SIZE), int(center_y // HIT_TEST_CELL_SIZE))
+		for paint_order, other, other_box in self._get_hit_test_grid().get(cell, ()):
+			if paint_order <= box.paint_order:
+				break
+			if (
+				other != index
+				and other_box.contains(center_x, center_y)
+				and not doc.is_descendant(other, index)
+				and not doc.is_descendant(index, other)
+			):
+				return False
+		return True
+
+	def _get_hit_test_grid(self) -> dict[tuple[int, int], list[tuple[int, int, LayoutBox]]]:
+		"""Layout boxes of the main document that can be hit by a click, per grid cell, topmost first"""
+		if self._hit_test_grid is not None:
+			return self._hit_test_grid
+
+		doc = self.main_document
+		grid: dict[tuple[int, int], list[tuple[int, int, LayoutBox]]] = {}
+		columns = int(self.viewport_width // HIT_TEST_CELL_SIZE)
+		rows = int(self.viewport_height // HIT_TEST_CELL_SIZE)
+		for index, box in doc.layout.items():
+			if (
+				doc.node_type[index] != ELEMENT_NODE
+				or not self._is_visible(box)
+				or box.styles.get('pointer-events') == 'none'
+				or box.x > self.viewport_width
+				or box.y > self.viewport_height
+				or box.x + box.width < 0
+				or box.y + box.height < 0
+			):
+				continue
+			first_column = max(0, int(box.x // HIT_TEST_CELL_SIZE))
+			last_column = min(columns, int((box.x + box.width) // HIT_TEST_CELL_SIZE))
+			first_row = max(0, int(box.y // HIT_TEST_CELL_SIZE))
+			last_row = min(rows, int((box.y + box.height) // HIT_TEST_CELL_SIZE))
+			for column in range(first_column, last_column + 1):
+				for row in range(first_row, last_row + 1):
+					grid.setdefault((column, row), []).append((box.paint_order, index, box))
+
+		for entries in grid.values():
+			entries.sort(key=lambda entry: entry[0], reverse=True)
+		self._hit_test_grid = grid
+		return grid
+
+	@staticmethod
+	def _is_interactive(
+		tag_name: str, attributes: dict[str, str], box: LayoutBox, has_click_listener: bool, ax_state: AXState | None
+	) -> bool:
+		cursor = box.styles.get('cursor')
+		if tag_name != 'html' and cursor in INTERACTIVE_CURSORS:
+			return True
+
+		if tag_name in INTERACTIVE_TAGS:
+			return not (
+				cursor in NON_INTERACTIVE_CURSORS
+				or 'disabled' in attributes
+				or 'readonly' in attributes
+				or 'inert' in attributes
+				or (ax_state is not None and ax_state.disabled)
+			)
+
+		if attributes.get('contenteditable') in ('', 'true', 'plaintext-only'):
+			return True
+
+		classes = attributes.get('class', '').split()
+		if (
+			'button' in classes
+			or 'dropdown-toggle' in classes
+			or attributes.get('data-index')
+			or attributes.get('data-toggle') == 'dropdown'
+			or attributes.get('aria-haspopup') == 'true'
+		):
+			return True
+
+		if attributes.get('role') in INTERACTIVE_ROLES or attributes.get('aria-role') in INTERACTIVE_ROLES:
+			return True
+
+		# the accessibility tree also knows the implicit roles, e.g. of elements inside editable regions
+		if ax_state is not None and ax_state.role in INTERACTIVE_ROLES and not ax_state.disabled:
+			return True
+
+		# the snapshot marks nodes with click listeners, which buildDomTree.js can only see with devtools open
+		return has_click_listener or any(name in attributes for name in EVENT_HANDLER_ATTRIBUTES)
+
+	@staticmethod
+	def _is_distinct_interaction(tag_name: str, attributes: dict[str, str], has_click_listener: bool) -> bool:
+		return (
+			tag_name == 'iframe'
+			or tag_name in DISTINCT_INTERACTIVE_TAGS
+			or attributes.get('role') in DISTINCT_INTERACTIVE_ROLES
+			or attributes.get('contenteditable') in ('', 'true', 'plaintext-only')
+			or any(name in attributes for name in TEST_ID_ATTRIBUTES)
+			or any(name in attributes for name in DISTINCT_EVENT_HANDLER_ATTRIBUTES)
+			or has_click_listener
+		)
+
+	def _handle_highlighting(
+		self, element: DOMElementNode, box: LayoutBox, parent_highlighted: bool, has_click_listener: bool
+	) -> bool:
+		if not element.is_interactive:
+			return False
+		if parent_highlighted and not self._is_distinct_interaction(element.tag_name, element.attributes, has_click_listener):
+			return False
+
+		element.is_in_viewport = self.viewport_expansion == -1 or self._in_expanded_viewport(box)
+		if not element.is_in_viewport:
+			return False
+
+		element.highlight_index = self.highlight_index
+		self.selector_map[self.highlight_index] = element
+		if self.focus_element in (-1, self.highlight_index):
+			self.highlight_boxes.append(
+				{'index': self.highlight_index, 'x': box.x, 'y': box.y, 'width': box.width, 'height': box.height}
+			)
+		self.highlight_index += 1
+		return True
+
+
+async def get_cdp_session(page: 'Page') -> 'CDPSession':
+	"""CDP session of the page, kept for the page's lifetime so every snapshot does not pay for attaching a new one"""
+	cdp_session = _cdp_sessions.get(page)
+	if cdp_session is None:
+		cdp_session = await page.context.new_cdp_session(page)
+		_cdp_sessions[page] = cdp_session
+	return cdp_session
+
+
+def forget_cdp_session(page: 'Page') -> None:
+	_cdp_sessions.pop(page, None)
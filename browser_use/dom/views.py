@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import TYPE_CHECKING, Optional
 
@@ -7,6 +7,8 @@ from browser_use.utils import time_execution_sync
 
 # Avoid circular import issues
 if TYPE_CHECKING:
+	from playwright.async_api import Frame
+
 	from .views import DOMElementNode
 
 
@@ -241,3 +243,18 @@ SelectorMap = dict[int, DOMElementNode]
 class DOMState:
 	element_tree: DOMElementNode
 	selector_map: SelectorMap
+	# id of the in-page highlight index -> element map published by buildDomTree.js for this snapshot
+	element_map_id: str | None = field(default=None, kw_only=True)
+	# the page had more nodes than the max_nodes cap, the ones after it in document order are left out
+	truncated: bool = field(default=False, kw_only=True)
+	# cross-origin iframes that were walked in their own frame and grafted into the tree
+	cross_origin_frames: list['Frame'] = field(default_factory=list, kw_only=True, repr=False)
+
+
+@dataclass
+class DOMTileState(DOMState):
+	"""The elements of a range of viewport-sized tiles of the page, see DomService.get_tile_elements()"""
+
+	first_tile: int = field(kw_only=True)
+	last_tile: int = field(kw_only=True)
+	tile_count: int = field(kw_only=True)
@@ -1,9 +1,12 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+from collections.abc import Callable, Hashable
 from pathlib import Path
 
 from dotenv import load_dotenv
-from posthog import Posthog
 from uuid_extensions import uuid7str
 
 from browser_use.telemetry.views import BaseTelemetryEvent
@@ -19,6 +22,13 @@ POSTHOG_EVENT_SETTINGS = {
 	'process_person_profile': True,
 }
 
+TELEMETRY_QUEUE_MAX_SIZE = 1000  # events beyond this are dropped rather than blocking the caller
+TELEMETRY_BATCH_SIZE = 50
+TELEMETRY_FLUSH_TIMEOUT = 5.0  # seconds
+
+# events can be passed as zero-argument factories, so their payload is built on the background thread
+TelemetryEventOrFactory = BaseTelemetryEvent | Callable[[], BaseTelemetryEvent]
+
 
 def xdg_cache_home() -> Path:
 	default = Path.home() / '.cache'
@@ -28,6 +38,88 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+class TelemetryEventQueue:
+	"""
+	Bounded, lossy in-process queue of telemetry events, sent in batches by a background daemon thread.
+
+	put() never blocks: when the queue is full the event is dropped. Event factories are only called
+	on the background thread, so building the payload never runs on the caller's thread.
+	"""
+
+	def __init__(
+		self,
+		send_batch: Callable[[list[BaseTelemetryEvent]], None],
+		max_size: int = TELEMETRY_QUEUE_MAX_SIZE,
+		batch_size: int = TELEMETRY_BATCH_SIZE,
+	) -> None:
+		self._send_batch = send_batch
+		self._batch_size = batch_size
+		self._queue: queue.Queue[TelemetryEventOrFactory | threading.Event] = queue.Queue(maxsize=max_size)
+		self._thread: threading.Thread | None = None
+		self._thread_lock = threading.Lock()
+		self.dropped_events = 0
+
+	def put(self, event: TelemetryEventOrFactory) -> bool:
+		"""Queue an event for sending, returns False if it was dropped because the queue is full"""
+		self._ensure_thread()
+		try:
+			self._queue.put_nowait(event)
+			return True
+		except queue.Full:
+			self.dropped_events += 1
+			return False
+
+	def flush(self, timeout: float = TELEMETRY_FLUSH_TIMEOUT) -> bool:
+		"""Block until all events queued so far have been handed to send_batch, returns False on timeout"""
+		if self._thread is None:
+			return True
+		flushed = threading.Event()
+		try:
+			self._queue.put(flushed, timeout=timeout)
+		except queue.Full:
+			return False
+		return flushed.wait(timeout)
+
+	def _ensure_thread(self) -> None:
+		if self._thread is not None:
+			return
+		with self._thread_lock:
+			if self._thread is None:
+				self._thread = threading.Thread(target=self._run, name='browser_use_telemetry', daemon=True)
+				self._thread.start()
+
+	def _run(self) -> None:
+		while True:
+			# wait for the next event, then take whatever else is already queued as part of the same batch
+			items = [self._queue.get()]
+			while len(items) < self._batch_size:
+				try:
+					items.append(self._queue.get_nowait())
+				except queue.Empty:
+					break
+
+			batch: list[BaseTelemetryEvent] = []
+			flush_requests: list[threading.Event] = []
+			for item in items:
+				if isinstance(item, threading.Event):
+					flush_requests.append(item)
+				elif isinstance(item, BaseTelemetryEvent):
+					batch.append(item)
+				else:
+					try:
+						batch.append(item())
+					except Exception as e:
+						logger.debug(f'Failed to build telemetry event: {type(e).__name__}: {e}')
+
+			if batch:
+				try:
+					self._send_batch(batch)
+				except Exception as e:
+					logger.debug(f'Failed to send telemetry batch: {type(e).__name__}: {e}')
+			for flushed in flush_requests:
+				flushed.set()
+
+
 @singleton
 class ProductTelemetry:
 	"""
@@ -47,9 +139,14 @@ class ProductTelemetry:
 		telemetry_disabled = os.getenv('ANONYMIZED_TELEMETRY', 'true').lower() == 'false'
 		self.debug_logging = os.getenv('BROWSER_USE_LOGGING_LEVEL', 'info').lower() == 'debug'
 
+		self._event_queue: TelemetryEventQueue | None = None
+		self._captured_keys: set[Hashable] = set()
+
 		if telemetry_disabled:
 			self._posthog_client = None
 		else:
+			from posthog import Posthog
+
 			logger.info(
 				'Anonymized telemetry enabled. See https://docs.browser-use.com/development/telemetry for more information.'
 			)
@@ -65,20 +162,43 @@ class ProductTelemetry:
 				posthog_logger = logging.getLogger('posthog')
 				posthog_logger.disabled = True
 
+			self._event_queue = TelemetryEventQueue(send_batch=self._send_batch)
+			# registered after posthog's own atexit handler, so it runs first and hands posthog the last events
+			atexit.register(self._event_queue.flush)
+
 		if self._posthog_client is None:
 			logger.debug('Telemetry disabled')
 
-	def capture(self, event: BaseTelemetryEvent) -> None:
-		if self._posthog_client is None:
+	@property
+	def enabled(self) -> bool:
+		return self._posthog_client is not None
+
+	def capture(self, event: TelemetryEventOrFactory, dedupe_key: Hashable | None = None) -> None:
+		"""
+		Queue an event to be sent in the background.
+
+		Pass a zero-argument factory instead of an event to also build the payload in the background,
+		and a dedupe_key to send an event only once per process (e.g. the same set of registered functions).
+		"""
+		if self._event_queue is None:
 			return
 
-		if self.debug_logging:
-			logger.debug(f'Telemetry event: {event.name} {event.properties}')
-		self._direct_capture(event)
+		if dedupe_key is not None:
+			if dedupe_key in self._captured_keys:
+				return
+			self._captured_keys.add(dedupe_key)
+
+		self._event_queue.put(event)
+
+	def _send_batch(self, events: list[BaseTelemetryEvent]) -> None:
+		for event in events:
+			if self.debug_logging:
+				logger.debug(f'Telemetry event: {event.name} {event.properties}')
+			self._direct_capture(event)
 
 	def _direct_capture(self, event: BaseTelemetryEvent) -> None:
 		"""
-		Should not be thread blocking because posthog magically handles it
+		Called from the telemetry queue's background thread, posthog batches the actual HTTP requests itself
 		"""
 		if self._posthog_client is None:
 			return
@@ -93,6 +213,9 @@ class ProductTelemetry:
 			logger.error(f'Failed to send telemetry event {event.name}: {e}')
 
 	def flush(self) -> None:
+		if self._event_queue and not self._event_queue.flush():
+			logger.debug('Timed out waiting for queued telemetry events to be sent.')
+
 		if self._posthog_client:
 			try:
 				self._posthog_client.flush()
@@ -0,0 +1,244 @@
+"""
+Span-based tracing for profiling the agent, browser session, DOM and controller.
+
+Spans nest through contextvars (so they follow asyncio tasks) and carry ids like the step number or action
+name as attributes. When tracing is off a span costs a couple of ContextVar lookups, and when only the
+per-step phase breakdown is being collected (see collect_phase_durations) it costs two perf_counter calls.
+
+Enable recording with enable_tracing(), or set BROWSER_USE_TRACE_FILE=path.json to record and export
+automatically at exit. Traces can be exported as Chrome trace JSON (chrome://tracing, https://ui.perfetto.dev)
+or as OpenTelemetry OTLP/JSON (files ending in .otlp.json).
+"""
+
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Span:
+	name: str
+	span_id: int
+	parent_id: int | None
+	root_id: int
+	track_id: int  # asyncio task (or thread) the span ran in, spans on the same track nest cleanly
+	start_ns: int  # time.perf_counter_ns()
+	end_ns: int = 0
+	attributes: dict[str, Any] = field(default_factory=dict)
+
+	@property
+	def duration_seconds(self) -> float:
+		return (self.end_ns - self.start_ns) / 1e9
+
+
+class Tracer:
+	def __init__(self) -> None:
+		self.enabled = False
+		self.spans: list[Span] = []
+		self._ids = itertools.count(1)
+		self._lock = threading.Lock()
+		self._trace_id_prefix = random.getrandbits(64)
+		# perf_counter is monotonic but has an arbitrary origin, this maps it onto unix time for the exports
+		self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+
+_tracer = Tracer()
+_current_span: ContextVar[Span | None] = ContextVar('browser_use_current_span', default=None)
+_phase_durations: ContextVar[dict[str, float] | None] = ContextVar('browser_use_phase_durations', default=None)
+
+
+def enable_tracing() -> None:
+	_tracer.enabled = True
+
+
+def disable_tracing() -> None:
+	_tracer.enabled = False
+
+
+def is_tracing_enabled() -> bool:
+	return _tracer.enabled
+
+
+def get_spans() -> list[Span]:
+	"""Finished spans recorded so far, in the order they ended"""
+	with _tracer._lock:
+		return list(_tracer.spans)
+
+
+def clear_spans() -> None:
+	with _tracer._lock:
+		_tracer.spans.clear()
+
+
+def _current_track_id() -> int:
+	try:
+		task = asyncio.current_task()
+	except RuntimeError:
+		task = None
+	return id(task) if task is not None else threading.get_ident()
+
+
+@contextmanager
+def trace_span(name: str, phase: str | None = None, **attributes: Any) -> Iterator[Span | None]:
+	"""
+	Record a span around the block (if tracing is enabled) and add its duration to `phase` in the
+	per-step phase breakdown (if one is being collected). Yields the Span, or None when not recording.
+	"""
+	phase_durations = _phase_durations.get() if phase else None
+	if not _tracer.enabled and phase_durations is None:
+		yield None
+		return
+
+	span = None
+	token = None
+	start_ns = time.perf_counter_ns()
+	if _tracer.enabled:
+		parent = _current_span.get()
+		span_id = next(_tracer._ids)
+		if phase:
+			attributes['phase'] = phase
+		span = Span(
+			name=name,
+			span_id=span_id,
+			parent_id=parent.span_id if parent else None,
+			root_id=parent.root_id if parent else span_id,
+			track_id=_current_track_id(),
+			start_ns=start_ns,
+			attributes=attributes,
+		)
+		token = _current_span.set(span)
+
+	try:
+		yield span
+	finally:
+		end_ns = time.perf_counter_ns()
+		if phase_durations is not None and phase:
+			phase_durations[phase] = phase_durations.get(phase, 0.0) + (end_ns - start_ns) / 1e9
+		if span is not None and token is not None:
+			span.end_ns = end_ns
+			_current_span.reset(token)
+			with _tracer._lock:
+				_tracer.spans.append(span)
+
+
+def add_span_attributes(**attributes: Any) -> None:
+	"""Attach attributes to the innermost span that is currently being recorded, if any"""
+	span = _current_span.get()
+	if span is not None:
+		span.attributes.update(attributes)
+
+
+@contextmanager
+def collect_phase_durations() -> Iterator[dict[str, float]]:
+	"""
+	Collect the total wall-clock seconds spent in each phase (spans started with phase=...) inside the block.
+	Phases can overlap, e.g. a DOM build triggered by an action is counted in both 'dom_build' and 'actions'.
+	"""
+	phase_durations: dict[str, float] = {}
+	token = _phase_durations.set(phase_durations)
+	try:
+		yield phase_durations
+	finally:
+		_phase_durations.reset(token)
+
+
+def _json_safe(value: Any) -> Any:
+	return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+def export_chrome_trace(path: str | Path) -> Path:
+	"""Write the recorded spans as Chrome trace event JSON"""
+	pid = os.getpid()
+	events = [
+		{
+			'name': span.name,
+			'cat': 'browser_use',
+			'ph': 'X',
+			'ts': (span.start_ns + _tracer._epoch_offset_ns) / 1000,
+			'dur': (span.end_ns - span.start_ns) / 1000,
+			'pid': pid,
+			'tid': span.track_id,
+			'args': {
+				'span_id': span.span_id,
+				'parent_id': span.parent_id,
+				**{key: _json_safe(value) for key, value in span.attributes.items()},
+			},
+		}
+		for span in get_spans()
+	]
+	path = Path(path)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+	return path
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+	if isinstance(value, bool):
+		return {'boolValue': value}
+	if isinstance(value, int):
+		return {'intValue': str(value)}
+	if isinstance(value, float):
+		return {'doubleValue': value}
+	return {'stringValue': str(value)}
+
+
+def export_otlp_json(path: str | Path) -> Path:
+	"""Write the recorded spans as OpenTelemetry OTLP/JSON (one trace per root span)"""
+	spans = [
+		{
+			'traceId': f'{_tracer._trace_id_prefix:016x}{span.root_id:016x}',
+			'spanId': f'{span.span_id:016x}',
+			**({'parentSpanId': f'{span.parent_id:016x}'} if span.parent_id else {}),
+			'name': span.name,
+			'kind': 1,  # SPAN_KIND_INTERNAL
+			'startTimeUnixNano': str(span.start_ns + _tracer._epoch_offset_ns),
+			'endTimeUnixNano': str(span.end_ns + _tracer._epoch_offset_ns),
+			'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in span.attributes.items()],
+		}
+		for span in get_spans()
+	]
+	payload = {
+		'resourceSpans': [
+			{
+				'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': 'browser-use'}}]},
+				'scopeSpans': [{'scope': {'name': 'browser_use'}, 'spans': spans}],
+			}
+		]
+	}
+	path = Path(path)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_text(json.dumps(payload))
+	return path
+
+
+def export_trace(path: str | Path) -> Path:
+	"""Export the recorded spans, as OTLP/JSON if the file name ends with .otlp.json, otherwise as a Chrome trace"""
+	if str(path).endswith('.otlp.json'):
+		return export_otlp_json(path)
+	return export_chrome_trace(path)
+
+
+def _export_trace_at_exit(path: str) -> None:
+	try:
+		logger.info(f'📊 Wrote {len(get_spans())} trace spans to {export_trace(path)}')
+	except Exception as e:
+		logger.warning(f'Failed to export trace to {path}: {type(e).__name__}: {e}')
+
+
+if trace_file := os.getenv('BROWSER_USE_TRACE_FILE'):
+	enable_tracing()
+	atexit.register(_export_trace_at_exit, trace_file)
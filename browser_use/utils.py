@@ -11,6 +11,8 @@ from sys import stderr
 from typing import Any, ParamSpec, TypeVar
 from urllib.parse import urlparse
 
+from browser_use.tracing import trace_span
+
 logger = logging.getLogger(__name__)
 
 # Global flag to prevent duplicate exit messages
@@ -303,16 +305,21 @@ class SignalHandler:
 			self.loop.waiting_for_input = False
 
 
-def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]], Callable[P, R]]:
+def time_execution_sync(additional_text: str = '', phase: str | None = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
+	"""Record the call as a tracing span (see browser_use.tracing) and log it if it took more than 0.25s"""
+
 	def decorator(func: Callable[P, R]) -> Callable[P, R]:
+		span_name = additional_text.strip('-') or func.__name__
+
 		@wraps(func)
 		def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
 			start_time = time.time()
-			result = func(*args, **kwargs)
+			with trace_span(span_name, phase=phase):
+				result = func(*args, **kwargs)
 			execution_time = time.time() - start_time
 			# Only log if execution takes more than 0.25 seconds
 			if execution_time > 0.25:
-				logger.debug(f'⏳ {additional_text.strip("-")}() took {execution_time:.2f}s')
+				logger.debug(f'⏳ {span_name}() took {execution_time:.2f}s')
 			return result
 
 		return wrapper
@@ -322,17 +329,23 @@ def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]],
 
 def time_execution_async(
 	additional_text: str = '',
+	phase: str | None = None,
 ) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]]:
+	"""Record the call as a tracing span (see browser_use.tracing) and log it if it took more than 0.25s"""
+
 	def decorator(func: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, Coroutine[Any, Any, R]]:
+		span_name = additional_text.strip('-') or func.__name__
+
 		@wraps(func)
 		async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
 			start_time = time.time()
-			result = await func(*args, **kwargs)
+			with trace_span(span_name, phase=phase):
+				result = await func(*args, **kwargs)
 			execution_time = time.time() - start_time
 			# Only log if execution takes more than 0.25 seconds to avoid spamming the logs
 			# you can lower this threshold locally when you're doing dev work to performance optimize stuff
 			if execution_time > 0.25:
-				logger.debug(f'⏳ {additional_text.strip("-")}() took {execution_time:.2f}s')
+				logger.debug(f'⏳ {span_name}() took {execution_time:.2f}s')
 			return result
 
 		return wrapper
@@ -4,6 +4,10 @@
 # Here is the command to run the evaluation:
 # python eval/service.py --parallel-runs 2 --max-steps 25 --start 0 --end 100 --model llama-4-maverick --eval-model gpt-4.1 --no-vision --eval-group "PRTests" --user-message "message here"
 
+# To spread a large suite over many cores, run N worker processes with --parallel-runs tasks each sharing one browser:
+# python eval/service.py --num-workers 8 --parallel-runs 4 --llm-rps 10 --headless --model gpt-4.1 --eval-model gpt-4.1
+# An interrupted suite can be resumed from the per-task checkpoints with --fresh-start false
+
 # ==============================================================================================================
 
 
@@ -14,6 +18,8 @@
 # We are using our langchain wrapper for the OpenAI API
 # This means we changed model.generate to model.invoke. The behavior of the model should be identical.
 # Added a Online_Mind2Web_eval_with_retry wrapper with retry logic in case of API rate limiting or other issues.
+# Judge LLM calls are bounded per provider and their responses are cached on disk (keyed by task, image hash, model and
+# prompt version), image encodings are cached per file hash. The judging logic and prompts themselves are unchanged.
 
 
 # @article{xue2025illusionprogressassessingcurrent,
@@ -40,16 +46,27 @@
 # ==============================================================================================================
 import asyncio
 import base64
+import hashlib
 import io
+import json
 import logging
+import os
 import re
 import shutil
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
 
 import anyio
 from PIL import Image
 
 MAX_IMAGE = 5
 
+JUDGE_PROMPT_VERSION = 1  # bump to invalidate all cached judge responses after changing the judging prompts or parsing
+JUDGE_CACHE_DIR = Path(os.getenv('EVAL_JUDGE_CACHE_DIR', '~/.cache/browser_use/judge_cache')).expanduser()
+MAX_CONCURRENT_JUDGE_CALLS = int(os.getenv('EVAL_MAX_CONCURRENT_JUDGE_CALLS', '8'))  # per provider, per process
+MAX_CACHED_IMAGE_ENCODINGS = 256
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -63,6 +80,70 @@ def encode_image(image):
 	return base64.b64encode(buffered.getvalue()).decode('utf-8')
 
 
+_image_encoding_cache: OrderedDict[str, str] = OrderedDict()
+
+
+def encode_image_file(image_path) -> tuple[str, str]:
+	"""Return (sha256 of the file, base64 JPEG encoding), re-encoding each distinct image only once."""
+	data = Path(image_path).read_bytes()
+	image_hash = hashlib.sha256(data).hexdigest()
+	if image_hash in _image_encoding_cache:
+		_image_encoding_cache.move_to_end(image_hash)
+	else:
+		_image_encoding_cache[image_hash] = encode_image(Image.open(io.BytesIO(data)))
+		if len(_image_encoding_cache) > MAX_CACHED_IMAGE_ENCODINGS:
+			_image_encoding_cache.popitem(last=False)
+	return image_hash, _image_encoding_cache[image_hash]
+
+
+_judge_semaphores: dict[tuple[int, str], asyncio.Semaphore] = {}
+
+
+def _judge_semaphore(model) -> asyncio.Semaphore:
+	"""One semaphore per provider (chat model class), so a burst of judge calls can't trip the provider's rate limits"""
+	key = (id(asyncio.get_running_loop()), type(model).__name__)
+	if key not in _judge_semaphores:
+		_judge_semaphores[key] = asyncio.Semaphore(MAX_CONCURRENT_JUDGE_CALLS)
+	return _judge_semaphores[key]
+
+
+def judge_cache_key(model, *parts) -> str:
+	"""Cache key for a judge call: prompt version, provider, model name and whatever inputs determine the response"""
+	model_name = getattr(model, 'model_name', None) or getattr(model, 'model', None) or ''
+	payload = json.dumps([JUDGE_PROMPT_VERSION, type(model).__name__, str(model_name), *parts], ensure_ascii=False)
+	return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+async def cached_judge_invoke(model, messages, cache_key: str, is_valid: Callable[[str], bool] | None = None) -> str:
+	"""
+	Invoke the judge model, bounded per provider, reusing a response saved on disk for the same cache_key.
+	Responses is_valid rejects (malformed, truncated) are returned but not cached, so the next attempt asks the judge again.
+	"""
+	cache_file = JUDGE_CACHE_DIR / cache_key[:2] / f'{cache_key}.json'
+	try:
+		async with await anyio.open_file(cache_file) as f:
+			return json.loads(await f.read())['content']
+	except (OSError, ValueError, KeyError):
+		pass
+
+	async with _judge_semaphore(model):
+		response = await asyncio.to_thread(model.invoke, messages)
+	content = response.content
+	if is_valid is not None and not is_valid(content):
+		logger.warning(f'Judge response could not be parsed, not caching it: {content[:200]!r}')
+		return content
+
+	try:
+		cache_file.parent.mkdir(parents=True, exist_ok=True)
+		tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+		async with await anyio.open_file(tmp_file, 'w') as f:
+			await f.write(json.dumps({'content': content}))
+		tmp_file.replace(cache_file)
+	except OSError as e:
+		logger.warning(f'Failed to cache judge response: {type(e).__name__}: {e}')
+	return content
+
+
 async def identify_key_points(task, model):
 	system_msg = """You are an expert tasked with analyzing a given task to identify the key points explicitly stated in the task description.
 
@@ -86,8 +167,9 @@ async def identify_key_points(task, model):
 			'content': [{'type': 'text', 'text': text}],
 		},
 	]
-	response = await asyncio.to_thread(model.invoke, messages)
-	return response.content
+	return await cached_judge_invoke(
+		model, messages, judge_cache_key(model, 'key_points', system_msg, text), is_valid=lambda response: bool(response.strip())
+	)
 
 
 async def judge_image(task, image_path, key_points, model):
@@ -117,7 +199,7 @@ Respond with:
 1. **Reasoning**: [Your explanation]  
 2. **Score**: [1-5]"""
 
-	jpg_base64_str = encode_image(Image.open(image_path))
+	image_hash, jpg_base64_str = encode_image_file(image_path)
 
 	prompt = """**Task**: {task}
 
@@ -139,8 +221,15 @@ The snapshot of the web page is shown in the image."""
 			],
 		},
 	]
-	response = await asyncio.to_thread(model.invoke, messages)
-	return response.content
+	return await cached_judge_invoke(
+		model, messages, judge_cache_key(model, 'judge_image', system_msg, text, image_hash), is_valid=has_image_score
+	)
+
+
+def has_image_score(response: str) -> bool:
+	"""Whether Online_Mind2Web_eval can read a 1-5 score from a judge_image response"""
+	parts = response.split('Score')
+	return len(parts) > 1 and bool(re.findall(r'[1-5]', parts[1]))
 
 
 async def Online_Mind2Web_eval(task, last_actions, images_path, model, score_threshold):
@@ -208,7 +297,7 @@ The potentially important snapshots of the webpage in the agent's trajectory and
 			record.append({'Response': response, 'Score': 0})
 
 		if int(score) >= score_threshold:
-			jpg_base64_str = encode_image(Image.open(image_path))
+			_, jpg_base64_str = encode_image_file(image_path)
 			whole_content_img.append(
 				{'type': 'image_url', 'image_url': {'url': f'data:image/png;base64,{jpg_base64_str}', 'detail': 'high'}}
 			)
@@ -272,7 +361,7 @@ async def Online_Mind2Web_eval_with_retry(task, last_actions, images_path, model
 # ==============================================================================================================
 import argparse
 import http.client
-import json
+import multiprocessing
 import os
 import subprocess
 import time
@@ -283,6 +372,7 @@ import requests
 from dotenv import load_dotenv
 from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.rate_limiters import BaseRateLimiter, InMemoryRateLimiter
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from pydantic.types import SecretStr
@@ -464,8 +554,12 @@ def create_controller(use_serp: bool = False):
 		return Controller()
 
 
-def get_llm(model_name: str):
-	"""Instantiates the correct LangChain ChatModel based on the model name."""
+def get_llm(model_name: str, rate_limiter: BaseRateLimiter | None = None):
+	"""
+	Instantiates the correct LangChain ChatModel based on the model name.
+
+	If a rate_limiter is given, every request made through the model waits on it first (shared backpressure across agents/judges).
+	"""
 	if model_name not in SUPPORTED_MODELS:
 		raise ValueError(f'Unsupported model: {model_name}. Supported models are: {list(SUPPORTED_MODELS.keys())}')
 
@@ -489,16 +583,22 @@ def get_llm(model_name: str):
 				kwargs['temperature'] = 1
 			if api_key_secret:
 				kwargs['api_key'] = api_key_secret
+			if rate_limiter:
+				kwargs['rate_limiter'] = rate_limiter
 			return ChatOpenAI(**kwargs)
 		case 'anthropic':
 			kwargs = {'model_name': config['model_name'], 'temperature': 0.0, 'timeout': 100, 'stop': None}
 			if api_key_secret:
 				kwargs['api_key'] = api_key_secret
+			if rate_limiter:
+				kwargs['rate_limiter'] = rate_limiter
 			return ChatAnthropic(**kwargs)
 		case 'google':
 			kwargs = {'model': config['model_name'], 'temperature': 0.0}
 			if api_key_secret:
 				kwargs['api_key'] = api_key_secret
+			if rate_limiter:
+				kwargs['rate_limiter'] = rate_limiter
 			return ChatGoogleGenerativeAI(**kwargs)
 		case 'openai_compatible':
 			kwargs = {'model': config['model_name'], 'base_url': config['base_url'], 'temperature': 0.0}
@@ -508,6 +608,8 @@ def get_llm(model_name: str):
 				logger.warning(
 					f'API key for {model_name} at {config["base_url"]} is missing, but base_url is specified. Authentication may fail.'
 				)
+			if rate_limiter:
+				kwargs['rate_limiter'] = rate_limiter
 			return ChatOpenAI(**kwargs)
 		case _:
 			raise ValueError(f'Unknown provider: {provider}')
@@ -648,12 +750,14 @@ class Task:
 		return self.__str__()
 
 
-async def judge_task_result(model, task_folder: Path, score_threshold: float = 3) -> dict:
+async def judge_task_result(model, task_folder: Path, score_threshold: float = 3, rejudge: bool = False) -> dict:
 	"""
 	Judge a single task result based on the success value of the final action.
 
 	Args:
 	    task_folder: Path to the task result folder
+	    score_threshold: Minimum image score for a screenshot to be shown to the final judge
+	    rejudge: Ignore an evaluation already saved in result.json (judge calls are still served from the cache)
 
 	Returns:
 	    Dictionary containing judgment results
@@ -667,7 +771,7 @@ async def judge_task_result(model, task_folder: Path, score_threshold: float = 3
 			result = json.loads(await f.read())
 
 		# If a Online_Mind2Web_evaluation is already saved, we can skip the eval
-		if result.get('Online_Mind2Web_evaluation'):
+		if result.get('Online_Mind2Web_evaluation') and not rejudge:
 			return result.get('Online_Mind2Web_evaluation')
 
 		# Get the screenshot paths, task description, and action history
@@ -688,8 +792,12 @@ async def judge_task_result(model, task_folder: Path, score_threshold: float = 3
 			messages, text, system_msg, record, key_points = eval_result
 
 			# Final steps to get judgement - run invoke in a thread
-			judgement_msg = await asyncio.to_thread(model.invoke, messages)
-			judgement = judgement_msg.content
+			judgement = await cached_judge_invoke(
+				model,
+				messages,
+				judge_cache_key(model, 'final_judgement', messages),
+				is_valid=lambda response: 'status:' in response.lower(),
+			)
 
 			if 'success' in judgement.lower().split('status:')[1]:  # This is the official criteria for success
 				evaluation = {'task_id': task_folder.name, 'judgement': judgement, 'success': True, 'error': None, 'score': 1.0}
@@ -722,6 +830,13 @@ async def judge_task_result(model, task_folder: Path, score_threshold: float = 3
 		}
 
 
+async def rejudge_results_dir(model, results_dir: str = 'saved_trajectories', score_threshold: float = 3) -> None:
+	"""Re-score every task in an existing results directory, e.g. with a new score_threshold, reusing cached judge calls"""
+	task_folders = [Path(f) async for f in anyio.Path(results_dir).iterdir() if await f.is_dir()]
+	logger.info(f'Re-judging {len(task_folders)} tasks in {results_dir} with score_threshold={score_threshold}')
+	await asyncio.gather(*(judge_task_result(model, folder, score_threshold, rejudge=True) for folder in task_folders))
+
+
 def calculate_local_summary(results_dir: str | None = None) -> dict:
 	"""
 	Calculates a summary of task results by reading the saved result.json files.
@@ -784,6 +899,7 @@ def calculate_local_summary(results_dir: str | None = None) -> dict:
 	}
 
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -808,12 +924,16 @@ class StageError(Exception):
 class TaskResult:
 	"""Simplified task state tracker with auto-updating server payload"""
 
-	def __init__(self, task_id: str, run_id: str, task_description: str, task: Task, max_steps: int):
+	def __init__(
+		self, task_id: str, run_id: str, task_description: str, task: Task, max_steps: int, checkpoint_file: Path | None = None
+	):
 		self.task_id = task_id
+		self.run_id = run_id
 		self.completed_stages = set()
 		self.stage_data = {}  # Store actual results from each stage
 		self.failed_stages = {}  # Store errors from failed stages
 		self.local_error = None
+		self.checkpoint_file = checkpoint_file  # stage progress is persisted here so a crashed suite can resume
 
 		# Initialize server payload with defaults
 		self.server_payload = {
@@ -847,11 +967,47 @@ class TaskResult:
 		if data is not None:
 			self.stage_data[stage] = data
 		self._auto_update_payload()
+		self.save_checkpoint()
 
 	def stage_failed(self, stage: Stage, error: StageError):
 		"""Mark stage as failed and update server payload"""
 		self.failed_stages[stage] = error
 		self._auto_update_payload()
+		self.save_checkpoint()
+
+	def save_checkpoint(self):
+		"""Persist the completed/failed stages so an interrupted suite can pick up where it left off"""
+		if not self.checkpoint_file:
+			return
+		checkpoint = {
+			'task_id': self.task_id,
+			'run_id': self.run_id,
+			'current_stage': determine_current_stage(self.completed_stages).value,
+			'completed_stages': sorted(stage.value for stage in self.completed_stages),
+			'failed_stages': {
+				stage.value: {'error_type': error.error_type, 'message': error.message}
+				for stage, error in self.failed_stages.items()
+			},
+			'updated_at': datetime.now().isoformat(),
+		}
+		try:
+			self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+			tmp_file = self.checkpoint_file.with_suffix('.tmp')
+			tmp_file.write_text(json.dumps(checkpoint, indent=2))
+			tmp_file.replace(self.checkpoint_file)  # atomic, a crash mid-write never leaves a corrupt checkpoint behind
+		except OSError as e:
+			logger.warning(f'Task {self.task_id}: Failed to save checkpoint: {type(e).__name__}: {e}')
+
+	@staticmethod
+	def load_checkpoint(checkpoint_file: Path, run_id: str) -> set[Stage]:
+		"""Return the stages a previous (possibly crashed) attempt of the run run_id already completed for this task"""
+		try:
+			checkpoint = json.loads(checkpoint_file.read_text())
+			if checkpoint.get('run_id') != run_id:
+				return set()  # left by another run, whose stages say nothing about this one
+			return {Stage(stage) for stage in checkpoint.get('completed_stages', [])}
+		except (OSError, ValueError):
+			return set()
 
 	def has_execution_data(self) -> bool:
 		"""Check if we have execution data from either loading existing or completing execution"""
@@ -1009,8 +1165,72 @@ async def load_existing_result(task_folder: Path) -> dict:
 	return existing_result
 
 
-async def setup_browser_session(task: Task, headless: bool) -> BrowserSession:
+class SharedBrowser:
+	"""
+	One chromium process shared by all the tasks running in a worker, each task gets its own isolated incognito context.
+
+	Launching a browser per task costs seconds of CPU and hundreds of MB of RAM, a new context costs a few ms.
+	The browser is relaunched transparently if it crashes.
+	"""
+
+	def __init__(self, headless: bool):
+		self.profile = BrowserProfile(user_data_dir=None, headless=headless, chromium_sandbox=False)
+		self.playwright = None
+		self.browser = None
+		self._lock = asyncio.Lock()
+
+	async def _ensure_browser(self):
+		async with self._lock:
+			if self.browser and self.browser.is_connected():
+				return self.browser
+			from playwright.async_api import async_playwright
+
+			self.playwright = self.playwright or await async_playwright().start()
+			logger.info('Shared browser: launching chromium')
+			self.browser = await self.playwright.chromium.launch(**self.profile.kwargs_for_launch().model_dump())
+			return self.browser
+
+	async def new_session(self, task: Task) -> BrowserSession:
+		"""Create a fresh context in the shared browser and wrap it in a BrowserSession for the task"""
+		browser = await self._ensure_browser()
+		context = await browser.new_context(**self.profile.kwargs_for_new_context().model_dump())
+		logger.debug(f'Shared browser: created context for task {task.task_id} ({len(browser.contexts)} contexts open)')
+		# reuse the playwright driver too, each session would otherwise start its own; sessions may change their profile
+		return BrowserSession(
+			browser_profile=self.profile.model_copy(), playwright=self.playwright, browser=browser, browser_context=context
+		)
+
+	async def release(self, browser_session: BrowserSession):
+		"""Close the task's context, leaving the shared browser running for the next task"""
+		try:
+			if browser_session.browser_context:
+				await asyncio.wait_for(browser_session.browser_context.close(), timeout=30)
+		except Exception as e:
+			logger.warning(f'Shared browser: failed to close context: {type(e).__name__}: {e}')
+
+	async def stop(self):
+		try:
+			if self.browser:
+				await self.browser.close()
+			if self.playwright:
+				await self.playwright.stop()
+		except Exception as e:
+			logger.warning(f'Shared browser: failed to stop: {type(e).__name__}: {e}')
+		self.browser = None
+		self.playwright = None
+
+
+async def setup_browser_session(task: Task, headless: bool, shared_browser: SharedBrowser | None = None) -> BrowserSession:
 	"""Setup browser session for the task"""
+	if shared_browser:
+		logger.debug(f'Browser setup: Creating a new context in the shared browser for task {task.task_id}')
+		browser_session = await shared_browser.new_session(task)
+		await browser_session.start()
+		if task.website:
+			logger.debug(f'Browser setup: Navigating to {task.website} for task {task.task_id}')
+			await browser_session.navigate(task.website)
+		return browser_session
+
 	logger.debug(f'Browser setup: Creating unique user data directory for task {task.task_id}')
 	# Create unique user data directory
 	base_user_data_dir = Path(BrowserProfile().user_data_dir).parent
@@ -1082,9 +1302,9 @@ async def run_agent_with_browser(
 	return agent.state.history
 
 
-async def evaluate_task_result(eval_model: BaseChatModel, task_folder: Path) -> dict:
+async def evaluate_task_result(eval_model: BaseChatModel, task_folder: Path, score_threshold: float = 3) -> dict:
 	"""Evaluate the task result"""
-	return await judge_task_result(eval_model, task_folder, score_threshold=3)
+	return await judge_task_result(eval_model, task_folder, score_threshold=score_threshold)
 
 
 def save_result_to_server(convex_url: str, secret_key: str, payload: dict) -> bool:
@@ -1141,6 +1361,8 @@ async def run_task_with_semaphore(
 	validate_output: bool = False,
 	planner_llm: BaseChatModel | None = None,
 	planner_interval: int = 1,
+	shared_browser: SharedBrowser | None = None,
+	score_threshold: float = 3,
 ) -> dict:
 	"""Clean pipeline approach for running tasks"""
 	logger.info(f'Task {task.task_id}: Waiting to acquire semaphore (current value: ~{semaphore_runs._value})')
@@ -1151,8 +1373,15 @@ async def run_task_with_semaphore(
 
 		try:
 			# Initialize task result and basic setup
-			task_result = TaskResult(task.task_id, run_id, task.confirmed_task, task, max_steps_per_task)
 			task_folder = Path(f'saved_trajectories/{task.task_id}')
+			checkpoint_file = task_folder / 'checkpoint.json'
+			task_result = TaskResult(task.task_id, run_id, task.confirmed_task, task, max_steps_per_task, checkpoint_file)
+
+			# Resume: the stages whose output was saved in the task folder (agent result, evaluation) are picked up by the
+			# LOAD_EXISTING stage and saved to the current run, the others (browser, agent run) have nothing to resume from.
+			# Only an earlier attempt of this same run can have saved the result to the server already.
+			previous_stages = TaskResult.load_checkpoint(checkpoint_file, run_id) if not fresh_start else set()
+			already_saved = Stage.SAVE_SERVER in previous_stages
 
 			logger.info(f'Task {task.task_id}: Starting execution pipeline.')
 			try:
@@ -1177,7 +1406,7 @@ async def run_task_with_semaphore(
 					try:
 						logger.info(f'Task {task.task_id}: Browser setup starting.')
 						browser_session = await run_stage(
-							Stage.SETUP_BROWSER, lambda: setup_browser_session(task, headless), timeout=120
+							Stage.SETUP_BROWSER, lambda: setup_browser_session(task, headless, shared_browser), timeout=120
 						)
 						task_result.stage_completed(Stage.SETUP_BROWSER)
 						logger.info(f'Task {task.task_id}: Browser session started successfully.')
@@ -1238,7 +1467,7 @@ async def run_task_with_semaphore(
 					try:
 						logger.info(f'Task {task.task_id}: Evaluation starting.')
 						evaluation = await run_stage(
-							Stage.EVALUATE, lambda: evaluate_task_result(eval_model, task_folder), timeout=300
+							Stage.EVALUATE, lambda: evaluate_task_result(eval_model, task_folder, score_threshold), timeout=300
 						)
 						task_result.stage_completed(Stage.EVALUATE, evaluation)
 						logger.info(f'Task {task.task_id}: Evaluation completed.')
@@ -1247,21 +1476,25 @@ async def run_task_with_semaphore(
 						task_result.stage_failed(Stage.EVALUATE, error)
 						logger.error(f'Task {task.task_id}: Evaluation failed: {str(e)}')
 
-				# Stage 6: Save to server (always attempt)
-				try:
-					logger.info(f'Task {task.task_id}: Saving result to server.')
-					await run_stage(
-						Stage.SAVE_SERVER,
-						lambda: asyncio.to_thread(save_result_to_server, convex_url, secret_key, task_result.server_payload),
-						timeout=60,
-					)
+				# Stage 6: Save to server (always attempt, unless this run already has the loaded result)
+				if already_saved and Stage.LOAD_EXISTING in task_result.completed_stages:
+					logger.info(f'Task {task.task_id}: Result was already saved to run {run_id}. Skipping server save.')
 					task_result.stage_completed(Stage.SAVE_SERVER)
-					logger.info(f'Task {task.task_id}: Successfully saved result to server.')
-				except Exception as e:
-					error = StageError(Stage.SAVE_SERVER, 'exception', str(e))
-					task_result.stage_failed(Stage.SAVE_SERVER, error)
-					task_result.mark_server_save_failed(str(e))
-					logger.error(f'Task {task.task_id}: Server save failed: {str(e)}')
+				else:
+					try:
+						logger.info(f'Task {task.task_id}: Saving result to server.')
+						await run_stage(
+							Stage.SAVE_SERVER,
+							lambda: asyncio.to_thread(save_result_to_server, convex_url, secret_key, task_result.server_payload),
+							timeout=60,
+						)
+						task_result.stage_completed(Stage.SAVE_SERVER)
+						logger.info(f'Task {task.task_id}: Successfully saved result to server.')
+					except Exception as e:
+						error = StageError(Stage.SAVE_SERVER, 'exception', str(e))
+						task_result.stage_failed(Stage.SAVE_SERVER, error)
+						task_result.mark_server_save_failed(str(e))
+						logger.error(f'Task {task.task_id}: Server save failed: {str(e)}')
 
 			except TimeoutError:
 				current_stage = determine_current_stage(task_result.completed_stages)
@@ -1344,7 +1577,10 @@ async def run_task_with_semaphore(
 			# Always cleanup browser if it was created
 			if browser_session:
 				logger.info(f'Task {task.task_id}: Starting browser cleanup')
-				await cleanup_browser_safe(browser_session)
+				if shared_browser:
+					await shared_browser.release(browser_session)
+				else:
+					await cleanup_browser_safe(browser_session)
 				logger.info(f'Task {task.task_id}: Browser cleanup completed')
 			else:
 				logger.info(f'Task {task.task_id}: No browser to cleanup')
@@ -1378,45 +1614,69 @@ async def run_multiple_tasks(
 	validate_output: bool = False,
 	planner_llm: BaseChatModel | None = None,
 	planner_interval: int = 1,
+	use_shared_browser: bool = False,
+	llm_requests_per_second: float | None = None,
+	score_threshold: float = 3,
 ) -> dict:
 	"""
 	Run multiple tasks in parallel and evaluate results.
+
+	With use_shared_browser=True all tasks share one chromium process (one incognito context per task) instead of
+	launching a browser each. llm_requests_per_second applies a shared rate limit to the agent, planner and judge LLMs.
 	"""
 	logger.info(f'Creating semaphore with max_parallel_runs={max_parallel_runs}')
 	semaphore_runs = asyncio.Semaphore(max_parallel_runs)
 	tasks_to_run = tasks[start_index:end_index] if end_index else tasks[start_index:]
 
+	if llm_requests_per_second:
+		rate_limiter = InMemoryRateLimiter(requests_per_second=llm_requests_per_second, max_bucket_size=max_parallel_runs)
+		for model in (llm, eval_model, planner_llm):
+			if model is not None and model.rate_limiter is None:
+				model.rate_limiter = rate_limiter
+
+	shared_browser = SharedBrowser(headless=headless) if use_shared_browser else None
+
 	logger.info(f'Starting {len(tasks_to_run)} tasks with parallel limit of {max_parallel_runs}')
 
 	# Run all tasks in parallel with additional parameters
-	task_results = await asyncio.gather(
-		*(
-			run_task_with_semaphore(
-				task=task,
-				run_id=run_id,
-				convex_url=convex_url,
-				secret_key=secret_key,
-				eval_model=eval_model,
-				llm=llm,  # Pass the agent LLM
-				max_steps_per_task=max_steps_per_task,
-				headless=headless,
-				use_vision=use_vision,
-				semaphore_runs=semaphore_runs,  # Pass the semaphore
-				fresh_start=fresh_start,
-				use_serp=use_serp,
-				enable_memory=enable_memory,
-				memory_interval=memory_interval,
-				max_actions_per_step=max_actions_per_step,
-				validate_output=validate_output,
-				planner_llm=planner_llm,
-				planner_interval=planner_interval,
-			)
-			for task in tasks_to_run
-		),
-		return_exceptions=True,  # Prevent task cancellation cascade
-	)
+	try:
+		task_results = await asyncio.gather(
+			*(
+				run_task_with_semaphore(
+					task=task,
+					run_id=run_id,
+					convex_url=convex_url,
+					secret_key=secret_key,
+					eval_model=eval_model,
+					llm=llm,  # Pass the agent LLM
+					max_steps_per_task=max_steps_per_task,
+					headless=headless,
+					use_vision=use_vision,
+					semaphore_runs=semaphore_runs,  # Pass the semaphore
+					fresh_start=fresh_start,
+					use_serp=use_serp,
+					enable_memory=enable_memory,
+					memory_interval=memory_interval,
+					max_actions_per_step=max_actions_per_step,
+					validate_output=validate_output,
+					planner_llm=planner_llm,
+					planner_interval=planner_interval,
+					shared_browser=shared_browser,
+					score_threshold=score_threshold,
+				)
+				for task in tasks_to_run
+			),
+			return_exceptions=True,  # Prevent task cancellation cascade
+		)
+	finally:
+		if shared_browser:
+			await shared_browser.stop()
+
+	return summarize_task_results(task_results)
+
 
-	# Process task results and handle any exceptions returned by gather
+def summarize_task_results(task_results: list) -> dict:
+	"""Process task results (and any exceptions returned by gather) and calculate the local summary"""
 	processed_results = []
 	successful_tasks = 0
 	failed_tasks = 0
@@ -1433,7 +1693,7 @@ async def run_multiple_tasks(
 			else:
 				failed_tasks += 1
 
-	logger.info(f'All {len(tasks_to_run)} tasks completed. Success: {successful_tasks}, Failed: {failed_tasks}')
+	logger.info(f'All {len(task_results)} tasks completed. Success: {successful_tasks}, Failed: {failed_tasks}')
 
 	# After all tasks are complete, calculate a local summary
 	logger.info('All tasks completed. Calculating result summary...')
@@ -1447,6 +1707,156 @@ async def run_multiple_tasks(
 	return {'task_results': processed_results, 'summary': summary}
 
 
+@dataclass
+class WorkerConfig:
+	"""Picklable settings for a worker process, LLM clients are re-created inside each worker from their model names"""
+
+	run_id: str
+	convex_url: str
+	secret_key: str
+	model: str
+	eval_model: str
+	planner_model: str | None = None
+	browser_slots: int = 3  # tasks (browser contexts) running concurrently in each worker
+	max_steps_per_task: int = 25
+	headless: bool = False
+	use_vision: bool = True
+	fresh_start: bool = True
+	use_serp: bool = False
+	enable_memory: bool = False
+	memory_interval: int = 10
+	max_actions_per_step: int = 10
+	validate_output: bool = False
+	planner_interval: int = 1
+	llm_requests_per_second: float | None = None  # this worker's share of the global LLM rate limit
+	score_threshold: float = 3
+
+
+async def _worker_loop(worker_id: int, task_queue, config: WorkerConfig) -> list[dict]:
+	"""Pull tasks off the shared queue and run them against one shared browser, until the queue hands out a None sentinel"""
+	rate_limiter = (
+		InMemoryRateLimiter(requests_per_second=config.llm_requests_per_second, max_bucket_size=config.browser_slots)
+		if config.llm_requests_per_second
+		else None
+	)
+	llm = get_llm(config.model, rate_limiter)
+	eval_model = get_llm(config.eval_model, rate_limiter)
+	planner_llm = get_llm(config.planner_model, rate_limiter) if config.planner_model else None
+
+	shared_browser = SharedBrowser(headless=config.headless)
+	semaphore_runs = asyncio.Semaphore(config.browser_slots)
+	running: dict[asyncio.Task, str] = {}
+	results = []
+
+	def collect(done: set[asyncio.Task]):
+		for finished in done:
+			task_id = running.pop(finished)
+			try:
+				results.append(finished.result())
+			except BaseException as e:
+				logger.error(f'Worker {worker_id}: Task {task_id} failed with exception: {type(e).__name__}: {e}')
+				results.append({'task_id': task_id, 'success': False, 'error': str(e)})
+
+	try:
+		while True:
+			# backpressure: only take a task off the shared queue once this worker has a free browser slot,
+			# so the remaining tasks go to whichever worker frees up first instead of queueing behind a busy one
+			if len(running) >= config.browser_slots:
+				done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+				collect(done)
+
+			task_data = await asyncio.to_thread(task_queue.get)
+			if task_data is None:
+				break
+
+			task = Task(**task_data)
+			logger.info(
+				f'Worker {worker_id}: Picked up task {task.task_id} ({len(running) + 1}/{config.browser_slots} slots busy)'
+			)
+			coro = run_task_with_semaphore(
+				task=task,
+				run_id=config.run_id,
+				convex_url=config.convex_url,
+				secret_key=config.secret_key,
+				eval_model=eval_model,
+				llm=llm,
+				max_steps_per_task=config.max_steps_per_task,
+				headless=config.headless,
+				use_vision=config.use_vision,
+				semaphore_runs=semaphore_runs,
+				fresh_start=config.fresh_start,
+				use_serp=config.use_serp,
+				enable_memory=config.enable_memory,
+				memory_interval=config.memory_interval,
+				max_actions_per_step=config.max_actions_per_step,
+				validate_output=config.validate_output,
+				planner_llm=planner_llm,
+				planner_interval=config.planner_interval,
+				shared_browser=shared_browser,
+				score_threshold=config.score_threshold,
+			)
+			running[asyncio.create_task(coro)] = task.task_id
+
+		if running:
+			done, _ = await asyncio.wait(running.keys())
+			collect(done)
+	finally:
+		await shared_browser.stop()
+
+	return results
+
+
+def _worker_process_main(worker_id: int, task_queue, config: WorkerConfig) -> list[dict]:
+	"""Entrypoint of a worker process: each worker runs its own event loop"""
+	return asyncio.run(_worker_loop(worker_id, task_queue, config))
+
+
+def run_tasks_in_worker_processes(
+	tasks: list[Task],
+	config: WorkerConfig,
+	num_workers: int,
+	start_index: int = 0,
+	end_index: int | None = None,
+) -> dict:
+	"""
+	Run tasks across num_workers processes, each with its own event loop and one shared browser running up to
+	config.browser_slots tasks at a time. Workers pull from a shared queue, so fast workers take on more tasks.
+
+	The global LLM rate limit is split evenly between the workers.
+	Progress is checkpointed per task, so re-running with fresh_start=False resumes an interrupted suite.
+	"""
+	tasks_to_run = tasks[start_index:end_index] if end_index else tasks[start_index:]
+	num_workers = max(1, min(num_workers, len(tasks_to_run)))
+	if config.llm_requests_per_second:
+		config.llm_requests_per_second = config.llm_requests_per_second / num_workers
+
+	logger.info(
+		f'Starting {len(tasks_to_run)} tasks on {num_workers} worker processes with {config.browser_slots} browser slots each'
+	)
+
+	# spawn instead of fork: playwright, grpc and the event loop do not survive being forked
+	mp_context = multiprocessing.get_context('spawn')
+	task_results = []
+	with mp_context.Manager() as manager:
+		task_queue = manager.Queue()
+		for task in tasks_to_run:
+			task_queue.put(vars(task).copy())
+		for _ in range(num_workers):
+			task_queue.put(None)  # one stop sentinel per worker
+
+		with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp_context) as executor:
+			futures = [executor.submit(_worker_process_main, worker_id, task_queue, config) for worker_id in range(num_workers)]
+			for worker_id, future in enumerate(futures):
+				try:
+					task_results.extend(future.result())
+				except Exception as e:
+					# a crashed worker loses its in-flight tasks, they are picked up again on the next run via the checkpoints
+					logger.error(f'Worker {worker_id} crashed: {type(e).__name__}: {e}')
+					task_results.append(e)
+
+	return summarize_task_results(task_results)
+
+
 # Helper function to fetch tasks from the server
 def fetch_tasks_from_server(convex_url: str, secret_key: str, test_case_name: str):
 	"""Fetches the specified test case file from the Convex HTTP endpoint."""
@@ -1628,6 +2038,17 @@ if __name__ == '__main__':
 	parser.add_argument('--end', type=int, default=None, help='End index (exclusive)')
 	parser.add_argument('--headless', action='store_true', help='Run in headless mode')
 	parser.add_argument('--evaluate-only', action='store_true', help='Only evaluate existing results without running new tasks')
+	parser.add_argument(
+		'--rejudge',
+		action='store_true',
+		help='With --evaluate-only, re-run the LLM judge on existing results using --eval-model (cached judge calls are reused)',
+	)
+	parser.add_argument(
+		'--score-threshold',
+		type=float,
+		default=3,
+		help='Minimum screenshot score to show an image to the final judge (default: 3)',
+	)
 	parser.add_argument(
 		'--model', type=str, default='gpt-4o', choices=list(SUPPORTED_MODELS.keys()), help='Model to use for the agent'
 	)
@@ -1637,7 +2058,7 @@ if __name__ == '__main__':
 	parser.add_argument('--no-vision', action='store_true', help='Disable vision capabilities in the agent')
 	parser.add_argument(
 		'--fresh-start',
-		type=lambda x: (str(x).lower() == 'true'),
+		type=lambda x: str(x).lower() == 'true',
 		default=True,
 		help='Clear saved_trajectories before starting. Set to False to keep existing trajectories (default: True)',
 	)
@@ -1660,7 +2081,26 @@ if __name__ == '__main__':
 	parser.add_argument(
 		'--test-case', type=str, default='OnlineMind2Web', help='Name of the test case to fetch (default: OnlineMind2Web)'
 	)
+	parser.add_argument(
+		'--num-workers',
+		type=int,
+		default=1,
+		help='Number of worker processes, each running --parallel-runs tasks in one shared browser (default: 1, in-process)',
+	)
+	parser.add_argument(
+		'--shared-browser',
+		action='store_true',
+		help='Run all tasks of a process in one shared browser (always on with --num-workers > 1)',
+	)
+	parser.add_argument(
+		'--llm-rps',
+		type=float,
+		default=None,
+		help='Global rate limit for LLM requests per second across all workers (default: unlimited)',
+	)
 	args = parser.parse_args()
+	if args.rejudge and not args.evaluate_only:
+		parser.error('--rejudge only re-scores existing results, use it together with --evaluate-only')
 
 	# Set up logging - Make sure logger is configured before use in fetch function
 	logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -1669,6 +2109,9 @@ if __name__ == '__main__':
 	if args.evaluate_only:
 		# Just evaluate existing results
 		logger.info('Evaluating existing results...')
+		if args.rejudge:
+			load_dotenv()
+			asyncio.run(rejudge_results_dir(get_llm(args.eval_model), score_threshold=args.score_threshold))
 		summary = calculate_local_summary()
 
 		# Save evaluation results
@@ -1752,6 +2195,7 @@ if __name__ == '__main__':
 			'use_vision': not args.no_vision,
 			'task_source': args.test_case,
 			'llm_judge': args.eval_model,
+			'num_workers': args.num_workers,
 		}
 
 		run_data = {
@@ -1840,30 +2284,62 @@ if __name__ == '__main__':
 				exit(1)
 		# -----------------
 
-		results = asyncio.run(
-			run_multiple_tasks(
+		if args.num_workers > 1:
+			results = run_tasks_in_worker_processes(
 				tasks=tasks,
-				llm=llm,
-				run_id=run_id,
-				convex_url=CONVEX_URL,
-				secret_key=SECRET_KEY,
-				eval_model=eval_model,
-				max_parallel_runs=args.parallel_runs,
-				max_steps_per_task=args.max_steps,
+				config=WorkerConfig(
+					run_id=run_id,
+					convex_url=CONVEX_URL,
+					secret_key=SECRET_KEY,
+					model=args.model,
+					eval_model=args.eval_model,
+					planner_model=args.planner_model,
+					browser_slots=args.parallel_runs,
+					max_steps_per_task=args.max_steps,
+					headless=args.headless,
+					use_vision=not args.no_vision,
+					fresh_start=args.fresh_start,
+					use_serp=args.use_serp,
+					enable_memory=args.enable_memory,
+					memory_interval=args.memory_interval,
+					max_actions_per_step=args.max_actions_per_step,
+					validate_output=args.validate_output,
+					planner_interval=args.planner_interval,
+					llm_requests_per_second=args.llm_rps,
+					score_threshold=args.score_threshold,
+				),
+				num_workers=args.num_workers,
 				start_index=args.start,
 				end_index=args.end,
-				headless=args.headless,
-				use_vision=not args.no_vision,
-				fresh_start=args.fresh_start,
-				use_serp=args.use_serp,
-				enable_memory=args.enable_memory,
-				memory_interval=args.memory_interval,
-				max_actions_per_step=args.max_actions_per_step,
-				validate_output=args.validate_output,
-				planner_llm=planner_llm,
-				planner_interval=args.planner_interval,
 			)
-		)
+		else:
+			results = asyncio.run(
+				run_multiple_tasks(
+					tasks=tasks,
+					llm=llm,
+					run_id=run_id,
+					convex_url=CONVEX_URL,
+					secret_key=SECRET_KEY,
+					eval_model=eval_model,
+					max_parallel_runs=args.parallel_runs,
+					max_steps_per_task=args.max_steps,
+					start_index=args.start,
+					end_index=args.end,
+					headless=args.headless,
+					use_vision=not args.no_vision,
+					fresh_start=args.fresh_start,
+					use_serp=args.use_serp,
+					enable_memory=args.enable_memory,
+					memory_interval=args.memory_interval,
+					max_actions_per_step=args.max_actions_per_step,
+					validate_output=args.validate_output,
+					planner_llm=planner_llm,
+					planner_interval=args.planner_interval,
+					use_shared_browser=args.shared_browser,
+					llm_requests_per_second=args.llm_rps,
+					score_threshold=args.score_threshold,
+				)
+			)
 
 		logger.info('Task completed. Saving results...')
 		# Save results
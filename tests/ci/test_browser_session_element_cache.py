@@ -3,12 +3,19 @@ Systematic debugging of the selector map issue.
 Test each assumption step by step to isolate the problem.
 """
 
+import asyncio
 import os
+from urllib.parse import quote
 
 import pytest
 
+from browser_use.agent.views import ActionModel
 from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser import session as session_module
 from browser_use.controller.service import Controller
+from browser_use.controller.views import ClickElementAction
+from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+from browser_use.dom.service import DomService
 
 
 @pytest.fixture
@@ -481,3 +488,275 @@ async def test_final_real_click_with_debug(browser_session, controller, httpserv
 			raise e
 	else:
 		pytest.fail('Element 0 not found in cached map - test setup issue')
+
+
+@pytest.mark.asyncio
+async def test_locate_element_reuses_cached_locator(browser_session, httpserver):
+	"""Locating the same element twice reuses its resolved locator, and a fresh state summary clears them."""
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	index, element = next((i, el) for i, el in state.selector_map.items() if el.attributes.get('id') == 'button1')
+
+	first_handle = await browser_session.get_locate_element(element)
+	assert first_handle is not None
+	assert await first_handle.get_attribute('id') == 'button1'
+	locator = browser_session._cached_element_locators[index]
+	assert locator.element is element and locator.element_handle is first_handle
+
+	second_handle = await browser_session.get_locate_element(element)
+	assert second_handle is not None
+	assert await second_handle.get_attribute('id') == 'button1'
+	assert browser_session._cached_element_locators[index] is locator
+
+	await browser_session.get_state_summary(cache_clickable_elements_hashes=False, force=True)
+	assert browser_session._cached_element_locators == {}
+
+
+@pytest.mark.asyncio
+async def test_locate_element_uses_in_page_element_map(browser_session, httpserver):
+	"""Elements of the current snapshot are resolved through the in-page element map, without building CSS selectors."""
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	assert state.element_map_id
+
+	index, element = next((i, el) for i, el in state.selector_map.items() if el.attributes.get('id') == 'input1')
+	element_handle = await browser_session.get_locate_element(element)
+
+	assert element_handle is not None
+	assert await element_handle.get_attribute('id') == 'input1'
+	assert browser_session._cached_element_locators[index].css_selector is None
+
+
+@pytest.mark.asyncio
+async def test_replay_state_locates_recorded_elements_directly(browser_session, controller, httpserver):
+	"""Recorded elements are found by their selectors without a DOM walk, and clicking them goes through the controller."""
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	index, element = next((i, el) for i, el in state.selector_map.items() if el.attributes.get('id') == 'link1')
+	recorded = HistoryTreeProcessor.convert_dom_element_to_history_element(element)
+
+	await page.reload()
+	replay_state = await browser_session.get_replay_state({index: recorded})
+	assert replay_state is not None and replay_state.screenshot is None
+	assert list(await browser_session.get_selector_map()) == [index]
+	assert await browser_session._cached_element_locators[index].element_handle.get_attribute('id') == 'link1'
+
+	class ClickActionModel(ActionModel):
+		click_element_by_index: ClickElementAction | None = None
+
+	result = await controller.act(ClickActionModel(click_element_by_index=ClickElementAction(index=index)), browser_session)
+	assert result.error is None
+	await page.wait_for_url(httpserver.url_for('/page1'))
+
+	# the element is not on this page, the caller falls back to matching it in the full DOM tree
+	assert await browser_session.get_replay_state({index: recorded}, timeout=0.2) is None
+
+
+@pytest.mark.asyncio
+async def test_state_summary_is_reused_until_the_page_changes(browser_session, httpserver):
+	"""The state summary is only captured again after a DOM mutation, scroll, form input or navigation, or when forced."""
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	first = await browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False) is first
+	assert browser_session.state_summary_cache_stats['hits'] == 1
+
+	# the highlights drawn while capturing don't count as a change
+	assert await page.locator('#playwright-highlight-container').count() == 1
+	await browser_session.remove_highlights()
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False) is first
+
+	await page.fill('#input1', 'hello')
+	after_input = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	assert after_input is not first
+
+	await page.evaluate("document.body.insertAdjacentHTML('beforeend', '<button id=\"button2\">Button 2</button>')")
+	after_mutation = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	assert after_mutation is not after_input
+	assert any(element.attributes.get('id') == 'button2' for element in after_mutation.selector_map.values())
+
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False, force=True) is not after_mutation
+
+	await page.goto(httpserver.url_for('/page1'))
+	await page.wait_for_load_state()
+	after_navigation = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	assert after_navigation.url.endswith('/page1')
+
+	stats = browser_session.state_summary_cache_stats
+	assert stats['hits'] == 2 and stats['misses'] == 5
+	assert stats['hit_rate'] == 2 / 7
+
+
+@pytest.mark.asyncio
+async def test_state_summary_is_not_reused_after_a_click_or_once_it_is_too_old(browser_session, controller, httpserver):
+	"""Clicks and time can change what the page shows without a change the page version sees, waiting does not."""
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	first = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	ActionModel = controller.registry.create_action_model(include_actions=['wait', 'click_element_by_index'])
+	result = await controller.act(ActionModel(wait={'seconds': 0}), browser_session)
+	assert not result.error
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False) is first
+
+	button_index = next(index for index, element in first.selector_map.items() if element.attributes.get('id') == 'button1')
+	result = await controller.act(ActionModel(click_element_by_index={'index': button_index}), browser_session)
+	assert not result.error
+	after_action = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	assert after_action is not first
+
+	browser_session.browser_profile.state_summary_max_age = 0
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False) is not after_action
+
+
+@pytest.mark.asyncio
+async def test_multi_act_reuses_the_state_summary_between_actions(browser_session, httpserver):
+	"""The check multi_act runs before an indexed action reuses the summary when the previous action left the page alone."""
+	from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+	from browser_use import Agent
+
+	llm = FakeListChatModel(responses=['{}'])
+	llm._verified_api_keys = True  # type: ignore[attr-defined]
+	agent = Agent(task='Click the button', llm=llm, browser_session=browser_session, tool_calling_method='raw')
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	state = await browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+	button_index = next(index for index, element in state.selector_map.items() if element.attributes.get('id') == 'button1')
+	results = await agent.multi_act(
+		[agent.ActionModel(wait={'seconds': 0}), agent.ActionModel(click_element_by_index={'index': button_index})]
+	)
+
+	assert len(results) == 2 and not any(result.error for result in results)
+	stats = browser_session.state_summary_cache_stats
+	assert stats['hits'] == 1 and stats['hit_rate'] > 0
+
+
+@pytest.mark.asyncio
+async def test_state_summary_is_captured_again_when_a_cross_origin_iframe_changes(browser_session, httpserver):
+	"""Cross-origin iframes are part of the DOM tree, their changes invalidate the summary too."""
+	httpserver.expect_request('/widget').respond_with_data(
+		'<html><body><button id="pay">Pay</button></body></html>', content_type='text/html'
+	)
+	frame_url = httpserver.url_for('/widget').replace('localhost', '127.0.0.1')
+	httpserver.expect_request('/embed').respond_with_data(
+		f'<html><body><h1>Shop</h1><iframe src="{frame_url}"></iframe></body></html>', content_type='text/html'
+	)
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/embed'))
+	await page.wait_for_load_state()
+
+	first = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False) is first
+
+	widget = next(frame for frame in page.frames if frame.url == frame_url)
+	await widget.evaluate("document.body.insertAdjacentHTML('beforeend', '<button id=\"confirm\">Confirm</button>')")
+	assert await browser_session.get_state_summary(cache_clickable_elements_hashes=False) is not first
+
+
+@pytest.mark.asyncio
+async def test_cross_origin_frames_that_fail_or_hang_count_as_changed(monkeypatch):
+	"""One broken frame must neither block the state summary nor make the version of the whole page unknown."""
+
+	class FakeFrame:
+		def __init__(self, version: str | None = None, error: Exception | None = None):
+			self.version, self.error = version, error
+
+		async def evaluate(self, script):
+			if self.error:
+				raise self.error
+			if self.version is None:
+				await asyncio.sleep(60)  # stuck mid-navigation
+			return self.version
+
+	monkeypatch.setattr(session_module, 'CROSS_ORIGIN_FRAME_TIMEOUT', 0.05)
+	frames = [FakeFrame('a:1'), FakeFrame(error=RuntimeError('Frame was detached')), FakeFrame()]
+	browser_session = BrowserSession()
+
+	first = await browser_session._get_frame_versions(frames)  # type: ignore[arg-type]
+	second = await browser_session._get_frame_versions(frames)  # type: ignore[arg-type]
+	assert first[0] == second[0] == 'a:1'
+	assert first != second
+	assert await browser_session._get_frame_versions(frames[:1]) == ('a:1',)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_highlights_are_drawn_on_one_canvas_and_torn_down(browser_session, httpserver):
+	"""Every capture redraws the same canvas instead of adding overlays and listeners, remove_highlights() undoes it all."""
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	for _ in range(3):
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=False, force=True)
+
+	container = page.locator('#playwright-highlight-container')
+	assert await container.locator('> *').count() == 1
+	assert await container.locator('canvas').count() == 1
+	assert await page.evaluate('typeof window.__browserUseHighlighter.render') == 'function'
+
+	await browser_session.remove_highlights()
+	assert await container.count() == 0
+	assert await page.evaluate('window.__browserUseHighlighter === undefined')
+
+	# scrolling after teardown must not bring the highlights back
+	await page.mouse.wheel(0, 200)
+	await page.wait_for_timeout(50)
+	assert await container.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_dom_build_layouts_do_not_grow_with_the_page(browser_session):
+	"""buildDomTree.js reads all geometry before drawing any highlight, so a larger page does not force more layouts."""
+	page = await browser_session.get_current_page()
+
+	layouts = []
+	for rows in (20, 500):
+		items = ''.join(f'<li><a href="#{i}">Link {i}</a> <button>Button {i}</button></li>' for i in range(rows))
+		await page.goto('data:text/html,' + quote(f'<html><body><ul>{items}</ul></body></html>'))
+		dom_service = DomService(page)
+		before = await dom_service._get_layout_counts()
+		assert before is not None
+		await dom_service.get_clickable_elements(highlight_elements=True)
+		after = await dom_service._get_layout_counts()
+		assert after is not None
+		layouts.append(after['layoutCount'] - before['layoutCount'])
+
+	assert layouts[1] <= max(layouts[0], 2)
+
+
+@pytest.mark.asyncio
+async def test_cdp_backend_failure_falls_back_to_js_for_the_rest_of_the_session(browser_session, httpserver, monkeypatch):
+	"""Once the CDP snapshot failed, the next steps go straight to buildDomTree.js instead of failing and warning again."""
+	snapshot_calls = 0
+
+	async def failing_snapshot(self, *args):
+		nonlocal snapshot_calls
+		snapshot_calls += 1
+		raise RuntimeError('DOMSnapshot.captureSnapshot is not supported')
+
+	monkeypatch.setattr(DomService, '_build_dom_tree_from_snapshot', failing_snapshot)
+	browser_session.browser_profile.dom_backend = 'cdp'
+	page = await browser_session.get_current_page()
+	await page.goto(httpserver.url_for('/'))
+	await page.wait_for_load_state()
+
+	for _ in range(3):
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False, force=True)
+		assert state.selector_map
+
+	assert snapshot_calls == 1
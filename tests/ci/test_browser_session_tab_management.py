@@ -317,3 +317,46 @@ class TestTabManagement:
 		# close_tab should have called get_current_page, which creates a new about:blank tab if none are left
 		assert browser_session.human_current_page.url == 'about:blank'
 		assert browser_session.agent_current_page.url == 'about:blank'
+
+	async def test_get_tabs_info_uses_cached_titles(self, browser_session, base_url):
+		"""Background tab titles are cached from navigation events, and a hung tab does not hold up the others."""
+
+		await self._reset_tab_state(browser_session, base_url)
+		await browser_session.navigate(f'{base_url}/page1')
+		await browser_session.create_new_tab(f'{base_url}/page2')
+		await browser_session.create_new_tab(f'{base_url}/page3')
+		await asyncio.sleep(0.5)  # let the background title refreshes finish
+
+		pages = browser_session.browser_context.pages
+		title_calls = []
+		for page in pages:
+			original_title = page.title
+
+			async def counting_title(original_title=original_title):
+				title_calls.append(1)
+				return await original_title()
+
+			page.title = counting_title
+
+		tabs = await browser_session.get_tabs_info()
+		assert [tab.title for tab in tabs] == ['Test Page 1', 'Test Page 2', 'Test Page 3']
+		assert title_calls == [1]  # only the agent's tab
+
+		# a title set by a script without navigating shows up for the agent's tab right away
+		assert browser_session.agent_current_page is pages[2]
+		await pages[2].evaluate("document.title = '(1) Test Page 3'")
+		tabs = await browser_session.get_tabs_info()
+		assert tabs[2].title == '(1) Test Page 3'
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False, force=True)
+		assert state.title == '(1) Test Page 3'
+
+		# a tab whose title never resolves is reported as one to ignore once the shared deadline passes
+		async def hung_title():
+			await asyncio.sleep(30)
+
+		pages[1].title = hung_title
+		browser_session._tab_titles.pop(pages[1])
+		start = asyncio.get_running_loop().time()
+		tabs = await browser_session.get_tabs_info()
+		assert asyncio.get_running_loop().time() - start < 2
+		assert [tab.title for tab in tabs] == ['Test Page 1', 'ignore this tab and do not use it', 'Test Page 3']
@@ -13,11 +13,13 @@ from browser_use.controller.views import (
 	CloseTabAction,
 	DoneAction,
 	DragDropAction,
+	ExtractContentFromTabsAction,
 	GoToUrlAction,
 	InputTextAction,
 	NoParamsAction,
 	OpenTabAction,
 	ScrollAction,
+	ScrollAndCollectAction,
 	SearchGoogleAction,
 	SendKeysAction,
 	SwitchTabAction,
@@ -1135,6 +1137,138 @@ class TestControllerIntegration:
 		selected_value = await page.evaluate("document.getElementById('test-dropdown').value")
 		assert selected_value == 'option2'  # Second Option has value "option2"
 
+	async def test_dropdown_inside_iframe(self, controller, browser_session, base_url, http_server):
+		"""Test that dropdowns inside iframes are resolved in their own frame, and their options are read only once."""
+		http_server.expect_request('/dropdown-frame').respond_with_data(
+			"""
+			<html><body>
+				<select id="frame-dropdown">
+					<option value="">Please select</option>
+					<option value="nl">Netherlands</option>
+					<option value="pt">Portugal</option>
+				</select>
+			</body></html>
+			""",
+			content_type='text/html',
+		)
+		http_server.expect_request('/dropdown-iframe').respond_with_data(
+			f"""
+			<html><body>
+				<select id="outer-dropdown"><option>Outer</option></select>
+				<iframe src="{base_url}/dropdown-frame" width="400" height="200"></iframe>
+			</body></html>
+			""",
+			content_type='text/html',
+		)
+
+		class GoToUrlActionModel(ActionModel):
+			go_to_url: GoToUrlAction | None = None
+
+		await controller.act(GoToUrlActionModel(go_to_url=GoToUrlAction(url=f'{base_url}/dropdown-iframe')), browser_session)
+		page = await browser_session.get_current_page()
+		await page.wait_for_load_state()
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+
+		selector_map = await browser_session.get_selector_map()
+		dropdown_index = next(idx for idx, element in selector_map.items() if element.attributes.get('id') == 'frame-dropdown')
+
+		class GetDropdownOptionsModel(ActionModel):
+			get_dropdown_options: dict[str, int]
+
+		class SelectDropdownOptionModel(ActionModel):
+			select_dropdown_option: dict
+
+		result = await controller.act(GetDropdownOptionsModel(get_dropdown_options={'index': dropdown_index}), browser_session)
+		assert 'Netherlands' in result.extracted_content and 'Portugal' in result.extracted_content
+		assert 'Outer' not in result.extracted_content
+
+		# the options are cached for this DOM snapshot, and the frame was resolved through the iframe ancestor
+		locator = browser_session._cached_element_locators[dropdown_index]
+		assert locator.dropdown_options is not None
+		assert locator.frame is not None and locator.frame.url.endswith('/dropdown-frame')
+
+		result = await controller.act(
+			SelectDropdownOptionModel(select_dropdown_option={'index': dropdown_index, 'text': 'Atlantis'}), browser_session
+		)
+		assert 'not found' in result.extracted_content and 'Portugal' in result.extracted_content
+
+		result = await controller.act(
+			SelectDropdownOptionModel(select_dropdown_option={'index': dropdown_index, 'text': 'Portugal'}), browser_session
+		)
+		assert "with value ['pt']" in result.extracted_content
+		assert await locator.frame.evaluate("document.getElementById('frame-dropdown').value") == 'pt'
+
+	async def test_scroll_and_collect_items(self, controller, browser_session, base_url, http_server):
+		"""Test that an infinite feed and a virtualized list are harvested in one action, without duplicates."""
+		http_server.expect_request('/infinite-feed').respond_with_data(
+			"""
+			<html><body>
+				<div id="feed"></div>
+				<div id="sentinel">Loading...</div>
+				<script>
+					const feed = document.getElementById('feed');
+					const addPosts = () => {
+						for (let i = 0; i < 10 && feed.children.length < 60; i++) {
+							const post = document.createElement('article');
+							post.style.height = '120px';
+							post.innerHTML = `<a href="/post/${feed.children.length}">Post number ${feed.children.length}</a>`;
+							feed.appendChild(post);
+						}
+					};
+					addPosts();
+					new IntersectionObserver(entries => entries.some(e => e.isIntersecting) && setTimeout(addPosts, 50))
+						.observe(document.getElementById('sentinel'));
+				</script>
+			</body></html>
+			""",
+			content_type='text/html',
+		)
+		http_server.expect_request('/virtualized-list').respond_with_data(
+			"""
+			<html><body>
+				<div id="viewport" style="height: 800px; overflow-y: auto; position: relative">
+					<div style="height: 8000px"></div>
+					<ul id="rows" style="position: absolute; top: 0; margin: 0; width: 100%"></ul>
+				</div>
+				<script>
+					const viewport = document.getElementById('viewport');
+					const rows = document.getElementById('rows');
+					for (let i = 0; i < 25; i++) rows.appendChild(Object.assign(document.createElement('li'), {style: 'height: 40px'}));
+					const render = () => {
+						const first = Math.floor(viewport.scrollTop / 40);
+						rows.style.top = `${first * 40}px`;
+						[...rows.children].forEach((row, i) => { row.textContent = `Row ${first + i}`; });
+					};
+					viewport.addEventListener('scroll', render);
+					render();
+				</script>
+			</body></html>
+			""",
+			content_type='text/html',
+		)
+
+		class GoToUrlActionModel(ActionModel):
+			go_to_url: GoToUrlAction | None = None
+
+		class ScrollAndCollectModel(ActionModel):
+			scroll_and_collect_items: ScrollAndCollectAction | None = None
+
+		await controller.act(GoToUrlActionModel(go_to_url=GoToUrlAction(url=f'{base_url}/infinite-feed')), browser_session)
+		result = await controller.act(
+			ScrollAndCollectModel(scroll_and_collect_items=ScrollAndCollectAction(max_items=100, max_seconds=20)), browser_session
+		)
+		assert 'collected 60 items (reached the end of the list)' in result.extracted_content
+		assert 'Post number 59' in result.extracted_content
+		assert result.extracted_content.count('Post number 7 ') == 1
+
+		await controller.act(GoToUrlActionModel(go_to_url=GoToUrlAction(url=f'{base_url}/virtualized-list')), browser_session)
+		result = await controller.act(
+			ScrollAndCollectModel(scroll_and_collect_items=ScrollAndCollectAction(max_items=50, max_seconds=20)), browser_session
+		)
+		assert 'collected 50 items (stopped at max_items=50)' in result.extracted_content
+		rows = [line.split('. ', 1)[1] for line in result.extracted_content.splitlines()[1:]]
+		assert rows == [f'Row {i}' for i in range(50)]
+
 	async def test_extract_content_action(self, controller, browser_session, base_url, http_server):
 		"""Test the default extract_content action with mixed parameter ordering."""
 		# Set up a test page with specific content
@@ -1232,6 +1366,59 @@ class TestControllerIntegration:
 		assert action_model.extract_content['goal'] == 'Extract all product information including links'
 		assert action_model.extract_content['include_links'] is True
 
+	async def test_extract_content_from_tabs(self, controller, browser_session, base_url):
+		"""Test that several pages are extracted in background tabs at once while the agent keeps its tab."""
+		from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+		class GoToUrlActionModel(ActionModel):
+			go_to_url: GoToUrlAction | None = None
+
+		class ExtractFromTabsModel(ActionModel):
+			extract_content_from_tabs: ExtractContentFromTabsAction | None = None
+
+		await controller.act(GoToUrlActionModel(go_to_url=GoToUrlAction(url=f'{base_url}/')), browser_session)
+		agent_page = await browser_session.get_current_page()
+
+		unreachable = 'http://127.0.0.1:1/'
+		urls = [f'{base_url}/page1', unreachable, f'{base_url}/page2']
+		result = await controller.act(
+			ExtractFromTabsModel(extract_content_from_tabs=ExtractContentFromTabsAction(urls=urls, goal='Get the heading')),
+			browser_session,
+			page_extraction_llm=FakeListChatModel(responses=['{"heading": "Test Page"}']),
+		)
+
+		assert result.error is None
+		assert result.extracted_content.startswith('📄  Extracted from 2 of 3 pages')
+		sections = result.extracted_content.split('## ')[1:]
+		assert [section.splitlines()[0] for section in sections] == urls
+		assert '{"heading": "Test Page"}' in sections[0] and '{"heading": "Test Page"}' in sections[2]
+		assert 'Failed to extract' in sections[1]
+
+		# the agent's tab kept the focus and the background tabs are closed again
+		assert await browser_session.get_current_page() is agent_page
+		assert len(browser_session.tabs) == 1
+
+	async def test_run_in_tabs_gives_the_focus_back_to_the_agent_tab(self, browser_session, base_url):
+		"""Test that the worker tabs run concurrently, can be kept open and leave the agent's tab in the foreground."""
+		await browser_session.navigate_to(f'{base_url}/')
+		agent_page = await browser_session.get_current_page()
+
+		async def task(page):
+			await page.bring_to_front()  # what opening a tab in headful mode does
+			browser_session.human_current_page = page  # and what the focus hook then records
+			await asyncio.sleep(0.2)
+			return await page.title()
+
+		start = time.time()
+		titles = await browser_session.run_in_tabs(
+			[f'{base_url}/page1', f'{base_url}/page2'], task, max_parallel_tabs=2, close_tabs=False
+		)
+		assert titles == ['Test Page 1', 'Test Page 2']
+		assert time.time() - start < 2
+		assert len(browser_session.tabs) == 3
+		assert await browser_session.get_current_page() is agent_page
+		assert browser_session.human_current_page is agent_page
+
 	async def test_click_element_by_index(self, controller, browser_session, base_url, http_server):
 		"""Test that click_element_by_index correctly clicks an element and handles different outcomes."""
 		# Add route for clickable elements test page
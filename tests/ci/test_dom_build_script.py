@@ -0,0 +1,41 @@
+"""
+Tests for the production and debug builds of buildDomTree.js that DomService chooses between.
+"""
+
+import pytest
+
+from browser_use.dom.service import load_build_dom_tree_js, strip_debug_instrumentation
+
+
+def test_strip_debug_instrumentation():
+	source = '\n'.join(
+		[
+			'const a = 1;',
+			'// #if DEBUG',
+			'const metrics = {};',
+			'  // #endif',
+			'if (debugMode) metrics.nodes++; // #debug',
+			'return a;',
+		]
+	)
+	assert strip_debug_instrumentation(source) == 'const a = 1;\nreturn a;'
+
+	with pytest.raises(ValueError):
+		strip_debug_instrumentation('// #if DEBUG\n// #if DEBUG\n// #endif')
+	with pytest.raises(ValueError):
+		strip_debug_instrumentation('// #if DEBUG\nconst metrics = {};')
+
+
+def test_production_build_has_no_instrumentation():
+	production = load_build_dom_tree_js(debug=False)
+	debug = load_build_dom_tree_js(debug=True)
+
+	for instrumentation in ('PERF_METRICS', 'measureTime', 'recordDomOperation', 'performance.now()', '#debug', '#if DEBUG'):
+		assert instrumentation not in production
+		assert instrumentation in debug
+
+	# both install the highlighter and run the same walk
+	for script in (production, debug):
+		assert script.startswith('(args) => {') and '__browserUseHighlighter' in script
+		assert 'function buildDomTree(node' in script and 'highlighter.render()' in script
+	assert len(production) < len(debug)
@@ -0,0 +1,87 @@
+"""
+Tests for merging the DOM trees of cross-origin iframes, walked in their own frames, into the tree of the page.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.dom.service import DomService
+
+
+def element(tag_name: str, xpath: str, children: list[str], highlight_index: int | None = None) -> dict:
+	node = {'tagName': tag_name, 'xpath': xpath, 'children': children, 'isVisible': True}
+	if highlight_index is not None:
+		node |= {'isInteractive': True, 'isTopElement': True, 'highlightIndex': highlight_index}
+	return node
+
+
+def document(buttons: int, iframe: bool = False) -> dict:
+	"""The result of buildDomTree.js for a body with some buttons and optionally an iframe after them."""
+	node_map = {str(i): element('button', f'html/body/button[{i + 1}]', [], highlight_index=i) for i in range(buttons)}
+	children = list(node_map)
+	if iframe:
+		node_map['iframe'] = element('iframe', 'html/body/iframe', [])
+		children.append('iframe')
+	node_map['body'] = element('body', 'html/body', children)
+	return {'rootId': 'body', 'map': node_map, 'elementMapId': 'map'}
+
+
+@pytest.mark.asyncio
+async def test_frames_are_grafted_under_their_iframes_and_numbered_after_the_page():
+	outer_frame, inner_frame = object(), object()
+	inner = document(buttons=1) | {'frame': inner_frame}
+	outer = document(buttons=2, iframe=True) | {'frame': outer_frame, 'frames': {'iframe': inner}, 'truncated': True}
+	page = document(buttons=3, iframe=True) | {'frames': {'iframe': outer}}
+
+	dom_service = DomService(page=None)  # type: ignore[arg-type]
+	offsets = []
+	assert dom_service._graft_frame_maps(page, 3, offsets) == 6
+	assert offsets == [(outer_frame, 3), (inner_frame, 5)]
+	assert dom_service.truncated and 'frames' not in page
+
+	# node ids are unique again and every child still comes before its parent
+	assert 'iframe/iframe/body' in page['map']
+	seen = set()
+	for node_id, node in page['map'].items():
+		assert set(node['children']) <= seen
+		seen.add(node_id)
+
+	root, selector_map = await dom_service._construct_dom_tree(page)
+	assert sorted(selector_map) == list(range(6))
+	assert [selector_map[i].xpath for i in (0, 3, 5)] == ['html/body/button[1]'] * 3
+	iframe = root.children[-1]
+	assert iframe.tag_name == 'iframe' and iframe.children[0].tag_name == 'body'
+	assert selector_map[5].parent.parent.parent.parent is iframe  # button > body > iframe > body > iframe
+
+
+@pytest.mark.asyncio
+async def test_max_nodes_caps_the_page_and_its_frames_together(monkeypatch):
+	def frame(url: str, *children) -> SimpleNamespace:
+		return SimpleNamespace(url=url, child_frames=list(children))
+
+	nested = frame('https://widgets.example.net/inner')
+	first, second, third = (
+		frame('https://a.example.org/', nested),
+		frame('https://b.example.org/'),
+		frame('https://c.example.org/'),
+	)
+	main_frame = frame('https://shop.example.com/', first, second, third)
+	budgets = []
+
+	async def walk_frame(self, walked_frame, parent_result, args):
+		budgets.append(args['maxNodes'])
+		result = document(buttons=min(3, args['maxNodes'] - 1)) | {'frame': walked_frame}  # 3 buttons and their body
+		return f'iframe-{len(budgets)}', result
+
+	monkeypatch.setattr(DomService, '_walk_frame', walk_frame)
+	dom_service = DomService(page=None)  # type: ignore[arg-type]
+	page = document(buttons=5)  # 6 nodes
+	dom_service._remaining_nodes = 16 - len(page['map'])
+	await dom_service._walk_cross_origin_frames(main_frame, page, {'maxNodes': 16})
+
+	# the first frame and the frame inside it take 4 nodes each, the second one gets what is left and the third none
+	assert budgets == [10, 6, 2]
+	assert list(page['frames']) == ['iframe-1', 'iframe-3']
+	assert list(page['frames']['iframe-1']['frames']) == ['iframe-2']
+	assert dom_service._remaining_nodes == 0 and dom_service.truncated
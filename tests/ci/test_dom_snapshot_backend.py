@@ -0,0 +1,186 @@
+"""
+Tests for the CDP snapshot DOM backend, on hand-written DOMSnapshot.captureSnapshot payloads so no browser is needed.
+"""
+
+from browser_use.dom.snapshot_processor.service import COMPUTED_STYLES, SnapshotProcessor
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+VIEWPORT = {'width': 1000, 'height': 800, 'devicePixelRatio': 2}
+
+
+class SnapshotBuilder:
+	"""Builds the flat arrays of one DOMSnapshot document, nodes have to be added in document order"""
+
+	def __init__(self, strings: list[str]):
+		self.strings = strings
+		self.nodes = {
+			'parentIndex': [],
+			'nodeType': [],
+			'nodeName': [],
+			'nodeValue': [],
+			'backendNodeId': [],
+			'attributes': [],
+			'isClickable': {'index': []},
+			'shadowRootType': {'index': [], 'value': []},
+			'contentDocumentIndex': {'index': [], 'value': []},
+		}
+		self.layout = {'nodeIndex': [], 'bounds': [], 'styles': [], 'paintOrders': []}
+
+	def string(self, value: str) -> int:
+		if value not in self.strings:
+			self.strings.append(value)
+		return self.strings.index(value)
+
+	def add(
+		self,
+		parent: int,
+		name: str,
+		node_type: int = 1,
+		value: str | None = None,
+		attributes: dict[str, str] | None = None,
+		bounds: tuple[float, float, float, float] | None = None,
+		styles: dict[str, str] | None = None,
+		paint_order: int = 0,
+		clickable: bool = False,
+		shadow_root: bool = False,
+		content_document: int | None = None,
+	) -> int:
+		index = len(self.nodes['parentIndex'])
+		self.nodes['parentIndex'].append(parent)
+		self.nodes['nodeType'].append(node_type)
+		self.nodes['nodeName'].append(self.string(name))
+		self.nodes['nodeValue'].append(self.string(value) if value is not None else -1)
+		self.nodes['backendNodeId'].append(1000 + index)
+		self.nodes['attributes'].append([self.string(s) for item in (attributes or {}).items() for s in item])
+		if clickable:
+			self.nodes['isClickable']['index'].append(index)
+		if shadow_root:
+			self.nodes['shadowRootType']['index'].append(index)
+			self.nodes['shadowRootType']['value'].append(self.string('open'))
+		if content_document is not None:
+			self.nodes['contentDocumentIndex']['index'].append(index)
+			self.nodes['contentDocumentIndex']['value'].append(content_document)
+		if bounds is not None:
+			# bounds are in device pixels, the tests use a device pixel ratio of 2
+			computed = {'display': 'block', 'visibility': 'visible', 'cursor': 'auto', 'pointer-events': 'auto'} | (styles or {})
+			self.layout['nodeIndex'].append(index)
+			self.layout['bounds'].append([value * 2 for value in bounds])
+			self.layout['styles'].append([self.string(computed[name]) if name in computed else -1 for name in COMPUTED_STYLES])
+			self.layout['paintOrders'].append(paint_order)
+		return index
+
+	def document(self) -> dict:
+		return {'nodes': self.nodes, 'layout': self.layout, 'scrollOffsetX': 0, 'scrollOffsetY': 0}
+
+
+def build_page() -> tuple[dict, list[dict]]:
+	strings: list[str] = []
+	main = SnapshotBuilder(strings)
+	document = main.add(-1, '#document', node_type=9)
+	html = main.add(document, 'HTML', bounds=(0, 0, 1000, 2000), paint_order=1)
+	main.add(html, 'HEAD')
+	body = main.add(html, 'BODY', bounds=(0, 0, 1000, 2000), paint_order=1)
+	main.add(body, '#text', node_type=3, value='  Welcome  ', bounds=(10, 10, 100, 20), paint_order=1)
+	main.add(body, 'BUTTON', attributes={'id': 'save'}, bounds=(10, 40, 100, 30), paint_order=2)
+	hidden = main.add(body, 'BUTTON', attributes={'id': 'hidden'}, bounds=(0, 0, 0, 0), styles={'display': 'none'})
+	main.add(body, 'A', bounds=(10, 80, 0, 0), paint_order=2)  # empty anchor without href, skipped
+	covered = main.add(body, 'BUTTON', attributes={'id': 'covered'}, bounds=(10, 100, 100, 30), paint_order=2)
+	main.add(body, 'DIV', attributes={'id': 'modal'}, bounds=(0, 90, 500, 100), paint_order=5)
+	clickable = main.add(body, 'DIV', attributes={'class': 'card'}, bounds=(200, 40, 300, 40), paint_order=3, clickable=True)
+	main.add(clickable, 'SPAN', bounds=(200, 40, 100, 20), paint_order=3)
+	main.add(body, 'DIV', bounds=(10, 3000, 100, 30), paint_order=2, styles={'cursor': 'pointer'})  # below the viewport
+	aria_textbox = main.add(body, 'DIV', attributes={'contenteditable': 'false'}, bounds=(600, 40, 100, 30), paint_order=2)
+	host = main.add(body, 'PRODUCT-CARD', bounds=(10, 200, 400, 100), paint_order=2)
+	shadow = main.add(host, '#document-fragment', node_type=11, shadow_root=True)
+	main.add(shadow, 'BUTTON', bounds=(20, 210, 100, 30), paint_order=3)
+	main.add(shadow, 'BUTTON', bounds=(20, 250, 100, 30), paint_order=3)
+	main.add(host, 'SPAN', bounds=(20, 290, 50, 10), paint_order=3)
+	main.add(body, 'IFRAME', bounds=(500, 300, 400, 300), paint_order=2, content_document=1)
+
+	frame = SnapshotBuilder(strings)
+	frame_document = frame.add(-1, '#document', node_type=9)
+	frame_html = frame.add(frame_document, 'HTML', bounds=(0, 0, 400, 300))
+	frame_body = frame.add(frame_html, 'BODY', bounds=(0, 0, 400, 300))
+	frame.add(frame_body, 'INPUT', attributes={'name': 'q'}, bounds=(10, 10, 200, 20))
+
+	ax_nodes = [
+		{'nodeId': '1', 'ignored': False, 'role': {'value': 'textbox'}, 'backendDOMNodeId': 1000 + aria_textbox},
+		{'nodeId': '2', 'ignored': False, 'role': {'value': 'button'}, 'backendDOMNodeId': 1000 + hidden},
+		{
+			'nodeId': '3',
+			'ignored': False,
+			'role': {'value': 'button'},
+			'properties': [{'name': 'disabled', 'value': {'type': 'boolean', 'value': True}}],
+			'backendDOMNodeId': 1000 + covered,
+		},
+	]
+	snapshot = {'documents': [main.document(), frame.document()], 'strings': strings}
+	return snapshot, ax_nodes
+
+
+def test_snapshot_maps_onto_the_build_dom_tree_rules():
+	snapshot, ax_nodes = build_page()
+	processor = SnapshotProcessor(snapshot, ax_nodes, VIEWPORT, viewport_expansion=0)
+	tree, selector_map = processor.construct_dom_tree()
+
+	assert tree.tag_name == 'body' and tree.xpath == '/body'
+	assert isinstance(tree.children[0], DOMTextNode) and tree.children[0].text == 'Welcome' and tree.children[0].is_visible
+
+	assert [element.xpath for element in selector_map.values()] == [
+		'html/body/button[1]',  # the visible button
+		'html/body/div[2]',  # the div with a click listener, its span is not a distinct interaction
+		'html/body/div[4]',  # a textbox according to the accessibility tree
+		'button',  # the buttons inside the shadow root, xpaths restart at the shadow root and have no parent element
+		'button',
+		'html/body/input',  # inside the iframe, the xpath restarts at the iframe document
+	]
+	assert list(selector_map) == list(range(len(selector_map)))
+
+	elements = {element.xpath: element for element in iter_elements(tree)}
+	assert not elements['html/body/button[2]'].is_visible  # display: none
+	assert elements['html/body/button[3]'].is_visible and not elements['html/body/button[3]'].is_top_element  # under the modal
+	assert not elements['html/body/div[3]'].is_top_element  # outside of the expanded viewport
+	assert 'html/body/a' not in elements  # empty anchors are dropped
+	assert elements['html/body/product-card'].shadow_root
+
+	iframe_input = selector_map[5]
+	assert iframe_input.parent is not None and iframe_input.parent.parent is not None
+	assert iframe_input.parent.parent.parent is elements['html/body/iframe']
+
+	# highlight boxes are in CSS pixels of the top viewport, the iframe content is offset by the iframe position
+	boxes = {box['index']: box for box in processor.highlight_boxes}
+	assert boxes[0] == {'index': 0, 'x': 10, 'y': 40, 'width': 100, 'height': 30}
+	assert boxes[5] == {'index': 5, 'x': 510, 'y': 310, 'width': 200, 'height': 20}
+
+
+def test_snapshot_viewport_expansion_and_focus_element():
+	snapshot, ax_nodes = build_page()
+	processor = SnapshotProcessor(snapshot, ax_nodes, VIEWPORT, viewport_expansion=-1, focus_element=1)
+	_, selector_map = processor.construct_dom_tree()
+
+	xpaths = [element.xpath for element in selector_map.values()]
+	assert 'html/body/div[3]' in xpaths  # everything counts with viewport_expansion=-1
+	assert 'html/body/button[3]' not in xpaths  # the disabled property from the accessibility tree still applies
+	assert [box['index'] for box in processor.highlight_boxes] == [1]
+
+
+def iter_elements(node: DOMElementNode):
+	yield node
+	for child in node.children:
+		if isinstance(child, DOMElementNode):
+			yield from iter_elements(child)
+
+
+def test_snapshot_max_nodes_truncates_in_document_order():
+	snapshot, ax_nodes = build_page()
+	processor = SnapshotProcessor(snapshot, ax_nodes, VIEWPORT, viewport_expansion=0, max_nodes=3)
+	tree, selector_map = processor.construct_dom_tree()
+
+	assert processor.truncated and processor.node_count == 3
+	# the welcome text and the first two buttons, everything after them is left out
+	assert [type(child) for child in tree.children] == [DOMTextNode, DOMElementNode, DOMElementNode]
+	assert [element.xpath for element in selector_map.values()] == ['html/body/button[1]']
+
+	processor = SnapshotProcessor(snapshot, ax_nodes, VIEWPORT, viewport_expansion=0, max_nodes=1000)
+	processor.construct_dom_tree()
+	assert not processor.truncated
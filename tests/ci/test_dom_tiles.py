@@ -0,0 +1,87 @@
+"""
+Tests for the tiled DOM extraction of DomService and the cap on extracted DOM nodes.
+"""
+
+import os
+from urllib.parse import quote
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.service import DomService
+
+SECTIONS = 40
+LONG_PAGE = 'data:text/html,' + quote(
+	'<html><body style="margin: 0">'
+	+ ''.join(f'<section style="height: 400px"><button id="b{i}">Button {i}</button></section>' for i in range(SECTIONS))
+	+ '<nav style="position: fixed; top: 0; right: 0"><a href="#top" id="top-link">Top</a></nav>'
+	+ '</body></html>'
+)
+
+
+@pytest.fixture
+async def browser_session():
+	session = BrowserSession(
+		browser_profile=BrowserProfile(
+			executable_path=os.getenv('BROWSER_PATH'),
+			user_data_dir=None,
+			headless=True,
+		)
+	)
+	async with session:
+		yield session
+
+
+def button_ids(state) -> list[str]:
+	return [element.attributes['id'] for element in state.selector_map.values() if element.tag_name == 'button']
+
+
+@pytest.mark.asyncio
+async def test_tiles_are_served_from_the_index_until_the_page_changes(browser_session):
+	page = await browser_session.get_current_page()
+	await page.goto(LONG_PAGE)
+	dom_service = DomService(page)
+
+	first = await dom_service.get_tile_elements(0)
+	tile_height = await page.evaluate('window.innerHeight')
+	assert first.tile_count == -(-SECTIONS * 400 // tile_height)
+	assert button_ids(first) == [f'b{i}' for i in range(-(-tile_height // 400))]
+	# fixed elements are part of every tile
+	assert any(element.attributes.get('id') == 'top-link' for element in first.selector_map.values())
+
+	await page.evaluate('window.__browserUseDomIndex.marker = 1')
+	last = await dom_service.get_tile_elements(first.tile_count - 1)
+	assert await page.evaluate('window.__browserUseDomIndex.marker') == 1  # no new walk
+	assert button_ids(last)[-1] == f'b{SECTIONS - 1}'
+	assert any(element.attributes.get('id') == 'top-link' for element in last.selector_map.values())
+	# highlight indexes are shared by all tiles and resolve through the same element map
+	assert last.element_map_id == first.element_map_id
+	first_buttons = {index for index, element in first.selector_map.items() if element.tag_name == 'button'}
+	last_buttons = {index for index, element in last.selector_map.items() if element.tag_name == 'button'}
+	assert first_buttons and last_buttons and not first_buttons & last_buttons
+
+	capped = await dom_service.get_tile_elements(0, first.tile_count - 1, max_nodes=10)
+	assert capped.truncated and len(button_ids(capped)) < SECTIONS
+
+	# scrolling keeps the index, a DOM mutation drops it
+	await page.mouse.wheel(0, 1000)
+	await dom_service.get_tile_elements(1)
+	assert await page.evaluate('window.__browserUseDomIndex.marker') == 1
+	await page.evaluate("document.body.insertAdjacentHTML('afterbegin', '<button id=\"new\">New</button>')")
+	changed = await dom_service.get_tile_elements(0)
+	assert await page.evaluate('window.__browserUseDomIndex.marker') is None
+	assert button_ids(changed)[0] == 'new'
+
+
+@pytest.mark.asyncio
+async def test_max_nodes_truncates_the_state_summary(browser_session):
+	page = await browser_session.get_current_page()
+	await page.goto(LONG_PAGE)
+
+	dom_service = DomService(page)
+	full = await dom_service.get_clickable_elements(highlight_elements=False, viewport_expansion=-1)
+	assert not full.truncated and len(button_ids(full)) == SECTIONS
+
+	capped = await dom_service.get_clickable_elements(highlight_elements=False, viewport_expansion=-1, max_nodes=20)
+	assert capped.truncated
+	assert 0 < len(button_ids(capped)) < SECTIONS
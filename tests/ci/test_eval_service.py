@@ -0,0 +1,173 @@
+"""
+Tests for the task checkpoints, the worker loop and the judge cache of the evaluation runner.
+"""
+
+import asyncio
+import json
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from eval import service
+from eval.service import Stage, StageError, Task, TaskResult, WorkerConfig
+
+
+def test_checkpoint_records_completed_and_failed_stages(tmp_path):
+	checkpoint_file = tmp_path / 'task-1' / 'checkpoint.json'
+	task_result = TaskResult('task-1', 'run-1', 'Find a flight', Task('task-1', 'Find a flight'), 25, checkpoint_file)
+
+	task_result.stage_completed(Stage.SETUP_BROWSER)
+	task_result.stage_completed(Stage.RUN_AGENT)
+	task_result.stage_failed(Stage.FORMAT_HISTORY, StageError(Stage.FORMAT_HISTORY, 'exception', 'boom'))
+
+	assert TaskResult.load_checkpoint(checkpoint_file, 'run-1') == {Stage.SETUP_BROWSER, Stage.RUN_AGENT}
+	assert TaskResult.load_checkpoint(checkpoint_file, 'run-2') == set()  # stages of another run
+	assert not list(checkpoint_file.parent.glob('*.tmp'))
+
+	checkpoint_file.write_text('{"run_id": "run-1", "completed_stages": ["setup_bro')  # torn write of an older version
+	assert TaskResult.load_checkpoint(checkpoint_file, 'run-1') == set()
+	assert TaskResult.load_checkpoint(tmp_path / 'missing.json', 'run-1') == set()
+
+
+@pytest.mark.asyncio
+async def test_resumed_task_is_loaded_and_saved_to_the_current_run(monkeypatch, tmp_path):
+	monkeypatch.chdir(tmp_path)
+	task_folder = tmp_path / 'saved_trajectories' / 'task-1'
+	task_folder.mkdir(parents=True)
+	evaluation = {'judgement': 'The flight was not found', 'success': False, 'score': 0.0, 'error': None}
+	(task_folder / 'result.json').write_text(
+		json.dumps({'final_result_response': 'No flight', 'steps': 3, 'Online_Mind2Web_evaluation': evaluation})
+	)
+	saved_payloads = []
+	monkeypatch.setattr(service, 'save_result_to_server', lambda url, key, payload: saved_payloads.append(payload) or True)
+
+	async def resume(run_id: str) -> dict:
+		return await service.run_task_with_semaphore(
+			Task('task-1', 'Find a flight'),
+			run_id=run_id,
+			convex_url='',
+			secret_key='',
+			eval_model=None,  # type: ignore[arg-type]
+			llm=None,  # type: ignore[arg-type]
+			max_steps_per_task=25,
+			headless=True,
+			use_vision=False,
+			semaphore_runs=asyncio.Semaphore(1),
+			fresh_start=False,
+		)
+
+	# a checkpoint left by an earlier run does not skip the task, its saved result goes to the new run
+	TaskResult(
+		'task-1', 'run-1', 'Find a flight', Task('task-1', 'Find a flight'), 25, task_folder / 'checkpoint.json'
+	).stage_completed(Stage.SAVE_SERVER)
+	status = await resume('run-2')
+	assert status == {'task_id': 'task-1', 'success': True, 'error': None}
+	assert [payload['runId'] for payload in saved_payloads] == ['run-2']
+	assert saved_payloads[0]['onlineMind2WebEvaluationJudgement'] == 'The flight was not found'
+	assert saved_payloads[0]['onlineMind2WebEvaluationSuccess'] is False
+
+	# resuming the same run again does not save the result twice
+	assert await resume('run-2') == status
+	assert len(saved_payloads) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_loop_runs_at_most_browser_slots_tasks_at_once(monkeypatch):
+	running = 0
+	max_running = 0
+	score_thresholds = set()
+
+	async def run_task_with_semaphore(task, **kwargs):
+		nonlocal running, max_running
+		score_thresholds.add(kwargs['score_threshold'])
+		running += 1
+		max_running = max(max_running, running)
+		await asyncio.sleep(0.01)
+		running -= 1
+		if task.task_id == 'task-3':
+			raise RuntimeError('browser crashed')
+		return {'task_id': task.task_id, 'success': True, 'error': None}
+
+	class SharedBrowser:
+		stopped = False
+
+		def __init__(self, headless: bool):
+			pass
+
+		async def stop(self):
+			SharedBrowser.stopped = True
+
+	monkeypatch.setattr(service, 'run_task_with_semaphore', run_task_with_semaphore)
+	monkeypatch.setattr(service, 'get_llm', lambda model, rate_limiter=None: None)
+	monkeypatch.setattr(service, 'SharedBrowser', SharedBrowser)
+
+	task_queue = queue.Queue()
+	for i in range(7):
+		task_queue.put({'task_id': f'task-{i}', 'confirmed_task': f'Task {i}'})
+	task_queue.put(None)
+
+	config = WorkerConfig(
+		run_id='run-1', convex_url='', secret_key='', model='gpt-4.1', eval_model='gpt-4.1', browser_slots=2, score_threshold=4
+	)
+	results = await service._worker_loop(0, task_queue, config)
+
+	assert max_running == 2
+	assert sorted(result['task_id'] for result in results) == [f'task-{i}' for i in range(7)]
+	assert [result['error'] for result in results if not result['success']] == ['browser crashed']
+	assert SharedBrowser.stopped
+	assert score_thresholds == {4}
+
+
+class FakeJudge:
+	model_name = 'judge-1'
+
+	def __init__(self):
+		self.calls = 0
+
+	def invoke(self, messages):
+		self.calls += 1
+		return SimpleNamespace(content=f'Score: {self.calls}')
+
+
+def test_judge_cache_key_depends_on_the_model_and_the_inputs():
+	judge = FakeJudge()
+	key = service.judge_cache_key(judge, 'task', 'image-hash')
+	assert key == service.judge_cache_key(FakeJudge(), 'task', 'image-hash')
+	assert key != service.judge_cache_key(judge, 'task', 'other-image-hash')
+
+	other_model = FakeJudge()
+	other_model.model_name = 'judge-2'
+	assert key != service.judge_cache_key(other_model, 'task', 'image-hash')
+
+
+@pytest.mark.asyncio
+async def test_cached_judge_invoke_reuses_the_response_saved_on_disk(monkeypatch, tmp_path):
+	monkeypatch.setattr(service, 'JUDGE_CACHE_DIR', tmp_path)
+	judge = FakeJudge()
+	key = service.judge_cache_key(judge, 'task')
+
+	assert await service.cached_judge_invoke(judge, ['prompt'], key) == 'Score: 1'
+	assert await service.cached_judge_invoke(judge, ['prompt'], key) == 'Score: 1'
+	assert judge.calls == 1
+
+	other_key = service.judge_cache_key(judge, 'other task')
+	assert await service.cached_judge_invoke(judge, ['prompt'], other_key) == 'Score: 2'
+	assert not list(tmp_path.rglob('*.tmp'))
+
+
+@pytest.mark.asyncio
+async def test_cached_judge_invoke_does_not_cache_responses_that_do_not_parse(monkeypatch, tmp_path):
+	monkeypatch.setattr(service, 'JUDGE_CACHE_DIR', tmp_path)
+	judge = FakeJudge()
+	responses = iter(['**Reasoning**: The page shows the', '**Reasoning**: The results are sorted.\n**Score**: 4'])
+	judge.invoke = lambda messages: SimpleNamespace(content=next(responses))
+	key = service.judge_cache_key(judge, 'image')
+
+	truncated = await service.cached_judge_invoke(judge, ['prompt'], key, is_valid=service.has_image_score)
+	assert not service.has_image_score(truncated)
+	assert not list(tmp_path.rglob('*.json'))
+
+	# the retry asks the judge again instead of replaying the truncated response, the valid one is cached
+	assert service.has_image_score(await service.cached_judge_invoke(judge, ['prompt'], key, is_valid=service.has_image_score))
+	assert len(list(tmp_path.rglob('*.json'))) == 1
@@ -0,0 +1,75 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from browser_use.controller.extraction import extract_from_content, filter_relevant_chunks, split_into_chunks
+
+
+def _paragraphs(count: int, text: str = 'lorem ipsum dolor sit amet') -> str:
+	return '\n\n'.join(f'{text} {i}' for i in range(count))
+
+
+def test_split_into_chunks_keeps_small_content_whole():
+	content = _paragraphs(3)
+	assert split_into_chunks(content, max_tokens=1000) == [content]
+
+
+def test_split_into_chunks_respects_token_budget():
+	"""Chunks stay under the budget, break on paragraph boundaries and lose no content"""
+	content = _paragraphs(200)
+
+	chunks = split_into_chunks(content, max_tokens=100)
+
+	assert len(chunks) > 1
+	assert all(len(chunk) <= 100 * 3 for chunk in chunks)
+	assert ''.join(chunks) == content
+	assert all(chunk.endswith('\n\n') for chunk in chunks[:-1])
+
+
+def test_split_into_chunks_hard_splits_huge_lines():
+	content = 'x' * 1000
+
+	chunks = split_into_chunks(content, max_tokens=100)
+
+	assert ''.join(chunks) == content
+	assert all(len(chunk) <= 300 for chunk in chunks)
+
+
+def test_filter_relevant_chunks_prefers_goal_terms_in_page_order():
+	chunks = ['about our company', 'pricing: basic plan 10$', 'contact us', 'pricing: pro plan 20$', 'careers']
+
+	relevant = filter_relevant_chunks(chunks, goal='Find the pricing of every plan', max_chunks=2)
+
+	assert relevant == [(1, chunks[1]), (3, chunks[3])]
+
+
+def test_filter_relevant_chunks_without_matches_keeps_first_chunks():
+	chunks = ['one', 'two', 'three', 'four']
+
+	assert filter_relevant_chunks(chunks, goal='summarize', max_chunks=2) == [(0, 'one'), (1, 'two')]
+
+
+async def test_extract_from_content_single_prompt_for_small_pages():
+	llm = FakeListChatModel(responses=['{"title": "Example"}'])
+
+	extraction = await extract_from_content('get the title', 'Example page', llm)
+
+	assert extraction == '{"title": "Example"}'
+
+
+async def test_extract_from_content_map_reduces_large_pages():
+	"""Every relevant chunk gets its own call, then a final call merges the partial results"""
+	llm = FakeListChatModel(responses=['{"part": 1}', '{"part": 2}', '{"part": 3}', '{"merged": true}'])
+
+	extraction = await extract_from_content('summarize', _paragraphs(30), llm, max_chunk_tokens=50, max_chunks=3)
+
+	assert extraction == '{"merged": true}'
+	assert llm.i == 0  # all four responses were consumed, the list wrapped around
+
+
+async def test_extract_from_content_reuses_cached_extraction():
+	llm = FakeListChatModel(responses=['first', 'second'])
+	cache_key = ('https://example.com', False, ('abc:0',))
+
+	first = await extract_from_content('goal', 'content', llm, cache_key=cache_key)
+	second = await extract_from_content('goal', 'content', llm, cache_key=cache_key)
+
+	assert first == second == 'first'
@@ -0,0 +1,139 @@
+import base64
+import io
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from PIL import Image
+
+from browser_use.agent import gif
+from browser_use.agent.gif import create_history_gif
+from browser_use.agent.views import ActionResult, AgentBrain, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import BrowserStateHistory
+
+
+def _screenshot(color: tuple[int, int, int], size: tuple[int, int] = (800, 600)) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', size, color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+@pytest.fixture
+def history() -> AgentHistoryList:
+	colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255)]
+	return AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=AgentOutput(
+					current_state=AgentBrain(evaluation_previous_goal='Success', memory='', next_goal=f'Goal number {i}'),
+					action=[],
+				),
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot=_screenshot(color)),
+			)
+			for i, color in enumerate(colors)
+		]
+	)
+
+
+def _frames(path) -> list[Image.Image]:
+	with Image.open(path) as gif:
+		frames = []
+		for index in range(gif.n_frames):
+			gif.seek(index)
+			frames.append(gif.convert('RGB'))
+		return frames
+
+
+@pytest.mark.parametrize('max_workers, use_processes', [(1, False), (2, False), (2, True)])
+def test_create_history_gif_streams_all_frames(history, tmp_path, max_workers, use_processes):
+	"""Task frame + one frame per step should end up in the GIF, in order, whether rendered inline, in threads or in processes"""
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif(
+		task='Test task',
+		history=history,
+		output_path=str(output_path),
+		duration=500,
+		max_workers=max_workers,
+		use_processes=use_processes,
+	)
+
+	frames = _frames(output_path)
+	assert len(frames) == len(history.history) + 1
+	# frames keep the order of the history: sample a corner pixel away from the overlays
+	assert frames[1].getpixel((5, 5))[0] > 200 and frames[1].getpixel((5, 5))[2] < 50
+	assert frames[3].getpixel((5, 5))[2] > 200 and frames[3].getpixel((5, 5))[0] < 50
+	with Image.open(output_path) as gif:
+		assert gif.info.get('loop') == 0
+		assert gif.info.get('duration') == 500
+
+
+def test_create_history_gif_renders_serially_when_the_process_pool_breaks(history, tmp_path, monkeypatch):
+	"""A process pool that dies (e.g. its workers re-run an unguarded __main__) falls back to rendering inline"""
+
+	class BrokenPool:
+		def __init__(self, **kwargs):
+			pass
+
+		def __enter__(self):
+			return self
+
+		def __exit__(self, *exc_info):
+			return False
+
+		def submit(self, *args):
+			raise BrokenProcessPool('A child process terminated abruptly')
+
+	monkeypatch.setattr(gif, 'ProcessPoolExecutor', BrokenPool)
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), max_workers=2, use_processes=True)
+
+	assert len(_frames(output_path)) == len(history.history) + 1
+
+
+def test_create_history_gif_downscales_frames(history, tmp_path):
+	"""max_frame_width shrinks frames before overlaying, preserving the aspect ratio"""
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), max_frame_width=400, max_workers=1)
+
+	with Image.open(output_path) as gif:
+		assert gif.size == (400, 300)
+
+
+def test_create_history_gif_without_screenshots(tmp_path):
+	"""No first screenshot means there is nothing to render"""
+	output_path = tmp_path / 'history.gif'
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot=None),
+			)
+		]
+	)
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path))
+
+	assert not output_path.exists()
+
+
+def test_create_history_video_writes_all_frames(history, tmp_path):
+	"""An .mp4 output path streams the same frames into a video instead of a GIF"""
+	imageio = pytest.importorskip('imageio.v2')
+	output_path = tmp_path / 'history.mp4'
+
+	create_history_gif(task='Test task', history=history, output_path=str(output_path), max_frame_width=400, max_workers=2)
+
+	reader = imageio.get_reader(str(output_path))
+	try:
+		frames = [frame for frame in reader]  # the reader reports an unknown length, list() would try to preallocate it
+	finally:
+		reader.close()
+	assert len(frames) == len(history.history) + 1
+	assert frames[0].shape[:2] == (300, 400)
+	# the red step frame comes right after the task frame
+	red, green, blue = frames[1][5, 5]
+	assert red > 200 and green < 50 and blue < 50
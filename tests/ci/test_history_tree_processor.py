@@ -0,0 +1,78 @@
+"""
+Tests for finding recorded history elements in a DOM tree with HistoryTreeProcessor.
+"""
+
+from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+from browser_use.dom.views import DOMElementNode
+
+
+def element(tag_name: str, xpath: str, attributes: dict[str, str], highlight_index: int | None = None) -> DOMElementNode:
+	return DOMElementNode(
+		tag_name=tag_name,
+		xpath=xpath,
+		attributes=attributes,
+		children=[],
+		is_visible=True,
+		parent=None,
+		highlight_index=highlight_index,
+	)
+
+
+def tree(*elements: DOMElementNode) -> DOMElementNode:
+	"""html > body > div > the elements"""
+	html = element('html', 'html', {})
+	body = element('body', 'html/body', {})
+	div = element('div', 'html/body/div', {'class': 'list'})
+	for parent, child in ((html, body), (body, div)):
+		child.parent = parent
+		parent.children.append(child)
+	for child in elements:
+		child.parent = div
+		div.children.append(child)
+	return html
+
+
+def test_find_history_element_in_tree_matches_every_element_like_its_hash():
+	buttons = [element('button', f'html/body/div/button[{i + 1}]', {'id': f'b{i}'}, highlight_index=i) for i in range(50)]
+	root = tree(*buttons)
+	recorded = [HistoryTreeProcessor.convert_dom_element_to_history_element(button) for button in buttons]
+
+	for button, history_element in zip(buttons, recorded):
+		assert HistoryTreeProcessor.find_history_element_in_tree(history_element, root) is button
+		assert HistoryTreeProcessor.compare_history_element_and_dom_element(history_element, button)
+
+	# the index of the last tree is reused, a new tree gets its own
+	assert HistoryTreeProcessor.build_index(root) is HistoryTreeProcessor.build_index(root)
+	other = tree(element('button', 'html/body/div/button[1]', {'id': 'b0'}, highlight_index=0))
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded[0], other) is other.children[0].children[0].children[0]
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded[1], other) is None
+
+
+def test_tolerant_match_follows_layout_drift():
+	submit = element('button', 'html/body/div/button[2]', {'id': 'submit', 'class': 'primary'}, highlight_index=1)
+	tree(submit)
+	recorded = HistoryTreeProcessor.convert_dom_element_to_history_element(submit)
+
+	# a banner was inserted before the button: same attributes, new xpath
+	moved = element('button', 'html/body/div/button[3]', {'id': 'submit', 'class': 'primary'}, highlight_index=2)
+	root = tree(element('button', 'html/body/div/button[1]', {'id': 'banner'}, highlight_index=0), moved)
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded, root) is None
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded, root, tolerant=True) is moved
+
+	# the button got another class: same xpath, most of the attributes
+	restyled = element('button', 'html/body/div/button[2]', {'id': 'submit', 'class': 'primary active'}, highlight_index=1)
+	root = tree(element('button', 'html/body/div/button[1]', {'id': 'cancel'}, highlight_index=0), restyled)
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded, root, tolerant=True) is restyled
+
+	# another button at the same xpath with none of the attributes is not the same button
+	delete = element('button', 'html/body/div/button[2]', {'id': 'delete', 'class': 'danger'}, highlight_index=1)
+	root = tree(element('button', 'html/body/div/button[1]', {'id': 'cancel'}, highlight_index=0), delete)
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded, root, tolerant=True) is None
+
+	# two equally good candidates or another tag are not matched
+	twins = [
+		element('button', f'html/body/div/button[{i}]', {'id': 'submit', 'class': 'primary'}, highlight_index=i) for i in (3, 4)
+	]
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded, tree(*twins), tolerant=True) is None
+	link = element('a', 'html/body/div/a', {'id': 'submit', 'class': 'primary'}, highlight_index=0)
+	assert HistoryTreeProcessor.find_history_element_in_tree(recorded, tree(link), tolerant=True) is None
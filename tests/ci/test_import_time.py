@@ -0,0 +1,81 @@
+"""
+Import-time regression checks, based on `python -X importtime`.
+
+`import browser_use` should stay cheap (public exports are loaded lazily), and importing the Agent should not
+pull in optional heavy subsystems (GIF rendering, procedural memory, LLM provider SDKs) until they are used.
+"""
+
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+
+import pytest
+
+# generous budgets, the point is to catch an eager heavy import sneaking back in, not to benchmark the machine
+BARE_IMPORT_BUDGET_MS = int(os.getenv('BROWSER_USE_IMPORT_BUDGET_MS', '500'))
+
+
+def _importtime(statement: str) -> dict[str, int]:
+	"""Run statement in a fresh interpreter and return {module: cumulative import time in microseconds}"""
+	result = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', statement],
+		capture_output=True,
+		text=True,
+		env={**os.environ, 'ANONYMIZED_TELEMETRY': 'false'},
+		timeout=120,
+		check=True,
+	)
+	modules = {}
+	for line in result.stderr.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		_, cumulative, module = line.removeprefix('import time:').split('|')
+		modules[module.strip()] = int(cumulative)
+	return modules
+
+
+def _imported(modules: dict[str, int], package: str) -> bool:
+	return any(module == package or module.startswith(f'{package}.') for module in modules)
+
+
+def test_bare_import_is_lazy():
+	modules = _importtime('import browser_use')
+
+	for heavy in ('browser_use.agent', 'browser_use.browser', 'playwright', 'langchain_core', 'PIL', 'posthog'):
+		assert not _imported(modules, heavy), f'`import browser_use` should not import {heavy}'
+	assert modules['browser_use'] / 1000 < BARE_IMPORT_BUDGET_MS
+
+
+@pytest.mark.parametrize(
+	'statement',
+	[
+		'from browser_use import Agent',
+		pytest.param(
+			'import browser_use.cli',
+			marks=pytest.mark.skipif(find_spec('textual') is None, reason='requires browser-use[cli]'),
+		),
+	],
+)
+def test_optional_subsystems_are_deferred(statement):
+	modules = _importtime(statement)
+
+	for optional in (
+		'browser_use.agent.gif',
+		'browser_use.agent.memory',
+		'PIL',
+		'mem0',
+		'langchain_openai',
+		'langchain_anthropic',
+	):
+		assert not _imported(modules, optional), f'`{statement}` should not import {optional} until it is used'
+
+
+def test_lazy_exports_resolve():
+	import browser_use
+	from browser_use.agent.service import Agent
+
+	assert browser_use.Agent is Agent
+	assert set(browser_use.__all__) <= set(dir(browser_use))
+	with pytest.raises(AttributeError):
+		browser_use.NotAnExport  # type: ignore[attr-defined]
@@ -0,0 +1,80 @@
+"""
+Tests for the on-disk cache of the agent's decisions.
+"""
+
+from browser_use.agent.plan_cache import PlanCache
+from browser_use.agent.views import ActionResult, AgentOutput
+from browser_use.controller.service import Controller
+from browser_use.dom.views import DOMElementNode
+
+AgentOutputModel = AgentOutput.type_with_custom_actions(Controller().registry.create_action_model())
+
+
+def page(*button_ids: str) -> DOMElementNode:
+	body = DOMElementNode(tag_name='body', xpath='html/body', attributes={}, children=[], is_visible=True, parent=None)
+	for i, button_id in enumerate(button_ids):
+		body.children.append(
+			DOMElementNode(
+				tag_name='button',
+				xpath=f'html/body/button[{i + 1}]',
+				attributes={'id': button_id},
+				children=[],
+				is_visible=True,
+				parent=body,
+				highlight_index=i + 1,
+			)
+		)
+	return body
+
+
+def output(*actions: dict) -> AgentOutput:
+	return AgentOutputModel.model_validate(
+		{'current_state': {'evaluation_previous_goal': '', 'memory': '', 'next_goal': ''}, 'action': list(actions)}
+	)
+
+
+def test_decisions_are_reused_once_confirmed_and_dropped_when_they_fail(tmp_path):
+	cache = PlanCache(tmp_path)
+	tree = page('search', 'submit')
+	selector_map = {1: tree.children[0], 2: tree.children[1]}
+	signature = PlanCache.page_signature('https://example.com/form?session=1', tree)
+	key = PlanCache.key('Fill  in the\nform', signature, '')
+	click = output({'click_element_by_index': {'index': 2}})
+
+	# the query is not part of the signature, the layout and the task are
+	assert signature == PlanCache.page_signature('https://example.com/form?session=2', tree)
+	assert signature != PlanCache.page_signature('https://example.com/form', page('search'))
+	assert key == PlanCache.key('Fill in the form', signature, '')
+
+	cache.update(key, click, selector_map, [ActionResult()])
+	assert cache.get(key, AgentOutputModel, selector_map) is None  # seen once
+	cache.update(key, click, selector_map, [ActionResult()])
+	cached = cache.get(key, AgentOutputModel, selector_map)
+	assert cached is not None and cached.action[0].get_index() == 2
+	assert cache.get(key, AgentOutputModel, {1: tree.children[0]}) is None  # the element is not on the page
+
+	# the highlight indices moved, index 2 now points at another element of the page
+	swapped = {1: tree.children[1], 2: tree.children[0]}
+	assert cache.get(key, AgentOutputModel, swapped) is None
+
+	# the next step of the run has its own key, even on the same page
+	assert PlanCache.key('Fill in the form', signature, PlanCache.extend_trail(key, click)) != key
+
+	cache.update(key, cached, selector_map, [ActionResult(error='Element not found')])
+	assert cache.get(key, AgentOutputModel, selector_map) is None
+	assert not list(tmp_path.iterdir())
+
+
+def test_other_decisions_reset_the_confirmations_and_done_is_never_cached(tmp_path):
+	cache = PlanCache(tmp_path)
+	selector_map = {1: page('search').children[0]}
+	cache.update('step', output({'click_element_by_index': {'index': 1}}), selector_map, [ActionResult()])
+	cache.update('step', output({'input_text': {'index': 1, 'text': 'hello'}}), selector_map, [ActionResult()])
+	assert cache.get('step', AgentOutputModel, selector_map) is None
+	cache.update('step', output({'input_text': {'index': 1, 'text': 'hello'}}), selector_map, [ActionResult()])
+	assert cache.get('step', AgentOutputModel, selector_map) is not None
+
+	done = output({'done': {'text': 'The price is 42', 'success': True}})
+	cache.update('last', done, selector_map, [ActionResult(is_done=True)])
+	cache.update('last', done, selector_map, [ActionResult(is_done=True)])
+	assert cache.get('last', AgentOutputModel, selector_map) is None
@@ -0,0 +1,126 @@
+"""
+Tests for exporting agent history as a standalone Playwright script.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from browser_use.agent.playwright_script_generator import PlaywrightScriptGenerator, get_sensitive_data_keys
+from browser_use.agent.playwright_script_helpers import PlaywrightActionError, replace_sensitive_data
+from browser_use.agent.views import AgentHistoryList, AgentOutput
+from browser_use.browser.profile import BrowserProfile
+from browser_use.controller.service import Controller
+
+
+def history_item(actions: list[dict], elements: list[dict | None] | None = None) -> dict:
+	return {
+		'model_output': {
+			'current_state': {'evaluation_previous_goal': '', 'memory': '', 'next_goal': ''},
+			'action': actions,
+		},
+		'result': [],
+		'state': {'url': '', 'title': '', 'tabs': [], 'interacted_element': elements or [None] * len(actions)},
+	}
+
+
+def recorded_element(css_selector: str, xpath: str) -> dict:
+	return {
+		'tag_name': 'input',
+		'xpath': xpath,
+		'highlight_index': 1,
+		'entire_parent_branch_path': ['html', 'body', 'form', 'input'],
+		'attributes': {},
+		'css_selector': css_selector,
+	}
+
+
+@pytest.fixture
+def form_server(httpserver):
+	httpserver.expect_request('/').respond_with_data(
+		"""
+		<html><body>
+			<form action="/result">
+				<input id="name" name="name" type="text">
+				<button id="submit" type="submit" onclick="setTimeout(() => this.form.submit(), 300); return false">Go</button>
+			</form>
+		</body></html>
+		""",
+		content_type='text/html',
+	)
+	httpserver.expect_request('/result').respond_with_data('<html><body><h1>Thanks</h1></body></html>', content_type='text/html')
+	return httpserver
+
+
+def form_history(url: str) -> list[dict]:
+	return [
+		history_item([{'go_to_url': {'url': url}}]),
+		history_item(
+			[
+				{'input_text': {'index': 1, 'text': '<secret>user_name</secret>'}},
+				{'extract_content': {'goal': 'the form', 'should_strip_link_urls': True}},
+				{'click_element_by_index': {'index': 2}},
+			],
+			[
+				recorded_element('html > body > form > input#name', 'html/body/form/input'),
+				None,
+				recorded_element('#submit', 'html/body/form/button'),
+			],
+		),
+		history_item([{'done': {'text': 'submitted', 'success': True}}]),
+	]
+
+
+def test_generated_script_reads_secrets_from_the_environment_and_skips_read_only_actions():
+	generator = PlaywrightScriptGenerator(form_history('http://localhost/'), sensitive_data_keys=['user_name'])
+	script = generator.generate_script_content()
+	compile(script, 'generated_script.py', 'exec')
+
+	assert "load_sensitive_data(['user_name'])" in script and 'USER_NAME' in script
+	assert "replace_sensitive_data('<secret>user_name</secret>', SENSITIVE_DATA)" in script
+	assert "['html > body > form > input#name', 'xpath=/html/body/form/input']" in script
+	assert '# extract_content skipped' in script
+	assert 'wait_for_timeout' not in script
+
+	assert replace_sensitive_data('hi <secret>user_name</secret>!', {'user_name': 'Ada'}) == 'hi Ada!'
+	with pytest.raises(PlaywrightActionError, match='USER_NAME'):
+		replace_sensitive_data('<secret>user_name</secret>', {'user_name': None})
+
+
+def test_domain_scoped_sensitive_data_keys_are_the_placeholder_names():
+	sensitive_data = {
+		'https://*.example.com': {'user_name': 'Ada', 'password': 'secret'},
+		'https://login.example.org': {'password': 'other'},
+		'api_key': 'legacy',
+	}
+	keys = get_sensitive_data_keys(sensitive_data)
+	assert keys == ['user_name', 'password', 'api_key']
+
+	script = PlaywrightScriptGenerator(form_history('http://localhost/'), sensitive_data_keys=keys).generate_script_content()
+	assert "load_sensitive_data(['user_name', 'password', 'api_key'])" in script
+	assert 'environment variables USER_NAME, PASSWORD, API_KEY' in script
+
+
+def test_generated_script_replays_the_run(form_server, tmp_path):
+	history_path = tmp_path / 'history.json'
+	history_path.write_text(json.dumps({'history': form_history(form_server.url_for('/'))}))
+	output_model = AgentOutput.type_with_custom_actions(Controller().registry.create_action_model())
+	history = AgentHistoryList.load_from_file(history_path, output_model)
+	script_path = tmp_path / 'replay.py'
+	history.save_as_playwright_script(
+		script_path, sensitive_data_keys=['user_name'], browser_profile=BrowserProfile(headless=True)
+	)
+
+	result = subprocess.run(
+		[sys.executable, str(script_path)],
+		env=os.environ | {'USER_NAME': 'Ada'},
+		capture_output=True,
+		text=True,
+		timeout=120,
+	)
+	assert result.returncode == 0, result.stderr
+	assert 'Done (success=True): submitted' in result.stdout
+	assert any(request.path == '/result' and request.args['name'] == 'Ada' for request, _ in form_server.log)
@@ -0,0 +1,76 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from browser_use.telemetry.service import TelemetryEventQueue
+from browser_use.telemetry.views import BaseTelemetryEvent
+
+
+@dataclass
+class DummyTelemetryEvent(BaseTelemetryEvent):
+	value: int
+	name: str = 'dummy_event'
+
+
+def test_queue_sends_events_in_order_and_flushes():
+	batches: list[list[BaseTelemetryEvent]] = []
+	event_queue = TelemetryEventQueue(send_batch=batches.append, batch_size=10)
+
+	for i in range(25):
+		event_queue.put(DummyTelemetryEvent(value=i))
+
+	assert event_queue.flush(timeout=5)
+	assert [event.value for batch in batches for event in batch] == list(range(25))
+	assert all(len(batch) <= 10 for batch in batches)
+
+
+def test_event_factories_are_built_on_the_background_thread():
+	build_threads = []
+
+	def build_event() -> BaseTelemetryEvent:
+		build_threads.append(threading.current_thread())
+		return DummyTelemetryEvent(value=1)
+
+	sent: list[BaseTelemetryEvent] = []
+	event_queue = TelemetryEventQueue(send_batch=sent.extend)
+	event_queue.put(build_event)
+
+	assert event_queue.flush(timeout=5)
+	assert sent == [DummyTelemetryEvent(value=1)]
+	assert build_threads and build_threads[0] is not threading.current_thread()
+
+
+def test_full_queue_drops_events_instead_of_blocking():
+	release = threading.Event()
+	sent: list[BaseTelemetryEvent] = []
+
+	def slow_send(batch: list[BaseTelemetryEvent]) -> None:
+		release.wait(timeout=5)
+		sent.extend(batch)
+
+	event_queue = TelemetryEventQueue(send_batch=slow_send, max_size=2, batch_size=1)
+	event_queue.put(DummyTelemetryEvent(value=0))
+	# wait until the worker picked up the first event and is stuck sending it
+	while event_queue._queue.qsize():
+		time.sleep(0.01)
+
+	results = [event_queue.put(DummyTelemetryEvent(value=i)) for i in range(1, 5)]
+	assert results == [True, True, False, False]
+	assert event_queue.dropped_events == 2
+
+	release.set()
+	assert event_queue.flush(timeout=5)
+	assert [event.value for event in sent] == [0, 1, 2]
+
+
+def test_failing_factory_does_not_break_the_batch():
+	def broken_event() -> BaseTelemetryEvent:
+		raise RuntimeError('boom')
+
+	sent: list[BaseTelemetryEvent] = []
+	event_queue = TelemetryEventQueue(send_batch=sent.extend)
+	event_queue.put(broken_event)
+	event_queue.put(DummyTelemetryEvent(value=2))
+
+	assert event_queue.flush(timeout=5)
+	assert sent == [DummyTelemetryEvent(value=2)]
@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from browser_use.tracing import (
+	clear_spans,
+	collect_phase_durations,
+	disable_tracing,
+	enable_tracing,
+	export_chrome_trace,
+	export_otlp_json,
+	get_spans,
+	trace_span,
+)
+from browser_use.utils import time_execution_async, time_execution_sync
+
+
+@pytest.fixture
+def tracing():
+	clear_spans()
+	enable_tracing()
+	yield
+	disable_tracing()
+	clear_spans()
+
+
+def test_spans_are_not_recorded_when_disabled():
+	clear_spans()
+	with trace_span('ignored') as span:
+		assert span is None
+	assert get_spans() == []
+
+
+def test_nested_spans_link_to_their_parent(tracing):
+	with trace_span('outer', step=1) as outer:
+		with trace_span('inner', action='click'):
+			pass
+
+	inner_span, outer_span = get_spans()
+	assert outer is outer_span
+	assert inner_span.parent_id == outer_span.span_id
+	assert inner_span.root_id == outer_span.span_id
+	assert outer_span.attributes == {'step': 1}
+	assert inner_span.attributes == {'action': 'click'}
+	assert outer_span.start_ns <= inner_span.start_ns <= inner_span.end_ns <= outer_span.end_ns
+
+
+async def test_decorated_functions_nest_across_asyncio_tasks(tracing):
+	@time_execution_sync('--parse')
+	def parse():
+		return 'parsed'
+
+	@time_execution_async('--fetch')
+	async def fetch():
+		await asyncio.sleep(0)
+		return parse()
+
+	with trace_span('step'):
+		assert await asyncio.gather(fetch(), fetch()) == ['parsed', 'parsed']
+
+	spans = {span.span_id: span for span in get_spans()}
+	step = next(span for span in spans.values() if span.name == 'step')
+	fetches = [span for span in spans.values() if span.name == 'fetch']
+	parses = [span for span in spans.values() if span.name == 'parse']
+	assert len(fetches) == len(parses) == 2
+	assert all(span.parent_id == step.span_id for span in fetches)
+	assert {span.parent_id for span in parses} == {span.span_id for span in fetches}
+
+
+def test_phase_durations_are_collected_without_tracing():
+	clear_spans()
+	with collect_phase_durations() as phase_durations:
+		with trace_span('dom', phase='dom_build'):
+			pass
+		with trace_span('llm call', phase='llm'):
+			pass
+		with trace_span('second llm call', phase='llm'):
+			pass
+		with trace_span('no phase'):
+			pass
+
+	assert set(phase_durations) == {'dom_build', 'llm'}
+	assert all(duration >= 0 for duration in phase_durations.values())
+	assert get_spans() == []
+
+
+def test_export_chrome_trace(tracing, tmp_path):
+	with trace_span('outer', step=1):
+		with trace_span('inner', phase='llm'):
+			pass
+
+	trace = json.loads(export_chrome_trace(tmp_path / 'trace.json').read_text())
+
+	events = {event['name']: event for event in trace['traceEvents']}
+	assert set(events) == {'outer', 'inner'}
+	assert events['inner']['ph'] == 'X'
+	assert events['inner']['args']['parent_id'] == events['outer']['args']['span_id']
+	assert events['inner']['args']['phase'] == 'llm'
+	assert events['outer']['ts'] <= events['inner']['ts']
+
+
+def test_export_otlp_json(tracing, tmp_path):
+	with trace_span('outer', step=1):
+		with trace_span('inner'):
+			pass
+
+	payload = json.loads(export_otlp_json(tmp_path / 'trace.otlp.json').read_text())
+
+	spans = {span['name']: span for span in payload['resourceSpans'][0]['scopeSpans'][0]['spans']}
+	assert spans['inner']['parentSpanId'] == spans['outer']['spanId']
+	assert spans['inner']['traceId'] == spans['outer']['traceId']
+	assert 'parentSpanId' not in spans['outer']
+	assert spans['outer']['attributes'] == [{'key': 'step', 'value': {'intValue': '1'}}]
+	assert int(spans['outer']['startTimeUnixNano']) <= int(spans['inner']['startTimeUnixNano'])